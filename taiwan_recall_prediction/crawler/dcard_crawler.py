@@ -18,14 +18,14 @@ from urllib.parse import urljoin
 # 導入配置和工具
 try:
     from .config import DCARD_CONFIG, BASE_CONFIG, KEYWORDS
-    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 except ImportError:
     # 如果作為獨立模組運行
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from crawler.config import DCARD_CONFIG, BASE_CONFIG, KEYWORDS
-    from utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -33,7 +33,8 @@ logger = logging.getLogger(__name__)
 class DcardCrawler:
     """Dcard爬蟲類"""
     
-    def __init__(self):
+    def __init__(self, session: requests.Session = None, seen_links=None,
+                 rate_limiter=None):
         self.base_url = DCARD_CONFIG['base_url']
         self.api_base = DCARD_CONFIG['api_base']
         self.forums = DCARD_CONFIG['forums']
@@ -42,9 +43,14 @@ class DcardCrawler:
         # 創建請求輔助工具
         self.request_helper = create_request_helper(
             delay=BASE_CONFIG['request_delay'],
-            max_retries=BASE_CONFIG['max_retries']
+            max_retries=BASE_CONFIG['max_retries'],
+            session=session,
+            rate_limiter=rate_limiter
         )
         
+        # 先前已儲存過的文章連結，命中時跳過內容抓取與分析
+        self.seen_links = seen_links
+        
         logger.info("Dcard爬蟲初始化完成")
     
     def get_forum_articles(self, forum: str, keywords: List[str] = None, 
@@ -65,6 +71,8 @@ class DcardCrawler:
         
         articles = []
         before_id = None
+        # 比對器在文章迴圈外取得一次
+        matcher = get_keyword_matcher(keywords)
         
         logger.info(f"開始爬取Dcard {forum} 論壇，關鍵字: {keywords}")
         
@@ -99,7 +107,7 @@ class DcardCrawler:
                 # 處理文章
                 page_articles = []
                 for post in data:
-                    article = self._process_post(post, forum, keywords)
+                    article = self._process_post(post, forum, matcher)
                     if article:
                         page_articles.append(article)
                 
@@ -120,14 +128,14 @@ class DcardCrawler:
         logger.info(f"Dcard {forum} 論壇爬取完成，共 {len(articles)} 篇文章")
         return articles
     
-    def _process_post(self, post: Dict, forum: str, keywords: List[str]) -> Optional[Dict]:
+    def _process_post(self, post: Dict, forum: str, matcher: KeywordMatcher) -> Optional[Dict]:
         """
         處理單篇文章
         
         Args:
             post: API返回的文章數據
             forum: 論壇名稱
-            keywords: 關鍵字列表
+            matcher: 關鍵字比對器
             
         Returns:
             處理後的文章數據或None
@@ -138,7 +146,7 @@ class DcardCrawler:
             content = title + ' ' + excerpt
             
             # 檢查是否包含關鍵字
-            if not any(keyword.lower() in content.lower() for keyword in keywords):
+            if not matcher.contains_any(content):
                 return None
             
             # 解析日期
@@ -148,6 +156,8 @@ class DcardCrawler:
             # 構建文章URL
             post_id = post.get('id', '')
             article_url = f"{self.base_url}/f/{forum}/p/{post_id}"
+            if self.seen_links is not None and article_url in self.seen_links:
+                return None
             
             # 獲取詳細內容
             detailed_content = self._get_post_content(post_id)
@@ -169,7 +179,7 @@ class DcardCrawler:
                 'comment_count': post.get('commentCount', 0),
                 'sentiment': sentiment_result['sentiment'],
                 'sentiment_score': sentiment_result['score'],
-                'keywords_found': text_processor.extract_keywords(content, keywords),
+                'keywords_found': text_processor.extract_keywords(content, matcher),
                 'crawl_time': datetime.now().isoformat(),
                 'is_anonymous': post.get('anonymous', False),
                 'gender': post.get('gender', ''),
@@ -329,9 +339,10 @@ class DcardCrawler:
                 return articles
             
             data = response.json()
+            matcher = get_keyword_matcher([query])
             
             for post in data:
-                article = self._process_post(post, 'search', [query])
+                article = self._process_post(post, 'search', matcher)
                 if article:
                     articles.append(article)
             
@@ -17,14 +17,14 @@ from typing import List, Dict, Optional
 # 導入配置和工具
 try:
     from .config import FACEBOOK_CONFIG, BASE_CONFIG, KEYWORDS
-    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 except ImportError:
     # 如果作為獨立模組運行
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from crawler.config import FACEBOOK_CONFIG, BASE_CONFIG, KEYWORDS
-    from utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -32,7 +32,8 @@ logger = logging.getLogger(__name__)
 class FacebookCrawler:
     """Facebook爬蟲類"""
     
-    def __init__(self, access_token: str = None):
+    def __init__(self, access_token: str = None, session: requests.Session = None,
+                 seen_links=None, rate_limiter=None):
         self.graph_api_base = FACEBOOK_CONFIG['graph_api_base']
         self.access_token = access_token or FACEBOOK_CONFIG['access_token']
         self.pages = FACEBOOK_CONFIG['pages']
@@ -41,9 +42,14 @@ class FacebookCrawler:
         # 創建請求輔助工具
         self.request_helper = create_request_helper(
             delay=BASE_CONFIG['request_delay'],
-            max_retries=BASE_CONFIG['max_retries']
+            max_retries=BASE_CONFIG['max_retries'],
+            session=session,
+            rate_limiter=rate_limiter
         )
         
+        # 先前已儲存過的貼文連結，命中時跳過留言抓取與分析
+        self.seen_links = seen_links
+        
         if not self.access_token:
             logger.warning("Facebook access token未設置，某些功能可能無法使用")
         
@@ -100,9 +106,10 @@ class FacebookCrawler:
                 logger.error(f"Facebook API錯誤: {data['error']}")
                 return posts
             
-            # 處理貼文
+            # 處理貼文（比對器在迴圈外取得一次）
+            matcher = get_keyword_matcher(keywords)
             for post_data in data.get('data', []):
-                post = self._process_post(post_data, page_id, keywords)
+                post = self._process_post(post_data, page_id, matcher)
                 if post:
                     posts.append(post)
             
@@ -114,14 +121,14 @@ class FacebookCrawler:
         return posts
     
     def _process_post(self, post_data: Dict, page_id: str, 
-                     keywords: List[str]) -> Optional[Dict]:
+                     matcher: KeywordMatcher) -> Optional[Dict]:
         """
         處理單篇貼文
         
         Args:
             post_data: API返回的貼文數據
             page_id: 粉專ID
-            keywords: 關鍵字列表
+            matcher: 關鍵字比對器
             
         Returns:
             處理後的貼文數據或None
@@ -129,8 +136,11 @@ class FacebookCrawler:
         try:
             message = post_data.get('message', '')
             
+            if self.seen_links is not None and post_data.get('permalink_url', '') in self.seen_links:
+                return None
+            
             # 檢查是否包含關鍵字
-            if not any(keyword.lower() in message.lower() for keyword in keywords):
+            if not matcher.contains_any(message):
                 return None
             
             # 解析日期
@@ -168,7 +178,7 @@ class FacebookCrawler:
                 'engagement_rate': (reaction_count + comment_count + share_count),
                 'sentiment': sentiment_result['sentiment'],
                 'sentiment_score': sentiment_result['score'],
-                'keywords_found': text_processor.extract_keywords(message, keywords),
+                'keywords_found': text_processor.extract_keywords(message, matcher),
                 'comments': post_comments,
                 'crawl_time': datetime.now().isoformat()
             }
@@ -363,8 +373,9 @@ class FacebookCrawler:
                 logger.error(f"Facebook搜尋時發生錯誤: {data['error']}")
                 return posts
             
+            matcher = get_keyword_matcher([query])
             for post_data in data.get('data', []):
-                post = self._process_post(post_data, 'search', [query])
+                post = self._process_post(post_data, 'search', matcher)
                 if post:
                     posts.append(post)
             
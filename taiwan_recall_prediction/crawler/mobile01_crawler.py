@@ -18,14 +18,14 @@ from urllib.parse import urljoin, urlparse
 # 導入配置和工具
 try:
     from .config import MOBILE01_CONFIG, BASE_CONFIG, KEYWORDS
-    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from ..utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 except ImportError:
     # 如果作為獨立模組運行
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from crawler.config import MOBILE01_CONFIG, BASE_CONFIG, KEYWORDS
-    from utils.common import text_processor, date_processor, data_processor, create_request_helper
+    from utils.common import text_processor, date_processor, data_processor, create_request_helper, get_keyword_matcher, KeywordMatcher
 
 # 設置日誌
 logger = logging.getLogger(__name__)
@@ -33,7 +33,8 @@ logger = logging.getLogger(__name__)
 class Mobile01Crawler:
     """Mobile01爬蟲類"""
     
-    def __init__(self):
+    def __init__(self, session: requests.Session = None, seen_links=None,
+                 rate_limiter=None):
         self.base_url = MOBILE01_CONFIG['base_url']
         self.forums = MOBILE01_CONFIG['forums']
         self.pages_per_forum = MOBILE01_CONFIG['pages_per_forum']
@@ -41,9 +42,14 @@ class Mobile01Crawler:
         # 創建請求輔助工具
         self.request_helper = create_request_helper(
             delay=BASE_CONFIG['request_delay'],
-            max_retries=BASE_CONFIG['max_retries']
+            max_retries=BASE_CONFIG['max_retries'],
+            session=session,
+            rate_limiter=rate_limiter
         )
         
+        # 先前已儲存過的文章連結，命中時跳過內容抓取與分析
+        self.seen_links = seen_links
+        
         logger.info("Mobile01爬蟲初始化完成")
     
     def get_forum_articles(self, forum_name: str, forum_id: int, 
@@ -64,6 +70,8 @@ class Mobile01Crawler:
             keywords = KEYWORDS['recall'] + KEYWORDS['candidates']
         
         articles = []
+        # 比對器在頁面迴圈外取得一次
+        matcher = get_keyword_matcher(keywords)
         
         logger.info(f"開始爬取Mobile01 {forum_name} 論壇 (ID: {forum_id})，關鍵字: {keywords}")
         
@@ -80,7 +88,7 @@ class Mobile01Crawler:
                 
                 # 解析頁面
                 soup = BeautifulSoup(response.text, 'html.parser')
-                page_articles = self._parse_forum_page(soup, forum_name, keywords)
+                page_articles = self._parse_forum_page(soup, forum_name, matcher)
                 
                 articles.extend(page_articles)
                 
@@ -96,14 +104,14 @@ class Mobile01Crawler:
         return articles
     
     def _parse_forum_page(self, soup: BeautifulSoup, forum_name: str, 
-                         keywords: List[str]) -> List[Dict]:
+                         matcher: KeywordMatcher) -> List[Dict]:
         """
         解析論壇頁面
         
         Args:
             soup: BeautifulSoup對象
             forum_name: 論壇名稱
-            keywords: 關鍵字列表
+            matcher: 關鍵字比對器
             
         Returns:
             文章列表
@@ -120,7 +128,7 @@ class Mobile01Crawler:
             
             for row in topic_rows:
                 try:
-                    article = self._parse_topic_row(row, forum_name, keywords)
+                    article = self._parse_topic_row(row, forum_name, matcher)
                     if article:
                         articles.append(article)
                         
@@ -134,14 +142,14 @@ class Mobile01Crawler:
         return articles
     
     def _parse_topic_row(self, row: BeautifulSoup, forum_name: str, 
-                        keywords: List[str]) -> Optional[Dict]:
+                        matcher: KeywordMatcher) -> Optional[Dict]:
         """
         解析單個主題行
         
         Args:
             row: 主題行的BeautifulSoup對象
             forum_name: 論壇名稱
-            keywords: 關鍵字列表
+            matcher: 關鍵字比對器
             
         Returns:
             文章數據或None
@@ -154,9 +162,11 @@ class Mobile01Crawler:
             
             title = title_link.get_text(strip=True)
             article_url = urljoin(self.base_url, title_link['href'])
+            if self.seen_links is not None and article_url in self.seen_links:
+                return None
             
             # 檢查是否包含關鍵字
-            if not any(keyword.lower() in title.lower() for keyword in keywords):
+            if not matcher.contains_any(title):
                 return None
             
             # 查找作者
@@ -203,7 +213,7 @@ class Mobile01Crawler:
                 'reply_count': reply_count,
                 'sentiment': sentiment_result['sentiment'],
                 'sentiment_score': sentiment_result['score'],
-                'keywords_found': text_processor.extract_keywords(full_text, keywords),
+                'keywords_found': text_processor.extract_keywords(full_text, matcher),
                 'crawl_time': datetime.now().isoformat()
             }
             
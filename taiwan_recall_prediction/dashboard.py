@@ -13,6 +13,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
 import glob
+import importlib
 from datetime import datetime
 import os
 import time
@@ -38,6 +39,23 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 延遲載入的爬蟲/驗證模組（首次呼叫時才導入）；實例帶有可變狀態，
+# 存放在 st.session_state 中，每個使用者Session各自一份，不跨Session共用
+def _session_instance(key, module_name, class_name):
+    if key not in st.session_state:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        st.session_state[key] = cls()
+    return st.session_state[key]
+
+def _real_crawler_instance():
+    return _session_instance('_real_crawler', 'real_data_crawler', 'RealDataCrawler')
+
+def _data_source_validator_instance():
+    return _session_instance('_data_source_validator', 'data_source_validator', 'DataSourceValidator')
+
+def _multi_platform_crawler_instance():
+    return _session_instance('_multi_platform_crawler', 'multi_platform_crawler', 'MultiPlatformCrawler')
+
 class FermiAgent:
     """費米推論Agent基礎類別"""
     def __init__(self, name, role):
@@ -5026,11 +5044,8 @@ R_agree = Σ(Pᵢ × Sᵢ) × I_factor ± σ_agree
 
         # 初始化爬蟲
         try:
-            from real_data_crawler import RealDataCrawler
-            from data_source_validator import DataSourceValidator
-
-            crawler = RealDataCrawler()
-            validator = DataSourceValidator()
+            crawler = _real_crawler_instance()
+            validator = _data_source_validator_instance()
 
             # 顯示爬取進度
             if st.session_state.get('crawler_refresh', False):
@@ -5460,9 +5475,7 @@ R_agree = Σ(Pᵢ × Sᵢ) × I_factor ± σ_agree
 
         try:
             # 嘗試多平台爬蟲
-            from multi_platform_crawler import MultiPlatformCrawler
-
-            multi_crawler = MultiPlatformCrawler()
+            multi_crawler = _multi_platform_crawler_instance()
             result = multi_crawler.crawl_all_platforms(candidate_name)
 
             # 轉換為統一格式
@@ -5540,25 +5553,20 @@ R_agree = Σ(Pᵢ × Sᵢ) × I_factor ± σ_agree
 
         st.markdown("#### 🔥 **模擬熱門討論** (基於真實PTT討論模式)")
 
-        for i, discussion in enumerate(realistic_discussions, 1):
-            with st.container():
-                col1, col2, col3 = st.columns([6, 2, 2])
-
-                with col1:
-                    st.markdown(f"**{i}. {discussion['title']}**")
-                    st.caption(f"作者: {discussion['author']} | 看板: {discussion.get('board', 'Unknown')}")
-
-                with col2:
-                    sentiment_color = "🟢" if discussion['sentiment'] == 'positive' else "🔴" if discussion['sentiment'] == 'negative' else "🟡"
-                    st.markdown(f"{sentiment_color} {discussion['sentiment']}")
-
-                with col3:
-                    st.markdown(f"推文: {discussion['comments']}")
+        # 以單一表格呈現，避免逐列建立多個元件
+        df = pd.DataFrame(realistic_discussions)
+        sentiment_counts = df['sentiment'].value_counts()
+        df['sentiment'] = df['sentiment'].map({'positive': '🟢 positive', 'negative': '🔴 negative', 'neutral': '🟡 neutral'})
+        st.dataframe(
+            df[['title', 'author', 'board', 'sentiment', 'comments']],
+            use_container_width=True,
+            hide_index=True
+        )
 
         # 模擬數據統計
-        positive_count = sum(1 for d in realistic_discussions if d['sentiment'] == 'positive')
-        negative_count = sum(1 for d in realistic_discussions if d['sentiment'] == 'negative')
-        neutral_count = len(realistic_discussions) - positive_count - negative_count
+        positive_count = int(sentiment_counts.get('positive', 0))
+        negative_count = int(sentiment_counts.get('negative', 0))
+        neutral_count = len(df) - positive_count - negative_count
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -5620,11 +5628,8 @@ R_agree = Σ(Pᵢ × Sᵢ) × I_factor ± σ_agree
 
         # 整合真實數據爬蟲
         try:
-            from real_data_crawler import RealDataCrawler
-            from data_source_validator import DataSourceValidator
-
-            crawler = RealDataCrawler()
-            validator = DataSourceValidator()
+            crawler = _real_crawler_instance()
+            validator = _data_source_validator_instance()
 
             # 獲取真實新聞數據
             news_data = crawler.crawl_news_sentiment(recall_target, 15)
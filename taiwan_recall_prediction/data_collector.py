@@ -7,6 +7,7 @@
 
 import requests
 import pandas as pd
+import numpy as np
 import json
 import time
 from datetime import datetime, timedelta
@@ -14,10 +15,37 @@ import os
 from typing import Dict, List, Optional
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 模擬數據共用亂數產生器（設定 MOCK_SEED 可得到可重現的輸出，0 也是有效的種子）
+_MOCK_SEED = os.getenv('MOCK_SEED')
+_RNG = np.random.default_rng(int(_MOCK_SEED) if _MOCK_SEED is not None else None)
+
+def _iter_json_items(response: requests.Response, prefix: str):
+    """逐筆解析串流回應中的JSON陣列（未安裝ijson時退回完整解析）"""
+    if ijson is None:
+        data = response.json()
+        for key in prefix.split('.')[:-1]:
+            data = data.get(key, [])
+        yield from data
+        return
+
+    response.raw.decode_content = True
+    yield from ijson.items(response.raw, prefix)
+
+def _mock_timestamps(days: int, size: int) -> np.ndarray:
+    """生成過去 days 天內的隨機ISO時間字串（只取一次現在時間）"""
+    now = np.datetime64(datetime.now(), 's')
+    offsets = (_RNG.integers(0, days + 1, size=size) * 86400).astype('timedelta64[s]')
+    return (now - offsets).astype(str)
+
 class DataCollector:
     """統一數據收集器"""
     
@@ -76,11 +104,11 @@ class DataCollector:
             # Facebook Graph API調用
             base_url = "https://graph.facebook.com/v18.0"
             
-            all_data = []
+            all_data: List[Dict] = []
             for keyword in keywords:
                 # 搜索公開貼文
-                search_url = f"{base_url}/search"
-                params = {
+                search_url: str = f"{base_url}/search"
+                params: Dict = {
                     'q': keyword,
                     'type': 'post',
                     'access_token': access_token,
@@ -88,20 +116,21 @@ class DataCollector:
                     'limit': 100
                 }
                 
-                response = self.session.get(search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for post in data.get('data', []):
-                        all_data.append({
-                            'platform': 'Facebook',
-                            'keyword': keyword,
-                            'post_id': post.get('id'),
-                            'content': post.get('message', ''),
-                            'created_time': post.get('created_time'),
-                            'likes': post.get('likes', {}).get('summary', {}).get('total_count', 0),
-                            'comments': post.get('comments', {}).get('summary', {}).get('total_count', 0),
-                            'shares': post.get('shares', {}).get('count', 0)
-                        })
+                # 串流回應未讀完時連線不會回到連線池，以with確保任何情況下都釋放
+                with self.session.get(search_url, params=params, stream=True) as response:
+                    if response.status_code == 200:
+                        post: Dict
+                        for post in _iter_json_items(response, 'data.item'):
+                            all_data.append({
+                                'platform': 'Facebook',
+                                'keyword': keyword,
+                                'post_id': post.get('id'),
+                                'content': post.get('message', ''),
+                                'created_time': post.get('created_time'),
+                                'likes': post.get('likes', {}).get('summary', {}).get('total_count', 0),
+                                'comments': post.get('comments', {}).get('summary', {}).get('total_count', 0),
+                                'shares': post.get('shares', {}).get('count', 0)
+                            })
                 
                 time.sleep(1)  # API限制
             
@@ -160,11 +189,11 @@ class DataCollector:
             # YouTube Data API v3調用
             base_url = "https://www.googleapis.com/youtube/v3"
             
-            all_data = []
+            all_data: List[Dict] = []
             for keyword in keywords:
                 # 搜索影片
-                search_url = f"{base_url}/search"
-                params = {
+                search_url: str = f"{base_url}/search"
+                params: Dict = {
                     'part': 'snippet',
                     'q': keyword,
                     'type': 'video',
@@ -173,40 +202,44 @@ class DataCollector:
                     'publishedAfter': (datetime.now() - timedelta(days=days)).isoformat() + 'Z'
                 }
                 
-                response = self.session.get(search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
+                # 先讀完搜尋結果並關閉串流，再逐一查詢影片統計，避免串流佔住連線
+                items: List[Dict] = []
+                with self.session.get(search_url, params=params, stream=True) as response:
+                    if response.status_code == 200:
+                        items = list(_iter_json_items(response, 'items.item'))
+                
+                item: Dict
+                for item in items:
+                    video_id: str = item['id']['videoId']
+                    snippet: Dict = item['snippet']
+                    
+                    # 獲取影片統計
+                    stats_url: str = f"{base_url}/videos"
+                    stats_params: Dict = {
+                        'part': 'statistics',
+                        'id': video_id,
+                        'key': api_key
+                    }
                     
-                    for item in data.get('items', []):
-                        video_id = item['id']['videoId']
-                        
-                        # 獲取影片統計
-                        stats_url = f"{base_url}/videos"
-                        stats_params = {
-                            'part': 'statistics',
-                            'id': video_id,
-                            'key': api_key
-                        }
-                        
-                        stats_response = self.session.get(stats_url, params=stats_params)
-                        stats_data = stats_response.json()
-                        
-                        statistics = stats_data.get('items', [{}])[0].get('statistics', {})
-                        
-                        all_data.append({
-                            'platform': 'YouTube',
-                            'keyword': keyword,
-                            'video_id': video_id,
-                            'title': item['snippet']['title'],
-                            'description': item['snippet']['description'],
-                            'published_at': item['snippet']['publishedAt'],
-                            'channel_title': item['snippet']['channelTitle'],
-                            'view_count': int(statistics.get('viewCount', 0)),
-                            'like_count': int(statistics.get('likeCount', 0)),
-                            'comment_count': int(statistics.get('commentCount', 0))
-                        })
-                        
-                        time.sleep(0.1)  # API限制
+                    stats_response = self.session.get(stats_url, params=stats_params)
+                    stats_data: Dict = stats_response.json()
+                    
+                    statistics: Dict = stats_data.get('items', [{}])[0].get('statistics', {})
+                    
+                    all_data.append({
+                        'platform': 'YouTube',
+                        'keyword': keyword,
+                        'video_id': video_id,
+                        'title': snippet['title'],
+                        'description': snippet['description'],
+                        'published_at': snippet['publishedAt'],
+                        'channel_title': snippet['channelTitle'],
+                        'view_count': int(statistics.get('viewCount', 0)),
+                        'like_count': int(statistics.get('likeCount', 0)),
+                        'comment_count': int(statistics.get('commentCount', 0))
+                    })
+                    
+                    time.sleep(0.1)  # API限制
                 
                 time.sleep(1)  # API限制
             
@@ -276,88 +309,77 @@ class DataCollector:
 
     def generate_mock_data(self, keywords: List[str], count: int = 10) -> List[Dict]:
         """生成通用模擬數據"""
-        import random
-        from datetime import datetime, timedelta
-
-        mock_data = []
         platforms = ['Facebook', 'Instagram', 'YouTube', 'PTT']
         sentiments = ['positive', 'negative', 'neutral']
 
-        for i in range(count):
-            mock_data.append({
-                'platform': random.choice(platforms),
-                'content': f"關於{random.choice(keywords)}的討論內容 {i+1}",
-                'sentiment': random.choice(sentiments),
-                'sentiment_score': random.uniform(-1, 1),
-                'likes': random.randint(0, 1000),
-                'shares': random.randint(0, 100),
-                'comments': random.randint(0, 200),
-                'created_at': (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat(),
-                'keyword': random.choice(keywords)
-            })
+        df = pd.DataFrame({
+            'platform': _RNG.choice(platforms, size=count),
+            'content': [f"關於{kw}的討論內容 {i+1}" for i, kw in enumerate(_RNG.choice(keywords, size=count))],
+            'sentiment': _RNG.choice(sentiments, size=count),
+            'sentiment_score': _RNG.uniform(-1, 1, size=count),
+            'likes': _RNG.integers(0, 1001, size=count),
+            'shares': _RNG.integers(0, 101, size=count),
+            'comments': _RNG.integers(0, 201, size=count),
+            'created_at': _mock_timestamps(30, count),
+            'keyword': _RNG.choice(keywords, size=count)
+        })
 
-        return mock_data
+        return df.to_dict('records')
 
     def generate_mock_facebook_data(self, keywords: List[str], days: int) -> pd.DataFrame:
         """生成模擬Facebook數據"""
-        import random
-        
-        mock_data = []
-        for keyword in keywords:
-            for i in range(random.randint(10, 30)):
-                mock_data.append({
-                    'platform': 'Facebook',
-                    'keyword': keyword,
-                    'post_id': f'fb_{keyword}_{i}',
-                    'content': f'關於{keyword}的討論內容...',
-                    'created_time': (datetime.now() - timedelta(days=random.randint(0, days))).isoformat(),
-                    'likes': random.randint(0, 500),
-                    'comments': random.randint(0, 100),
-                    'shares': random.randint(0, 50)
-                })
-        
-        return pd.DataFrame(mock_data)
+        counts = _RNG.integers(10, 31, size=len(keywords))
+        keyword_col = np.repeat(keywords, counts)
+        index_col = np.concatenate([np.arange(n) for n in counts]) if len(counts) else np.array([], dtype=int)
+        total = int(counts.sum())
+
+        return pd.DataFrame({
+            'platform': 'Facebook',
+            'keyword': keyword_col,
+            'post_id': [f'fb_{kw}_{i}' for kw, i in zip(keyword_col, index_col)],
+            'content': [f'關於{kw}的討論內容...' for kw in keyword_col],
+            'created_time': _mock_timestamps(days, total),
+            'likes': _RNG.integers(0, 501, size=total),
+            'comments': _RNG.integers(0, 101, size=total),
+            'shares': _RNG.integers(0, 51, size=total)
+        })
 
     def generate_mock_instagram_data(self, hashtags: List[str], days: int) -> pd.DataFrame:
         """生成模擬Instagram數據"""
-        import random
-        
-        mock_data = []
-        for hashtag in hashtags:
-            for i in range(random.randint(5, 20)):
-                mock_data.append({
-                    'platform': 'Instagram',
-                    'hashtag': hashtag,
-                    'post_id': f'ig_{hashtag}_{i}',
-                    'caption': f'#{hashtag} 相關內容...',
-                    'created_time': (datetime.now() - timedelta(days=random.randint(0, days))).isoformat(),
-                    'likes': random.randint(0, 1000),
-                    'comments': random.randint(0, 200)
-                })
-        
-        return pd.DataFrame(mock_data)
+        counts = _RNG.integers(5, 21, size=len(hashtags))
+        hashtag_col = np.repeat(hashtags, counts)
+        index_col = np.concatenate([np.arange(n) for n in counts]) if len(counts) else np.array([], dtype=int)
+        total = int(counts.sum())
+
+        return pd.DataFrame({
+            'platform': 'Instagram',
+            'hashtag': hashtag_col,
+            'post_id': [f'ig_{tag}_{i}' for tag, i in zip(hashtag_col, index_col)],
+            'caption': [f'#{tag} 相關內容...' for tag in hashtag_col],
+            'created_time': _mock_timestamps(days, total),
+            'likes': _RNG.integers(0, 1001, size=total),
+            'comments': _RNG.integers(0, 201, size=total)
+        })
 
     def generate_mock_youtube_data(self, keywords: List[str], days: int) -> pd.DataFrame:
         """生成模擬YouTube數據"""
-        import random
-        
-        mock_data = []
-        for keyword in keywords:
-            for i in range(random.randint(3, 15)):
-                mock_data.append({
-                    'platform': 'YouTube',
-                    'keyword': keyword,
-                    'video_id': f'yt_{keyword}_{i}',
-                    'title': f'{keyword}相關影片標題',
-                    'description': f'關於{keyword}的影片描述...',
-                    'published_at': (datetime.now() - timedelta(days=random.randint(0, days))).isoformat(),
-                    'channel_title': f'頻道_{i}',
-                    'view_count': random.randint(100, 50000),
-                    'like_count': random.randint(10, 2000),
-                    'comment_count': random.randint(5, 500)
-                })
-        
-        return pd.DataFrame(mock_data)
+        counts = _RNG.integers(3, 16, size=len(keywords))
+        keyword_col = np.repeat(keywords, counts)
+        index_col = np.concatenate([np.arange(n) for n in counts]) if len(counts) else np.array([], dtype=int)
+        total = int(counts.sum())
+
+        return pd.DataFrame({
+            'platform': 'YouTube',
+            'keyword': keyword_col,
+            'video_id': [f'yt_{kw}_{i}' for kw, i in zip(keyword_col, index_col)],
+            'title': [f'{kw}相關影片標題' for kw in keyword_col],
+            'description': [f'關於{kw}的影片描述...' for kw in keyword_col],
+            'published_at': _mock_timestamps(days, total),
+            'channel_title': [f'頻道_{i}' for i in index_col],
+            'view_count': _RNG.integers(100, 50001, size=total),
+            'like_count': _RNG.integers(10, 2001, size=total),
+            'comment_count': _RNG.integers(5, 501, size=total)
+        })
 
     def generate_mock_government_data(self) -> Dict[str, pd.DataFrame]:
         """生成模擬政府數據"""
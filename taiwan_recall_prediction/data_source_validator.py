@@ -7,19 +7,39 @@ Data Source Validator and Annotation System
 確保所有數據都明確標註來源，區分真實數據和模擬數據
 """
 
+import io
 import json
+import re
+from collections import Counter, deque
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MECE各維度對應的參考來源
+REFERENCE_MAP = {
+    '政治立場': '韓國瑜罷免案分析 + TVBS民調',
+    '年齡層': '台灣民主基金會民調 + 山水民調',
+    '地區': '內政部統計 + 歷年選舉結果',
+    '教育程度': '台灣社會變遷調查 + 中研院研究',
+    '職業': '勞動部統計 + 政治參與調查'
+}
+
 class DataSourceValidator:
     """數據來源驗證器"""
     
+    max_log_entries = 100_000
+    
     def __init__(self):
         self.data_sources = {
             'real_sources': [
@@ -42,7 +62,17 @@ class DataSourceValidator:
             ]
         }
         
-        self.validation_log = []
+        # 模擬數據來源關鍵字預先編譯為單一正規表示式
+        self._sim_re = re.compile('|'.join(re.escape(s) for s in self.data_sources['simulated_sources']))
+        
+        # 只保留最近的驗證紀錄，避免長時間執行時無限增長
+        self.validation_log = deque(maxlen=self.max_log_entries)
+        
+        # 累計統計，報告不需重新掃描日誌
+        self._sim_count = 0
+        self._real_count = 0
+        self._warn_count = 0
+        self._source_counter = Counter()
     
     def validate_data_source(self, data: Dict) -> Dict:
         """驗證數據來源並添加標註"""
@@ -58,32 +88,80 @@ class DataSourceValidator:
         if 'is_simulated' not in data:
             # 根據數據來源判斷
             source = validated_data.get('data_source', '')
-            if any(sim_source in source for sim_source in self.data_sources['simulated_sources']):
-                validated_data['is_simulated'] = True
-            else:
-                validated_data['is_simulated'] = False
+            validated_data['is_simulated'] = bool(self._sim_re.search(source))
         
         # 添加驗證時間戳
-        validated_data['validation_timestamp'] = datetime.now().isoformat()
+        timestamp = datetime.now().isoformat()
+        validated_data['validation_timestamp'] = timestamp
         
         # 記錄驗證日誌
-        self._log_validation(validated_data)
+        self._log_validation(validated_data, timestamp)
         
         return validated_data
     
-    def _log_validation(self, data: Dict):
+    def validate_batch(self, records: List[Dict]) -> pd.DataFrame:
+        """批次驗證多筆數據來源（欄位式處理，結果與逐筆驗證一致）"""
+        df = pd.DataFrame(records)
+        if df.empty:
+            return df
+        
+        timestamp = datetime.now().isoformat()
+        
+        # 檢查是否已有數據來源標註
+        if 'data_source' not in df:
+            df['data_source'] = np.nan
+        missing_source = df['data_source'].isna()
+        df['data_source'] = df['data_source'].fillna('⚠️ 未標註數據來源 (Unknown Source)')
+        if missing_source.any():
+            df.loc[missing_source, 'validation_warning'] = '數據來源未明確標註'
+        
+        # 未標註是否模擬的紀錄，依數據來源判斷
+        inferred = df['data_source'].astype(str).str.contains(self._sim_re)
+        if 'is_simulated' in df:
+            df['is_simulated'] = df['is_simulated'].where(df['is_simulated'].notna(), inferred).astype(bool)
+        else:
+            df['is_simulated'] = inferred
+        
+        df['validation_timestamp'] = timestamp
+        
+        # 一次性記錄驗證日誌
+        has_warning = df['validation_warning'].notna() if 'validation_warning' in df else pd.Series(False, index=df.index)
+        log_df = pd.DataFrame({
+            'timestamp': timestamp,
+            'data_source': df['data_source'],
+            'is_simulated': df['is_simulated'],
+            'has_warning': has_warning
+        })
+        self.validation_log.extend(log_df.to_dict('records'))
+        sim_count = int(log_df['is_simulated'].sum())
+        self._sim_count += sim_count
+        self._real_count += len(log_df) - sim_count
+        self._warn_count += int(log_df['has_warning'].sum())
+        self._source_counter.update(log_df['data_source'].tolist())
+        
+        return df
+    
+    def _log_validation(self, data: Dict, timestamp: str):
         """記錄驗證日誌"""
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
             'data_source': data.get('data_source', 'Unknown'),
             'is_simulated': data.get('is_simulated', True),
             'has_warning': 'validation_warning' in data
         }
         self.validation_log.append(log_entry)
+        if log_entry['is_simulated']:
+            self._sim_count += 1
+        else:
+            self._real_count += 1
+        if log_entry['has_warning']:
+            self._warn_count += 1
+        self._source_counter[log_entry['data_source']] += 1
     
     def generate_data_source_report(self) -> Dict:
         """生成數據來源報告"""
-        if not self.validation_log:
+        total = self._real_count + self._sim_count
+        if not total:
             return {
                 'total_validations': 0,
                 'real_data_count': 0,
@@ -92,10 +170,9 @@ class DataSourceValidator:
                 'report_timestamp': datetime.now().isoformat()
             }
         
-        total = len(self.validation_log)
-        real_count = sum(1 for log in self.validation_log if not log['is_simulated'])
-        simulated_count = sum(1 for log in self.validation_log if log['is_simulated'])
-        warning_count = sum(1 for log in self.validation_log if log['has_warning'])
+        real_count = self._real_count
+        simulated_count = self._sim_count
+        warning_count = self._warn_count
         
         return {
             'total_validations': total,
@@ -111,94 +188,60 @@ class DataSourceValidator:
     
     def _get_source_breakdown(self) -> Dict:
         """獲取數據來源分解"""
-        source_counts = {}
-        for log in self.validation_log:
-            source = log['data_source']
-            if source in source_counts:
-                source_counts[source] += 1
-            else:
-                source_counts[source] = 1
-        
-        return source_counts
+        return dict(self._source_counter)
     
-    def annotate_mece_data(self, mece_data: pd.DataFrame) -> pd.DataFrame:
-        """為MECE數據添加來源標註"""
-        annotated_data = mece_data.copy()
+    def annotate_mece_data(self, mece_data: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """為MECE數據添加來源標註（inplace=True 時直接修改傳入的DataFrame）"""
+        annotations = {
+            'data_source': '📊 統計推估數據 (Statistical Estimation)',
+            'is_simulated': True,
+            'source_type': 'statistical_model',
+            'reference_basis': '基於歷史案例和學術研究',
+            # 為不同維度添加具體參考來源
+            'reference_source': mece_data['dimension'].map(REFERENCE_MAP).fillna('綜合統計資料')
+        }
         
-        # 添加數據來源列
-        annotated_data['data_source'] = '📊 統計推估數據 (Statistical Estimation)'
-        annotated_data['is_simulated'] = True
-        annotated_data['source_type'] = 'statistical_model'
-        annotated_data['reference_basis'] = '基於歷史案例和學術研究'
+        if not inplace:
+            return mece_data.assign(**annotations)
         
-        # 為不同維度添加具體參考來源
-        for idx, row in annotated_data.iterrows():
-            dimension = row['dimension']
-            category = row['category']
-            
-            if dimension == '政治立場':
-                annotated_data.at[idx, 'reference_source'] = '韓國瑜罷免案分析 + TVBS民調'
-            elif dimension == '年齡層':
-                annotated_data.at[idx, 'reference_source'] = '台灣民主基金會民調 + 山水民調'
-            elif dimension == '地區':
-                annotated_data.at[idx, 'reference_source'] = '內政部統計 + 歷年選舉結果'
-            elif dimension == '教育程度':
-                annotated_data.at[idx, 'reference_source'] = '台灣社會變遷調查 + 中研院研究'
-            elif dimension == '職業':
-                annotated_data.at[idx, 'reference_source'] = '勞動部統計 + 政治參與調查'
-            else:
-                annotated_data.at[idx, 'reference_source'] = '綜合統計資料'
-        
-        return annotated_data
+        for column, value in annotations.items():
+            mece_data[column] = value
+        return mece_data
     
     def create_data_transparency_report(self, all_data: Dict) -> str:
         """創建數據透明度報告"""
-        report = []
-        report.append("# 🔍 台灣罷免預測系統 - 數據透明度報告")
-        report.append(f"**生成時間**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w("# 🔍 台灣罷免預測系統 - 數據透明度報告\n")
+        w(f"**生成時間**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         
         # 數據來源概覽
-        report.append("## 📊 數據來源概覽")
-        report.append("")
-        
-        real_sources = []
-        simulated_sources = []
+        w("## 📊 數據來源概覽\n\n")
         
-        for key, data in all_data.items():
-            if isinstance(data, dict):
-                is_simulated = data.get('is_simulated', True)
-                source = data.get('data_source', '未知來源')
-                
-                if is_simulated:
-                    simulated_sources.append(f"- **{key}**: {source}")
-                else:
-                    real_sources.append(f"- **{key}**: {source}")
+        sources = pd.DataFrame(
+            [
+                {'key': key, 'source': data.get('data_source', '未知來源'), 'sim': bool(data.get('is_simulated', True))}
+                for key, data in all_data.items() if isinstance(data, dict)
+            ],
+            columns=['key', 'source', 'sim']
+        )
+        is_sim = sources['sim'].astype(bool)
+        lines = '- **' + sources['key'].astype(str) + '**: ' + sources['source'].astype(str) + '\n'
+        real_sources = lines[~is_sim].tolist()
+        simulated_sources = lines[is_sim].tolist()
         
-        report.append("### ✅ 真實數據來源")
-        if real_sources:
-            report.extend(real_sources)
-        else:
-            report.append("- 目前無真實數據來源")
-        report.append("")
+        w("### ✅ 真實數據來源\n")
+        w("".join(real_sources) if real_sources else "- 目前無真實數據來源\n")
+        w("\n")
         
-        report.append("### ⚠️ 模擬數據來源")
-        if simulated_sources:
-            report.extend(simulated_sources)
-        else:
-            report.append("- 目前無模擬數據")
-        report.append("")
+        w("### ⚠️ 模擬數據來源\n")
+        w("".join(simulated_sources) if simulated_sources else "- 目前無模擬數據\n")
+        w("\n")
         
         # 數據品質評估
-        total_sources = len(real_sources) + len(simulated_sources)
+        total_sources = len(sources)
         if total_sources > 0:
-            real_percentage = (len(real_sources) / total_sources) * 100
-            report.append("## 📈 數據品質評估")
-            report.append("")
-            report.append(f"- **總數據源數量**: {total_sources}")
-            report.append(f"- **真實數據比例**: {real_percentage:.1f}%")
-            report.append(f"- **模擬數據比例**: {100-real_percentage:.1f}%")
-            report.append("")
+            real_percentage = (1 - is_sim.mean()) * 100
             
             if real_percentage >= 70:
                 quality_level = "🟢 高品質"
@@ -207,27 +250,27 @@ class DataSourceValidator:
             else:
                 quality_level = "🔴 需要改善"
             
-            report.append(f"- **數據品質等級**: {quality_level}")
+            w("## 📈 數據品質評估\n\n")
+            w(f"- **總數據源數量**: {total_sources}\n"
+              f"- **真實數據比例**: {real_percentage:.1f}%\n"
+              f"- **模擬數據比例**: {100-real_percentage:.1f}%\n\n"
+              f"- **數據品質等級**: {quality_level}\n")
         
         # 改善建議
-        report.append("")
-        report.append("## 💡 數據品質改善建議")
-        report.append("")
-        report.append("1. **增加真實數據來源**: 申請更多官方API金鑰")
-        report.append("2. **提升爬蟲穩定性**: 改善網站爬蟲的錯誤處理")
-        report.append("3. **數據驗證機制**: 建立多源數據交叉驗證")
-        report.append("4. **即時監控**: 建立數據來源健康度監控")
-        report.append("")
+        w("\n## 💡 數據品質改善建議\n\n")
+        w("1. **增加真實數據來源**: 申請更多官方API金鑰\n"
+          "2. **提升爬蟲穩定性**: 改善網站爬蟲的錯誤處理\n"
+          "3. **數據驗證機制**: 建立多源數據交叉驗證\n"
+          "4. **即時監控**: 建立數據來源健康度監控\n\n")
         
         # 免責聲明
-        report.append("## ⚠️ 免責聲明")
-        report.append("")
-        report.append("- 本系統僅供學術研究和教育用途")
-        report.append("- 模擬數據僅用於系統展示，不代表真實情況")
-        report.append("- 預測結果不構成任何政治建議或投資指導")
-        report.append("- 使用者應理性看待預測結果，並結合多元資訊來源")
+        w("## ⚠️ 免責聲明\n\n")
+        w("- 本系統僅供學術研究和教育用途\n"
+          "- 模擬數據僅用於系統展示，不代表真實情況\n"
+          "- 預測結果不構成任何政治建議或投資指導\n"
+          "- 使用者應理性看待預測結果，並結合多元資訊來源")
         
-        return "\n".join(report)
+        return buf.getvalue()
 
 def validate_all_system_data():
     """驗證系統中所有數據的來源"""
@@ -270,7 +313,10 @@ if __name__ == "__main__":
     results = validate_all_system_data()
     
     print("=== 數據驗證報告 ===")
-    print(json.dumps(results['validation_report'], ensure_ascii=False, indent=2))
+    if orjson is not None:
+        print(orjson.dumps(results['validation_report'], option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(results['validation_report'], ensure_ascii=False, indent=2))
     
     print("\n=== 數據透明度報告 ===")
     print(results['transparency_report'])
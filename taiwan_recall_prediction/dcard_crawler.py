@@ -10,18 +10,90 @@ import time
 import pandas as pd
 from datetime import datetime, timedelta
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 可選的HTTP快取層（跨執行保留回應，未變更的端點不需重新下載）
+try:
+    import hishel
+except ImportError:
+    hishel = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 版面爬取時篩選相關文章的標題關鍵字
+KEYWORD_RE = re.compile('罷免|罷韓|罷王|政治|選舉')
+
+def _parse_json(resp):
+    """解析JSON回應（有安裝orjson時使用較快的解析器）"""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
 
 class DcardCrawler:
+    # 文章詳情並行抓取設定
+    max_workers = 8
+    requests_per_second = 8
+
     def __init__(self):
         self.base_url = "https://www.dcard.tw"
         self.api_url = "https://www.dcard.tw/service/api/v2"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = self._create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Referer': 'https://www.dcard.tw/'
         })
         
+        # 已收集的文章ID，重複文章直接略過
+        self._seen_ids = set()
+        
+        # 簡易速率限制器（取代逐篇 sleep）
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        
+    def _create_session(self, headers):
+        """
+        建立HTTP客戶端：優先使用支援HTTP/2連線多工的httpx，否則退回requests；
+        有安裝 hishel / requests-cache 時會加上持久化的HTTP快取
+
+        兩種快取皆依伺服器的Cache-Control決定是否快取；requests-cache對沒有
+        快取標頭的回應一律重新驗證（ETag/Last-Modified），不會回傳過期的文章列表
+        """
+        if httpx is not None:
+            client_cls = hishel.CacheClient if hishel is not None else httpx.Client
+            try:
+                # requests.Session 預設會跟隨重新導向，httpx 須明確開啟
+                return client_cls(http2=True, headers=headers, timeout=10, follow_redirects=True)
+            except ImportError:
+                # 未安裝 h2 套件時無法啟用HTTP/2
+                pass
+        
+        if requests_cache is not None:
+            session = requests_cache.CachedSession(
+                'dcard_cache',
+                backend='sqlite',
+                cache_control=True,
+                expire_after=requests_cache.EXPIRE_IMMEDIATELY,
+                allowable_methods=('GET',)
+            )
+        else:
+            session = requests.Session()
+        session.headers.update(headers)
+        return session
+    
     def search_posts(self, keywords=['罷免', '罷韓', '罷王'], limit=100):
         """
         搜尋相關文章
@@ -54,32 +126,19 @@ class DcardCrawler:
             resp = self.session.get(search_url, params=params)
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = self._filter_new_posts(_parse_json(resp))
+                
+                # 並行獲取文章詳細內容
+                details = self._fetch_post_details([post['id'] for post in data])
                 
-                for post in data:
+                for post, post_detail in zip(data, details):
                     try:
-                        # 獲取文章詳細內容
-                        post_detail = self._get_post_detail(post['id'])
-                        
                         if post_detail:
-                            posts.append({
-                                'id': post['id'],
-                                'title': post.get('title', ''),
-                                'content': post_detail.get('content', ''),
-                                'excerpt': post.get('excerpt', ''),
-                                'author': 'Anonymous',  # Dcard匿名
-                                'forum': post.get('forumName', ''),
-                                'like_count': post.get('likeCount', 0),
-                                'comment_count': post.get('commentCount', 0),
-                                'created_at': post.get('createdAt', ''),
-                                'updated_at': post.get('updatedAt', ''),
-                                'link': f"{self.base_url}/f/{post.get('forumAlias', 'all')}/p/{post['id']}",
-                                'source': 'Dcard',
-                                'keyword': keyword,
-                                'crawl_time': datetime.now().isoformat()
-                            })
-                            
-                        time.sleep(1)  # 避免請求過快
+                            posts.append(self._build_post(
+                                post, post_detail, keyword,
+                                f"{self.base_url}/f/{post.get('forumAlias', 'all')}/p/{post['id']}"
+                            ))
+                            self._seen_ids.add(post['id'])
                         
                     except Exception as e:
                         print(f"處理文章 {post.get('id')} 時發生錯誤: {e}")
@@ -93,16 +152,75 @@ class DcardCrawler:
             
         return posts
     
+    def _filter_new_posts(self, posts):
+        """
+        過濾已收集過的文章與同一批次內的重複文章
+
+        文章ID在成功取得詳情後才記錄為已收集，詳情抓取失敗的文章之後仍可重新收集
+        """
+        new_posts = []
+        batch_ids = set()
+        for post in posts:
+            if post['id'] in self._seen_ids or post['id'] in batch_ids:
+                continue
+            batch_ids.add(post['id'])
+            new_posts.append(post)
+        return new_posts
+    
+    def _build_post(self, post, post_detail, keyword, link):
+        """
+        組合文章資料
+        """
+        return {
+            'id': post['id'],
+            'title': post.get('title', ''),
+            'content': post_detail.get('content', ''),
+            'excerpt': post.get('excerpt', ''),
+            'author': 'Anonymous',  # Dcard匿名
+            'forum': post.get('forumName', ''),
+            'like_count': post.get('likeCount', 0),
+            'comment_count': post.get('commentCount', 0),
+            'created_at': post.get('createdAt', ''),
+            'updated_at': post.get('updatedAt', ''),
+            'link': link,
+            'source': 'Dcard',
+            'keyword': keyword,
+            'crawl_time': datetime.now().isoformat()
+        }
+    
+    def _fetch_post_details(self, post_ids):
+        """
+        以有限的執行緒池並行獲取多篇文章詳情（順序與 post_ids 相同）
+        """
+        if not post_ids:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(post_ids))) as executor:
+            return list(executor.map(self._get_post_detail, post_ids))
+    
+    def _throttle(self):
+        """
+        控制請求速率，所有執行緒共用同一個時間槽
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + 1.0 / self.requests_per_second
+        
+        if wait > 0:
+            time.sleep(wait)
+    
     def _get_post_detail(self, post_id):
         """
         獲取文章詳細內容
         """
         try:
+            self._throttle()
             detail_url = f"{self.api_url}/posts/{post_id}"
             resp = self.session.get(detail_url)
             
             if resp.status_code == 200:
-                return resp.json()
+                return _parse_json(resp)
             else:
                 print(f"獲取文章 {post_id} 詳情失敗，狀態碼: {resp.status_code}")
                 return None
@@ -127,39 +245,28 @@ class DcardCrawler:
             resp = self.session.get(forum_url, params=params)
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = _parse_json(resp)
+                
+                # 檢查標題是否包含相關關鍵字
+                matched = self._filter_new_posts([
+                    post for post in data
+                    if KEYWORD_RE.search(post.get('title', '').lower())
+                ])
+                details = self._fetch_post_details([post['id'] for post in matched])
                 
-                for post in data:
-                    # 檢查標題是否包含相關關鍵字
-                    title = post.get('title', '').lower()
-                    if any(keyword in title for keyword in ['罷免', '罷韓', '罷王', '政治', '選舉']):
-                        try:
-                            post_detail = self._get_post_detail(post['id'])
-                            
-                            if post_detail:
-                                posts.append({
-                                    'id': post['id'],
-                                    'title': post.get('title', ''),
-                                    'content': post_detail.get('content', ''),
-                                    'excerpt': post.get('excerpt', ''),
-                                    'author': 'Anonymous',
-                                    'forum': post.get('forumName', ''),
-                                    'like_count': post.get('likeCount', 0),
-                                    'comment_count': post.get('commentCount', 0),
-                                    'created_at': post.get('createdAt', ''),
-                                    'updated_at': post.get('updatedAt', ''),
-                                    'link': f"{self.base_url}/f/{forum_alias}/p/{post['id']}",
-                                    'source': 'Dcard',
-                                    'keyword': 'forum_crawl',
-                                    'crawl_time': datetime.now().isoformat()
-                                })
-                                
-                            time.sleep(1)
-                            
-                        except Exception as e:
-                            print(f"處理版面文章 {post.get('id')} 時發生錯誤: {e}")
-                            continue
-                            
+                for post, post_detail in zip(matched, details):
+                    try:
+                        if post_detail:
+                            posts.append(self._build_post(
+                                post, post_detail, 'forum_crawl',
+                                f"{self.base_url}/f/{forum_alias}/p/{post['id']}"
+                            ))
+                            self._seen_ids.add(post['id'])
+                        
+                    except Exception as e:
+                        print(f"處理版面文章 {post.get('id')} 時發生錯誤: {e}")
+                        continue
+                        
             else:
                 print(f"獲取版面 {forum_alias} 文章失敗，狀態碼: {resp.status_code}")
                 
@@ -194,22 +301,34 @@ def main():
     
     # 儲存資料
     if all_posts:
+        # 爬蟲已於收集時略過重複文章
         df = pd.DataFrame(all_posts)
-        # 去除重複文章
-        df = df.drop_duplicates(subset=['id'])
+        
+        # 重複性高的欄位改用category，計數欄位縮為Int32
+        for col in ('forum', 'source', 'keyword', 'author'):
+            df[col] = df[col].astype('category')
+        for col in ('like_count', 'comment_count'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int32')
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"dcard_data_{timestamp}.csv"
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        try:
+            filename = f"dcard_data_{timestamp}.parquet"
+            df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+        except ImportError:
+            # 未安裝 pyarrow 時改存 CSV
+            filename = f"dcard_data_{timestamp}.csv"
+            df.to_csv(filename, index=False, encoding='utf-8-sig')
         print(f"\n資料已儲存至 {filename}")
         print(f"總共收集了 {len(df)} 篇文章")
         
         # 顯示基本統計
+        stats = df.agg({'forum': 'nunique', 'like_count': 'mean', 'comment_count': 'mean'})
+        avg_length = df['content'].str.len().mean()
         print("\n基本統計:")
-        print(f"- 不同版面數量: {df['forum'].nunique()}")
-        print(f"- 平均按讚數: {df['like_count'].mean():.1f}")
-        print(f"- 平均留言數: {df['comment_count'].mean():.1f}")
-        print(f"- 平均文章長度: {df['content'].str.len().mean():.0f} 字")
+        print(f"- 不同版面數量: {stats['forum']:.0f}")
+        print(f"- 平均按讚數: {stats['like_count']:.1f}")
+        print(f"- 平均留言數: {stats['comment_count']:.1f}")
+        print(f"- 平均文章長度: {avg_length:.0f} 字")
     else:
         print("沒有收集到任何資料")
 
@@ -7,22 +7,157 @@ Fixed Crawler System
 基於診斷結果修復PTT、Dcard等爬蟲問題
 """
 
+import asyncio
+import aiohttp
+import copy
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import re
 import time
 import random
+import functools
+import threading
+import unicodedata
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus, urlparse
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+import os
+import tempfile
+import numpy as np
+from cachetools import TLRUCache
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class HostUnavailableError(requests.RequestException):
+    """主機近期連續失敗、斷路器開啟中，略過本次請求"""
+
+def _ttl_cached(cache_attr: str, source: str):
+    """以候選人名稱為鍵快取爬取結果（僅快取真實數據，模擬數據每次重新嘗試）；同時支援一般與非同步方法
+    
+    先查記憶體TTL快取，未命中再查磁碟快取（可跨行程共用），命中時以磁碟上剩餘的
+    有效時間回填記憶體快取。記憶體快取存放 (結果, 到期時間)，回傳的是深複本，
+    呼叫端修改結果不會影響快取內容
+    """
+    def decorator(method):
+        def lookup(self, candidate_name):
+            with self._cache_lock:
+                entry = getattr(self, cache_attr).get(candidate_name)
+            
+            if entry is None and self._disk_cache is not None:
+                result, expires_at = self._disk_cache.get(f"{source}:{candidate_name}", expire_time=True)
+                if result is not None:
+                    entry = (result, expires_at or time.time() + self.CACHE_TTL_SECONDS)
+                    with self._cache_lock:
+                        getattr(self, cache_attr)[candidate_name] = entry
+            return copy.deepcopy(entry[0]) if entry is not None else None
+        
+        def store(self, candidate_name, result):
+            if not result.get('is_simulated', True):
+                with self._cache_lock:
+                    getattr(self, cache_attr)[candidate_name] = (
+                        copy.deepcopy(result), time.time() + self.CACHE_TTL_SECONDS
+                    )
+                if self._disk_cache is not None:
+                    self._disk_cache.set(f"{source}:{candidate_name}", result, expire=self.CACHE_TTL_SECONDS)
+            return result
+        
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, candidate_name: str, *args) -> Dict:
+                cached = lookup(self, candidate_name)
+                if cached is not None:
+                    return cached
+                return store(self, candidate_name, await method(self, candidate_name, *args))
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(self, candidate_name: str, *args) -> Dict:
+            cached = lookup(self, candidate_name)
+            if cached is not None:
+                return cached
+            return store(self, candidate_name, method(self, candidate_name, *args))
+        return wrapper
+    return decorator
+
 class FixedCrawler:
     """修復版爬蟲類"""
     
+    # 各主機同時進行的請求上限
+    HOST_CONCURRENCY = {
+        'www.ptt.cc': 8,
+        'www.dcard.tw': 4,
+        'api.dcard.tw': 4
+    }
+    DEFAULT_HOST_CONCURRENCY = 8
+    
+    # 遇到 429/503 時的最大嘗試次數
+    MAX_FETCH_ATTEMPTS = 4
+    
+    # 爬取結果快取時間（秒）與磁碟快取位置、容量上限
+    CACHE_TTL_SECONDS = 300
+    DISK_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'tw_recall_cache')
+    DISK_CACHE_SIZE_LIMIT = 200 * 1024 * 1024
+    
+    # 單一請求逾時與新聞爬取整體時限（秒）
+    REQUEST_TIMEOUT_SECONDS = 6
+    NEWS_DEADLINE_SECONDS = 8.0
+    
+    # 同步數據來源（RSS、看板、網頁爬取）專用執行緒數
+    BLOCKING_WORKERS = 8
+    
+    # 斷路器：同一主機連續失敗達門檻後，於冷卻時間內直接略過
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_COOLDOWN_SECONDS = 60
+    
+    # 替代新聞源搜尋網址模板（{q} 為URL編碼後的候選人名稱）
+    ALT_SOURCES = (
+        ("風傳媒", "https://www.storm.mg/search?q={q}"),
+        ("新頭殼", "https://newtalk.tw/search?q={q}"),
+        ("ETtoday", "https://www.ettoday.net/news_search_result.htm?keyword={q}")
+    )
+    
+    # 模擬數據參數（基於真實使用模式）：總數範圍、(正面下限, 除數)、(負面下限, 除數)
+    SIMULATION_PROFILES = {
+        'ptt': {
+            'total': (8, 25),  # 真實搜尋結果通常不會太多
+            'positive': (1, 4),
+            'negative': (2, 3),  # PTT通常負面較多
+            'data_source': '⚠️ 高品質PTT模擬數據 (High-Quality Simulated PTT Data)',
+            'note': 'PTT搜尋API暫時不可用，基於真實使用模式生成模擬數據',
+            'reason': 'PTT搜尋頁面HTTP 404錯誤'
+        },
+        'dcard': {
+            'total': (5, 18),  # Dcard文章數通常較少
+            'positive': (2, 3),  # Dcard較理性
+            'negative': (1, 4),
+            'data_source': '⚠️ 高品質Dcard模擬數據 (High-Quality Simulated Dcard Data)',
+            'note': 'Dcard API暫時不可用，基於真實使用模式生成模擬數據',
+            'reason': 'Dcard API HTTP 403錯誤'
+        },
+        'news': {
+            'total': (6, 20),
+            'positive': (2, 3),
+            'negative': (3, 2),  # 新聞通常較負面
+        }
+    }
+    
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -33,44 +168,232 @@ class FixedCrawler:
             'Upgrade-Insecure-Requests': '1'
         }
         
+        # 共用連線池的Session（同主機請求重用TCP/TLS連線，cookies也會保留）
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # 模擬數據用的隨機數產生器
+        self._rng = np.random.default_rng()
+        
+        # 各平台爬取結果快取（5分鐘），磁碟快取供多個行程共用
+        self._cache_lock = threading.Lock()
+        self._ptt_cache = self._new_result_cache()
+        self._dcard_cache = self._new_result_cache()
+        self._news_cache = self._new_result_cache()
+        self._disk_cache = (
+            diskcache.Cache(self.DISK_CACHE_DIR, size_limit=self.DISK_CACHE_SIZE_LIMIT)
+            if diskcache is not None else None
+        )
+        
+        # 各主機連續失敗次數與最後失敗時間 {host: (failures, timestamp)}
+        self._host_failures: Dict[str, tuple] = {}
+        
+        # 每個事件迴圈各自的主機信號量
+        self._host_sems = weakref.WeakKeyDictionary()
+        
+        # 同步數據來源專用的執行緒池：競速落敗的執行緒無法取消，若放在事件迴圈
+        # 預設執行緒池，asyncio.run 結束時會等它們跑完；專用池不會被等待，
+        # 實例回收時以 shutdown(wait=False) 關閉
+        self._blocking_executor = ThreadPoolExecutor(max_workers=self.BLOCKING_WORKERS,
+                                                     thread_name_prefix='fixed-crawler')
+        weakref.finalize(self, self._blocking_executor.shutdown, wait=False, cancel_futures=True)
+        
         # 情緒分析關鍵字
-        self.positive_keywords = ['支持', '讚', '好', '棒', '優秀', '加油', '推薦', '贊成', '同意', '肯定']
-        self.negative_keywords = ['反對', '爛', '差', '糟', '討厭', '垃圾', '失望', '不滿', '批評', '噓']
+        self.positive_keywords = frozenset(['支持', '讚', '好', '棒', '優秀', '加油', '推薦', '贊成', '同意', '肯定'])
+        self.negative_keywords = frozenset(['反對', '爛', '差', '糟', '討厭', '垃圾', '失望', '不滿', '批評', '噓'])
+        self._build_sentiment_matcher()
+        # 同一標題可能在不同來源重複出現，以實例層級的LRU快取記住評分結果
+        self._analyze_title_sentiment = functools.lru_cache(maxsize=4096)(self._analyze_title_sentiment)
+    
+    @staticmethod
+    def _new_result_cache() -> TLRUCache:
+        """建立爬取結果的記憶體快取，每筆依其 (結果, 到期時間) 中的到期時間（time.time）失效"""
+        return TLRUCache(maxsize=128, ttu=lambda _key, entry, _now: entry[1], timer=time.time)
+    
+    def _async_session(self) -> aiohttp.ClientSession:
+        """建立非同步HTTP Session（每次頂層呼叫共用一個連線池）"""
+        return aiohttp.ClientSession(
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT_SECONDS)
+        )
+    
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """取得目前事件迴圈中該主機的並行限制信號量"""
+        sems = self._host_sems.setdefault(asyncio.get_running_loop(), {})
+        if host not in sems:
+            sems[host] = asyncio.Semaphore(self.HOST_CONCURRENCY.get(host, self.DEFAULT_HOST_CONCURRENCY))
+        return sems[host]
+    
+    def _check_circuit(self, host: str):
+        """斷路器開啟時拋出 HostUnavailableError"""
+        failures, last_failure = self._host_failures.get(host, (0, 0.0))
+        if failures >= self.CIRCUIT_FAILURE_THRESHOLD and time.time() - last_failure < self.CIRCUIT_COOLDOWN_SECONDS:
+            raise HostUnavailableError(f"{host} 連續失敗 {failures} 次，暫時略過")
+    
+    def _record_host_result(self, host: str, ok: bool):
+        """記錄請求結果：成功則重置失敗計數，失敗則累加"""
+        if ok:
+            self._host_failures.pop(host, None)
+        else:
+            failures, _ = self._host_failures.get(host, (0, 0.0))
+            self._host_failures[host] = (failures + 1, time.time())
+            if failures + 1 == self.CIRCUIT_FAILURE_THRESHOLD:
+                logger.debug(f"{host} 斷路器開啟，{self.CIRCUIT_COOLDOWN_SECONDS}s 內略過")
+    
+    def _session_get(self, url: str, **kwargs) -> requests.Response:
+        """經由斷路器的同步GET請求"""
+        host = urlparse(url).netloc
+        self._check_circuit(host)
+        try:
+            response = self.session.get(url, timeout=self.REQUEST_TIMEOUT_SECONDS, **kwargs)
+        except requests.RequestException:
+            self._record_host_result(host, False)
+            raise
+        self._record_host_result(host, response.ok)
+        return response
+    
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict] = None):
+        """非同步抓取單一URL，回傳 (url, status, content_type, body)；body 為未解碼的位元組
+        
+        每個主機的並行數受信號量限制；遇到 429/503 時依 Retry-After 或指數退避重試；
+        主機斷路器開啟時直接拋出 HostUnavailableError
+        """
+        host = urlparse(url).netloc
+        total_backoff = 0.0
+        
+        for attempt in range(self.MAX_FETCH_ATTEMPTS):
+            self._check_circuit(host)
+            async with self._host_semaphore(host):
+                try:
+                    response = await session.get(url, params=params)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    self._record_host_result(host, False)
+                    raise
+                async with response:
+                    if response.status not in (429, 503) or attempt == self.MAX_FETCH_ATTEMPTS - 1:
+                        self._record_host_result(host, 200 <= response.status < 300)
+                        if attempt:
+                            logger.debug(f"{host} 重試 {attempt} 次後完成，累計退避 {total_backoff:.1f}s")
+                        return url, response.status, response.headers.get('content-type', ''), await response.read()
+                    retry_after = response.headers.get('Retry-After', '')
+            
+            delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt * 0.5 + random.random()
+            total_backoff += delay
+            logger.debug(f"{host} 回應 {response.status}，{delay:.1f}s 後重試 (第 {attempt + 1} 次)")
+            await asyncio.sleep(delay)
+    
+    async def _run_with_session(self, coro_fn, *args):
+        """開啟共用Session並執行非同步方法"""
+        async with self._async_session() as session:
+            return await coro_fn(*args, session)
+    
+    async def crawl_all(self, candidate_name: str, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Dict]:
+        """同時爬取PTT、Dcard與新聞，回傳 {'ptt': ..., 'dcard': ..., 'news': ...}
+        
+        未傳入 session 時自行開啟一個，三個平台共用同一連線池
+        """
+        if session is None:
+            return await self._run_with_session(self.crawl_all, candidate_name)
+        
+        results = await asyncio.gather(
+            self._crawl_ptt_async(candidate_name, session),
+            self._crawl_dcard_async(candidate_name, session),
+            self._crawl_news_async(candidate_name, session)
+        )
+        return dict(zip(('ptt', 'dcard', 'news'), results))
+    
+    def crawl_all_sync(self, candidate_name: str) -> Dict[str, Dict]:
+        """crawl_all 的同步版本"""
+        return asyncio.run(self.crawl_all(candidate_name))
+    
+    def crawl_many(self, candidate_names: List[str], concurrency: int = 16) -> Dict[str, Dict[str, Dict]]:
+        """批次爬取多位候選人，回傳 {候選人: crawl_all結果}
+        
+        所有候選人共用同一個 aiohttp Session，同時進行的候選人數以 concurrency 限制
+        """
+        return asyncio.run(self._run_with_session(self._crawl_many_async, list(candidate_names), concurrency))
+    
+    async def _crawl_many_async(self, candidate_names: List[str], concurrency: int,
+                                session: aiohttp.ClientSession) -> Dict[str, Dict[str, Dict]]:
+        """crawl_many 的非同步實作"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def crawl_one(candidate_name: str):
+            async with semaphore:
+                return candidate_name, await self.crawl_all(candidate_name, session)
+        
+        # 重複的候選人只爬一次
+        unique_names = list(dict.fromkeys(candidate_names))
+        return dict(await asyncio.gather(*[crawl_one(name) for name in unique_names]))
+    
+    @staticmethod
+    async def _first_success(sources: List[tuple]) -> Optional[Dict]:
+        """同時執行多個數據來源，回傳最先取得文章的結果並標記來源；全部失敗時回傳 None
+        
+        sources 為 (awaitable, data_source標籤) 的列表；取得結果後其餘來源即取消
+        """
+        async def tagged(awaitable, tag):
+            return await awaitable, tag
+        
+        tasks = [asyncio.ensure_future(tagged(awaitable, tag)) for awaitable, tag in sources]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result, tag = await next_done
+                except Exception as e:
+                    logger.debug(f"數據來源失敗: {e}")
+                    continue
+                
+                if result and result.get('post_count', 0) > 0:
+                    result['data_source'] = tag
+                    result['is_simulated'] = False
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return None
     
     def crawl_ptt_fixed(self, candidate_name: str) -> Dict:
         """修復版PTT爬蟲"""
+        return asyncio.run(self._run_with_session(self._crawl_ptt_async, candidate_name))
+    
+    @_ttl_cached('_ptt_cache', 'ptt')
+    async def _crawl_ptt_async(self, candidate_name: str, session: aiohttp.ClientSession) -> Dict:
+        """修復版PTT爬蟲（非同步；同步的RSS與看板爬取於執行緒池中進行）"""
         logger.info(f"開始爬取PTT數據: {candidate_name}")
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        loop = asyncio.get_running_loop()
         
         try:
-            # 方法1: 嘗試使用PTT Web版API
-            result = self._try_ptt_web_api(candidate_name)
-            if result and result.get('post_count', 0) > 0:
-                result['data_source'] = '✅ PTT Web API (Real Data)'
-                result['is_simulated'] = False
-                return result
-            
-            # 方法2: 嘗試使用PTT RSS
-            result = self._try_ptt_rss(candidate_name)
-            if result and result.get('post_count', 0) > 0:
-                result['data_source'] = '✅ PTT RSS Feed (Real Data)'
-                result['is_simulated'] = False
-                return result
-            
-            # 方法3: 嘗試直接爬取看板
-            result = self._try_ptt_board_crawl(candidate_name)
-            if result and result.get('post_count', 0) > 0:
-                result['data_source'] = '✅ PTT Board Crawl (Real Data)'
-                result['is_simulated'] = False
+            # Web API、RSS、看板爬取同時進行，取最先成功者
+            result = await self._first_success([
+                (self._try_ptt_web_api_async(candidate_name, session), '✅ PTT Web API (Real Data)'),
+                (loop.run_in_executor(self._blocking_executor, self._try_ptt_rss, candidate_name), '✅ PTT RSS Feed (Real Data)'),
+                (loop.run_in_executor(self._blocking_executor, self._try_ptt_board_crawl, candidate_name), '✅ PTT Board Crawl (Real Data)')
+            ])
+            if result:
                 return result
             
         except Exception as e:
             logger.error(f"PTT爬蟲錯誤: {e}")
         
         # 備用：高品質模擬數據（基於真實模式）
-        return self._generate_realistic_ptt_data(candidate_name)
+        return self._generate_realistic_ptt_data(candidate_name, crawl_time)
     
     def _try_ptt_web_api(self, candidate_name: str) -> Optional[Dict]:
         """嘗試PTT Web API"""
+        return asyncio.run(self._run_with_session(self._try_ptt_web_api_async, candidate_name))
+    
+    async def _try_ptt_web_api_async(self, candidate_name: str, session: aiohttp.ClientSession) -> Optional[Dict]:
+        """嘗試PTT Web API（同時查詢所有看板）"""
         try:
             # PTT Web版可能的API端點
             api_urls = [
@@ -79,23 +402,47 @@ class FixedCrawler:
                 f"https://www.ptt.cc/bbs/Politics/search?q={candidate_name}"
             ]
             
-            for api_url in api_urls:
-                try:
-                    response = requests.get(api_url, headers=self.headers, timeout=10)
-                    
-                    if response.status_code == 200 and 'json' in response.headers.get('content-type', ''):
-                        data = response.json()
-                        if data and len(data) > 0:
-                            return self._parse_ptt_api_data(data, candidate_name)
-                
-                except Exception:
+            results = await asyncio.gather(*[self._fetch(session, url) for url in api_urls], return_exceptions=True)
+            
+            for result in results:
+                if isinstance(result, Exception):
                     continue
+                
+                _, status, content_type, body = result
+                if status == 200 and 'json' in content_type:
+                    try:
+                        data = json.loads(body)
+                    except json.JSONDecodeError:
+                        continue
+                    if data and len(data) > 0:
+                        return self._parse_ptt_api_data(data, candidate_name)
             
         except Exception as e:
             logger.debug(f"PTT Web API失敗: {e}")
         
         return None
     
+    def _stream_if_contains(self, url: str, needle: str, chunk_size: int = 8192) -> Optional[bytes]:
+        """串流下載並以位元組比對關鍵字，僅在命中時回傳完整內容，否則回傳 None"""
+        pattern = needle.encode('utf-8')
+        overlap = len(pattern) - 1
+        chunks = []
+        found = False
+        tail = b''
+        
+        with self._session_get(url, stream=True) as response:
+            if response.status_code != 200:
+                return None
+            for chunk in response.iter_content(chunk_size):
+                chunks.append(chunk)
+                if not found:
+                    # 保留上一塊尾端，避免名字被切在兩個區塊之間
+                    window = tail + chunk
+                    found = pattern in window
+                    tail = window[-overlap:] if overlap else b''
+        
+        return b''.join(chunks) if found else None
+    
     def _try_ptt_rss(self, candidate_name: str) -> Optional[Dict]:
         """嘗試PTT RSS Feed"""
         try:
@@ -107,12 +454,10 @@ class FixedCrawler:
             
             for rss_url in rss_urls:
                 try:
-                    response = requests.get(rss_url, headers=self.headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        # 簡單的XML解析查找候選人名字
-                        if candidate_name in response.text:
-                            return self._parse_ptt_rss_data(response.text, candidate_name)
+                    # 以位元組串流比對候選人名字，未命中時不做解碼與解析
+                    body = self._stream_if_contains(rss_url, candidate_name)
+                    if body is not None:
+                        return self._parse_ptt_rss_data(body, candidate_name)
                 
                 except Exception:
                     continue
@@ -125,32 +470,29 @@ class FixedCrawler:
     def _try_ptt_board_crawl(self, candidate_name: str) -> Optional[Dict]:
         """嘗試直接爬取PTT看板"""
         try:
-            # 創建session處理cookies
-            session = requests.Session()
-            session.headers.update(self.headers)
-            
             # 先嘗試訪問主頁設置cookies
-            main_response = session.get("https://www.ptt.cc/", timeout=10)
+            main_response = self._session_get("https://www.ptt.cc/")
             
             if main_response.status_code == 200:
                 # 嘗試訪問八卦板（最可能有政治討論）
                 board_url = "https://www.ptt.cc/bbs/Gossiping/index.html"
-                board_response = session.get(board_url, timeout=10)
+                body = self._stream_if_contains(board_url, candidate_name)
                 
-                if board_response.status_code == 200:
-                    soup = BeautifulSoup(board_response.text, 'html.parser')
+                if body is not None:
+                    from bs4 import BeautifulSoup  # 延遲載入，僅在實際解析時才匯入
+                    soup = BeautifulSoup(body, 'lxml')
                     
                     # 查找包含候選人名字的文章
-                    articles = soup.find_all('div', class_='r-ent')
+                    title_elems = soup.select('div.r-ent div.title > a')
                     relevant_posts = []
                     
-                    for article in articles:
-                        title_elem = article.find('a')
-                        if title_elem and candidate_name in title_elem.text:
+                    for title_elem in title_elems:
+                        title = self._normalize_title(title_elem.text)
+                        if candidate_name in title:
                             relevant_posts.append({
-                                'title': title_elem.text,
+                                'title': title,
                                 'url': title_elem.get('href', ''),
-                                'sentiment': self._analyze_title_sentiment(title_elem.text)
+                                'sentiment': self._analyze_title_sentiment(title)
                             })
                     
                     if relevant_posts:
@@ -163,31 +505,37 @@ class FixedCrawler:
     
     def crawl_dcard_fixed(self, candidate_name: str) -> Dict:
         """修復版Dcard爬蟲"""
+        return asyncio.run(self._run_with_session(self._crawl_dcard_async, candidate_name))
+    
+    @_ttl_cached('_dcard_cache', 'dcard')
+    async def _crawl_dcard_async(self, candidate_name: str, session: aiohttp.ClientSession) -> Dict:
+        """修復版Dcard爬蟲（非同步）"""
         logger.info(f"開始爬取Dcard數據: {candidate_name}")
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        loop = asyncio.get_running_loop()
         
         try:
-            # 方法1: 嘗試新的API端點
-            result = self._try_dcard_new_api(candidate_name)
-            if result and result.get('post_count', 0) > 0:
-                result['data_source'] = '✅ Dcard New API (Real Data)'
-                result['is_simulated'] = False
-                return result
-            
-            # 方法2: 嘗試網頁爬取
-            result = self._try_dcard_web_crawl(candidate_name)
-            if result and result.get('post_count', 0) > 0:
-                result['data_source'] = '✅ Dcard Web Crawl (Real Data)'
-                result['is_simulated'] = False
+            # 新API端點與網頁爬取同時進行，取最先成功者
+            result = await self._first_success([
+                (self._try_dcard_new_api_async(candidate_name, session), '✅ Dcard New API (Real Data)'),
+                (loop.run_in_executor(self._blocking_executor, self._try_dcard_web_crawl, candidate_name), '✅ Dcard Web Crawl (Real Data)')
+            ])
+            if result:
                 return result
             
         except Exception as e:
             logger.error(f"Dcard爬蟲錯誤: {e}")
         
         # 備用：高品質模擬數據
-        return self._generate_realistic_dcard_data(candidate_name)
+        return self._generate_realistic_dcard_data(candidate_name, crawl_time)
     
     def _try_dcard_new_api(self, candidate_name: str) -> Optional[Dict]:
         """嘗試新的Dcard API端點"""
+        return asyncio.run(self._run_with_session(self._try_dcard_new_api_async, candidate_name))
+    
+    async def _try_dcard_new_api_async(self, candidate_name: str, session: aiohttp.ClientSession) -> Optional[Dict]:
+        """嘗試新的Dcard API端點（同時查詢所有端點）"""
         try:
             # 嘗試不同的API端點
             api_endpoints = [
@@ -195,27 +543,29 @@ class FixedCrawler:
                 "https://www.dcard.tw/service/api/v2/search/posts",
                 "https://api.dcard.tw/v2/posts/search"
             ]
+            params = {
+                'query': candidate_name,
+                'limit': 20,
+                'popular': 'false'
+            }
             
-            for endpoint in api_endpoints:
-                try:
-                    params = {
-                        'query': candidate_name,
-                        'limit': 20,
-                        'popular': 'false'
-                    }
-                    
-                    response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
-                    
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            if data and len(data) > 0:
-                                return self._parse_dcard_api_data(data, candidate_name)
-                        except json.JSONDecodeError:
-                            continue
-                
-                except Exception:
+            results = await asyncio.gather(
+                *[self._fetch(session, endpoint, params=params) for endpoint in api_endpoints],
+                return_exceptions=True
+            )
+            
+            for result in results:
+                if isinstance(result, Exception):
                     continue
+                
+                _, status, _, body = result
+                if status == 200:
+                    try:
+                        data = json.loads(body)
+                    except json.JSONDecodeError:
+                        continue
+                    if data and len(data) > 0:
+                        return self._parse_dcard_api_data(data, candidate_name)
             
         except Exception as e:
             logger.debug(f"Dcard新API失敗: {e}")
@@ -228,13 +578,14 @@ class FixedCrawler:
             # 嘗試搜尋頁面
             search_url = f"https://www.dcard.tw/search/posts?query={candidate_name}"
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self._session_get(search_url)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(response.content, 'lxml')
                 
                 # 查找文章元素（Dcard使用動態載入，可能需要不同策略）
-                posts = soup.find_all('article') or soup.find_all('div', class_='PostEntry_container')
+                posts = soup.select('article, div.PostEntry_container')
                 
                 if posts:
                     return self._process_dcard_posts(posts, candidate_name)
@@ -246,20 +597,17 @@ class FixedCrawler:
     
     def crawl_news_fixed(self, candidate_name: str) -> Dict:
         """修復版新聞爬蟲"""
+        return asyncio.run(self._run_with_session(self._crawl_news_async, candidate_name))
+    
+    @_ttl_cached('_news_cache', 'news')
+    async def _crawl_news_async(self, candidate_name: str, session: aiohttp.ClientSession) -> Dict:
+        """修復版新聞爬蟲（非同步）"""
         logger.info(f"開始爬取新聞數據: {candidate_name}")
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         try:
-            # 只使用可用的新聞源
-            working_sources = []
-            
-            # 自由時報（診斷顯示可用）
-            ltn_articles = self._crawl_ltn_news_fixed(candidate_name)
-            if ltn_articles:
-                working_sources.extend(ltn_articles)
-            
-            # 嘗試其他替代新聞源
-            alternative_sources = self._try_alternative_news_sources(candidate_name)
-            working_sources.extend(alternative_sources)
+            # 自由時報與替代新聞源同時爬取
+            working_sources = await self._collect_news_async(candidate_name, session)
             
             if working_sources:
                 sentiment_analysis = self._analyze_news_sentiment(working_sources)
@@ -272,34 +620,63 @@ class FixedCrawler:
             logger.error(f"新聞爬蟲錯誤: {e}")
         
         # 備用：高品質模擬數據
-        return self._generate_realistic_news_data(candidate_name)
+        return self._generate_realistic_news_data(candidate_name, crawl_time)
+    
+    async def _collect_news_async(self, candidate_name: str, session: aiohttp.ClientSession) -> List[Dict]:
+        """同時爬取自由時報（診斷顯示可用）與其他替代新聞源
+        
+        整體受 NEWS_DEADLINE_SECONDS 限制，逾時未完成的來源視為無資料並取消
+        """
+        tasks = [
+            asyncio.ensure_future(coro) for coro in [
+                self._crawl_ltn_news_async(candidate_name, session),
+                *self._alternative_source_coros(candidate_name, session)
+            ]
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=self.NEWS_DEADLINE_SECONDS)
+        
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.debug(f"新聞爬取逾時，{len(pending)} 個來源未完成")
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return [article for task in tasks if task in done for article in task.result()]
     
     def _crawl_ltn_news_fixed(self, candidate_name: str) -> List[Dict]:
         """修復版自由時報爬蟲"""
+        return asyncio.run(self._run_with_session(self._crawl_ltn_news_async, candidate_name))
+    
+    async def _crawl_ltn_news_async(self, candidate_name: str, session: aiohttp.ClientSession) -> List[Dict]:
+        """修復版自由時報爬蟲（非同步）"""
         articles = []
+        iso_now = datetime.now().isoformat()
         try:
             search_url = f"https://search.ltn.com.tw/list?keyword={candidate_name}"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            _, status, _, body = await self._fetch(session, search_url)
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            # 先以位元組比對候選人名字，頁面未提及時不做解碼與解析
+            if status == 200 and candidate_name.encode('utf-8') in body:
+                import lxml.html
+                tree = lxml.html.fromstring(body)
                 
-                # 查找新聞項目
-                news_items = soup.find_all('div', class_='tit') or soup.find_all('a', class_='tit')
+                # 查找新聞標題連結（div.tit 內的連結或 a.tit 本身）
+                title_elems = tree.xpath(
+                    '//div[contains(concat(" ", normalize-space(@class), " "), " tit ")]//a'
+                    ' | //a[contains(concat(" ", normalize-space(@class), " "), " tit ")]'
+                )
                 
-                for item in news_items[:10]:  # 限制數量
-                    title_elem = item.find('a') if item.name != 'a' else item
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        if title and candidate_name in title:
-                            articles.append({
-                                'title': title,
-                                'source': '自由時報',
-                                'content': title,
-                                'url': title_elem.get('href', ''),
-                                'date': datetime.now().isoformat(),
-                                'sentiment': self._analyze_title_sentiment(title)
-                            })
+                for title_elem in title_elems[:10]:  # 限制數量
+                    title = self._normalize_title(title_elem.text_content().strip())
+                    if title and candidate_name in title:
+                        articles.append({
+                            'title': title,
+                            'source': '自由時報',
+                            'content': title,
+                            'url': title_elem.get('href', ''),
+                            'date': iso_now,
+                            'sentiment': self._analyze_title_sentiment(title)
+                        })
         
         except Exception as e:
             logger.error(f"自由時報爬蟲錯誤: {e}")
@@ -308,47 +685,82 @@ class FixedCrawler:
     
     def _try_alternative_news_sources(self, candidate_name: str) -> List[Dict]:
         """嘗試替代新聞源"""
-        articles = []
-        
-        # 替代新聞源
-        alternative_sources = [
-            ("風傳媒", f"https://www.storm.mg/search?q={candidate_name}"),
-            ("新頭殼", f"https://newtalk.tw/search?q={candidate_name}"),
-            ("ETtoday", f"https://www.ettoday.net/news_search_result.htm?keyword={candidate_name}")
+        return asyncio.run(self._run_with_session(self._try_alternative_news_sources_async, candidate_name))
+    
+    async def _try_alternative_news_sources_async(self, candidate_name: str, session: aiohttp.ClientSession) -> List[Dict]:
+        """嘗試替代新聞源（同時查詢所有來源）"""
+        results = await asyncio.gather(*self._alternative_source_coros(candidate_name, session))
+        return [article for articles in results for article in articles]
+    
+    def _alternative_source_coros(self, candidate_name: str, session: aiohttp.ClientSession) -> List:
+        """為每個替代新聞源建立一個爬取協程"""
+        q = quote_plus(candidate_name)
+        iso_now = datetime.now().isoformat()
+        return [
+            self._crawl_alternative_source_async(source_name, template.format(q=q), candidate_name, iso_now, session)
+            for source_name, template in self.ALT_SOURCES
         ]
-        
-        for source_name, url in alternative_sources:
-            try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 通用的標題查找
-                    titles = soup.find_all(['h1', 'h2', 'h3', 'h4'])
-                    
-                    for title_elem in titles[:5]:  # 限制數量
-                        title = title_elem.get_text(strip=True)
-                        if title and candidate_name in title:
-                            articles.append({
-                                'title': title,
-                                'source': source_name,
-                                'content': title,
-                                'url': url,
-                                'date': datetime.now().isoformat(),
-                                'sentiment': self._analyze_title_sentiment(title)
-                            })
+    
+    async def _crawl_alternative_source_async(self, source_name: str, url: str, candidate_name: str,
+                                              iso_now: str, session: aiohttp.ClientSession) -> List[Dict]:
+        """爬取單一替代新聞源，失敗時回傳空列表"""
+        articles = []
+        try:
+            _, status, _, body = await self._fetch(session, url)
             
-            except Exception as e:
-                logger.debug(f"{source_name}爬蟲失敗: {e}")
-                continue
+            if status == 200 and candidate_name.encode('utf-8') in body:
+                from bs4 import BeautifulSoup
+                soup = BeautifulSoup(body, 'lxml')
+                
+                # 通用的標題查找
+                titles = soup.select('h1, h2, h3, h4')
+                
+                for title_elem in titles[:5]:  # 限制數量
+                    title = self._normalize_title(title_elem.get_text(strip=True))
+                    if title and candidate_name in title:
+                        articles.append({
+                            'title': title,
+                            'source': source_name,
+                            'content': title,
+                            'url': url,
+                            'date': iso_now,
+                            'sentiment': self._analyze_title_sentiment(title)
+                        })
+        
+        except Exception as e:
+            logger.debug(f"{source_name}爬蟲失敗: {e}")
         
         return articles
     
+    def _build_sentiment_matcher(self):
+        """將正負面關鍵字編譯為單一多模式比對器（優先使用Aho-Corasick，否則用正規表示式）"""
+        self._keyword_polarity = {self._normalize_title(keyword): '+' for keyword in self.positive_keywords}
+        self._keyword_polarity.update({self._normalize_title(keyword): '-' for keyword in self.negative_keywords})
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword, polarity in self._keyword_polarity.items():
+                automaton.add_word(keyword, (polarity, keyword))
+            automaton.make_automaton()
+            self._sentiment_ac = automaton
+        else:
+            self._sentiment_ac = None
+            self._sentiment_re = re.compile('|'.join(map(re.escape, self._keyword_polarity)))
+    
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """標題正規化（NFC），於收集文章時做一次，後續評分與聚合不再重複處理"""
+        return unicodedata.normalize('NFC', title)
+    
     def _analyze_title_sentiment(self, title: str) -> str:
-        """分析標題情緒"""
-        pos_score = sum(1 for keyword in self.positive_keywords if keyword in title)
-        neg_score = sum(1 for keyword in self.negative_keywords if keyword in title)
+        """分析標題情緒（單次掃描標題，每個關鍵字最多計一次；標題需已經過 _normalize_title）"""
+        if self._sentiment_ac is not None:
+            hits = {value for _, value in self._sentiment_ac.iter(title)}
+        else:
+            hits = {(self._keyword_polarity[keyword], keyword) for keyword in self._sentiment_re.findall(title)}
+        
+        pos_score = sum(1 for polarity, _ in hits if polarity == '+')
+        neg_score = len(hits) - pos_score
         
         if pos_score > neg_score:
             return 'positive'
@@ -357,75 +769,79 @@ class FixedCrawler:
         else:
             return 'neutral'
     
-    def _generate_realistic_ptt_data(self, candidate_name: str) -> Dict:
-        """生成高品質PTT模擬數據"""
-        # 基於真實PTT使用模式的模擬數據
-        total_posts = random.randint(8, 25)  # 真實搜尋結果通常不會太多
-        positive = random.randint(1, max(1, total_posts // 4))
-        negative = random.randint(2, max(2, total_posts // 3))  # PTT通常負面較多
-        neutral = total_posts - positive - negative
-        
-        return {
-            'positive_ratio': positive / total_posts if total_posts > 0 else 0,
-            'post_count': total_posts,
-            'positive_posts': positive,
-            'negative_posts': negative,
-            'neutral_posts': neutral,
-            'data_source': '⚠️ 高品質PTT模擬數據 (High-Quality Simulated PTT Data)',
+    def _generate_realistic_batch(self, names: List[str], kind: str, crawl_time: Optional[str] = None) -> List[Dict]:
+        """批次生成高品質模擬數據（kind: 'ptt' / 'dcard' / 'news'），所有隨機數一次抽出；crawl_time 由呼叫端傳入"""
+        profile = self.SIMULATION_PROFILES[kind]
+        n = len(names)
+        rng = self._rng
+        
+        total_low, total_high = profile['total']
+        pos_low, pos_div = profile['positive']
+        neg_low, neg_div = profile['negative']
+        
+        totals = rng.integers(total_low, total_high, size=n, endpoint=True)
+        positive = rng.integers(pos_low, np.maximum(pos_low, totals // pos_div), endpoint=True)
+        negative = rng.integers(neg_low, np.maximum(neg_low, totals // neg_div), endpoint=True)
+        neutral = totals - positive - negative
+        if crawl_time is None:
+            crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        if kind == 'news':
+            return [{
+                'positive_ratio': pos / total,
+                'negative_ratio': neg / total,
+                'neutral_ratio': neu / total,
+                'total_articles': total,
+                'positive_count': pos,
+                'negative_count': neg,
+                'neutral_count': neu,
+                'sources': ['自由時報', '風傳媒', '新頭殼'],  # 部分真實來源
+                'data_source': '⚠️ 混合新聞數據 (Mixed News Data - Partial Real)',
+                'is_simulated': True,
+                'note': '部分新聞源不可用，混合真實和模擬數據',
+                'crawl_time': crawl_time,
+                'reason': '聯合新聞網HTTP 404，中時新聞網HTTP 403'
+            } for total, pos, neg, neu in zip(totals.tolist(), positive.tolist(),
+                                             negative.tolist(), neutral.tolist())]
+        
+        records = [{
+            'positive_ratio': pos / total,
+            'post_count': total,
+            'positive_posts': pos,
+            'negative_posts': neg,
+            'neutral_posts': neu,
+            'data_source': profile['data_source'],
             'is_simulated': True,
-            'note': f'PTT搜尋API暫時不可用，基於真實使用模式生成模擬數據',
-            'crawl_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'reason': 'PTT搜尋頁面HTTP 404錯誤'
-        }
+            'note': profile['note'],
+            'crawl_time': crawl_time,
+            'reason': profile['reason']
+        } for total, pos, neg, neu in zip(totals.tolist(), positive.tolist(),
+                                         negative.tolist(), neutral.tolist())]
+        
+        if kind == 'dcard':
+            avg_likes = rng.uniform(15, 45, size=n).tolist()
+            response_rate = rng.uniform(0.4, 0.7, size=n).tolist()
+            for record, likes, rate in zip(records, avg_likes, response_rate):
+                record['avg_likes'] = likes
+                record['response_rate'] = rate
+        
+        return records
     
-    def _generate_realistic_dcard_data(self, candidate_name: str) -> Dict:
+    def _generate_realistic_ptt_data(self, candidate_name: str, crawl_time: Optional[str] = None) -> Dict:
+        """生成高品質PTT模擬數據"""
+        return self._generate_realistic_batch([candidate_name], 'ptt', crawl_time)[0]
+    
+    def _generate_realistic_dcard_data(self, candidate_name: str, crawl_time: Optional[str] = None) -> Dict:
         """生成高品質Dcard模擬數據"""
-        total_posts = random.randint(5, 18)  # Dcard文章數通常較少
-        positive = random.randint(2, max(2, total_posts // 3))  # Dcard較理性
-        negative = random.randint(1, max(1, total_posts // 4))
-        neutral = total_posts - positive - negative
-        
-        return {
-            'positive_ratio': positive / total_posts if total_posts > 0 else 0,
-            'post_count': total_posts,
-            'positive_posts': positive,
-            'negative_posts': negative,
-            'neutral_posts': neutral,
-            'avg_likes': random.uniform(15, 45),
-            'response_rate': random.uniform(0.4, 0.7),
-            'data_source': '⚠️ 高品質Dcard模擬數據 (High-Quality Simulated Dcard Data)',
-            'is_simulated': True,
-            'note': f'Dcard API暫時不可用，基於真實使用模式生成模擬數據',
-            'crawl_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'reason': 'Dcard API HTTP 403錯誤'
-        }
+        return self._generate_realistic_batch([candidate_name], 'dcard', crawl_time)[0]
     
-    def _generate_realistic_news_data(self, candidate_name: str) -> Dict:
+    def _generate_realistic_news_data(self, candidate_name: str, crawl_time: Optional[str] = None) -> Dict:
         """生成高品質新聞模擬數據"""
-        total_articles = random.randint(6, 20)
-        positive = random.randint(2, max(2, total_articles // 3))
-        negative = random.randint(3, max(3, total_articles // 2))  # 新聞通常較負面
-        neutral = total_articles - positive - negative
-        
-        return {
-            'positive_ratio': positive / total_articles if total_articles > 0 else 0,
-            'negative_ratio': negative / total_articles if total_articles > 0 else 0,
-            'neutral_ratio': neutral / total_articles if total_articles > 0 else 0,
-            'total_articles': total_articles,
-            'positive_count': positive,
-            'negative_count': negative,
-            'neutral_count': neutral,
-            'sources': ['自由時報', '風傳媒', '新頭殼'],  # 部分真實來源
-            'data_source': '⚠️ 混合新聞數據 (Mixed News Data - Partial Real)',
-            'is_simulated': True,
-            'note': f'部分新聞源不可用，混合真實和模擬數據',
-            'crawl_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'reason': '聯合新聞網HTTP 404，中時新聞網HTTP 403'
-        }
+        return self._generate_realistic_batch([candidate_name], 'news', crawl_time)[0]
     
     # 輔助方法（簡化版）
     def _parse_ptt_api_data(self, data, candidate_name): return None
-    def _parse_ptt_rss_data(self, rss_text, candidate_name): return None
+    def _parse_ptt_rss_data(self, rss_body, candidate_name): return None
     def _process_ptt_posts(self, posts, candidate_name): return None
     def _parse_dcard_api_data(self, data, candidate_name): return None
     def _process_dcard_posts(self, posts, candidate_name): return None
@@ -439,17 +855,17 @@ if __name__ == "__main__":
     
     print("測試修復版爬蟲...")
     
-    # 測試PTT
-    ptt_result = crawler.crawl_ptt_fixed(candidate)
+    # 同時測試PTT、Dcard與新聞
+    results = crawler.crawl_all_sync(candidate)
+    
+    ptt_result = results['ptt']
     print(f"\nPTT結果: {ptt_result['data_source']}")
     print(f"文章數: {ptt_result['post_count']}")
     
-    # 測試Dcard
-    dcard_result = crawler.crawl_dcard_fixed(candidate)
+    dcard_result = results['dcard']
     print(f"\nDcard結果: {dcard_result['data_source']}")
     print(f"文章數: {dcard_result['post_count']}")
     
-    # 測試新聞
-    news_result = crawler.crawl_news_fixed(candidate)
+    news_result = results['news']
     print(f"\n新聞結果: {news_result['data_source']}")
     print(f"文章數: {news_result['total_articles']}")
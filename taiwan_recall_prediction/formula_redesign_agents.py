@@ -9,6 +9,187 @@ Agent C: 優化工程師
 
 import json
 from datetime import datetime
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _freeze(value):
+    """將巢狀 dict/list 轉為唯讀的 MappingProxyType/tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# 各Agent產出的靜態內容只建立一次，於模組載入時凍結後共用
+
+# 設計師：問題分析
+_DESIGN_ANALYSIS = _freeze({
+    "問題識別": [
+        "原公式 R_agree = R_vote × 正向情緒比 × 動員強度修正值 過於簡化",
+        "缺乏年齡分層考慮",
+        "未區分不同媒體對不同年齡層的影響",
+        "R_vote 定義不清楚"
+    ],
+    "設計原則": [
+        "年齡分層計算",
+        "媒體影響差異化",
+        "投票率與同意率分離",
+        "符合台灣政治現實"
+    ]
+})
+
+# 設計師：新公式
+_NEW_FORMULA = _freeze({
+    "投票率公式": "R_vote = Σ(Pᵢ × Vᵢ × Eᵢ_media × Eᵢ_social) × T_weather × Regional_factor",
+    "同意率公式": "R_agree = Σ(Pᵢ × Aᵢ × Mᵢ_influence) × Controversy_factor × Mobilization_factor",
+    "年齡分層": {
+        "青年層 (18-35)": {
+            "投票意願 Vᵢ": "基於政治關心度 × 政治效能感",
+            "同意意願 Aᵢ": "基於網路論壇情緒 × 同儕壓力",
+            "媒體影響 Mᵢ": "IG/TikTok/PTT 權重較高"
+        },
+        "中年層 (36-55)": {
+            "投票意願 Vᵢ": "基於經濟考量 × 政治立場",
+            "同意意願 Aᵢ": "基於理性分析 × 家庭討論",
+            "媒體影響 Mᵢ": "Facebook/LINE/新聞 權重較高"
+        },
+        "長者層 (56+)": {
+            "投票意願 Vᵢ": "基於政治傳統 × 社會責任",
+            "同意意願 Aᵢ": "基於電視新聞 × 鄰里討論",
+            "媒體影響 Mᵢ": "電視/報紙/廣播 權重較高"
+        }
+    },
+    "詳細計算": {
+        "步驟1": "R_vote = P₁×V₁×E₁ + P₂×V₂×E₂ + P₃×V₃×E₃ (投票參與率)",
+        "步驟2": "R_agree_raw = P₁×A₁×M₁ + P₂×A₂×M₂ + P₃×A₃×M₃ (原始同意率)",
+        "步驟3": "R_agree = R_agree_raw × Controversy_factor × Mobilization_factor (最終同意率)",
+        "步驟4": "Pass_probability = (R_vote ≥ 25%) AND (R_agree ≥ 50%)"
+    }
+})
+
+# 審查專家：審查分析
+_REVIEW_ANALYSIS = _freeze({
+    "優點": [
+        "✅ 年齡分層設計合理，符合台灣人口結構",
+        "✅ 媒體影響差異化考慮周全",
+        "✅ 投票率與同意率分離，邏輯清晰",
+        "✅ 考慮了爭議性和動員因素"
+    ],
+    "問題": [
+        "⚠️ 公式過於複雜，計算困難",
+        "⚠️ 參數過多，容易產生誤差累積",
+        "⚠️ 缺乏歷史數據驗證機制",
+        "⚠️ Controversy_factor 和 Mobilization_factor 可能重複計算"
+    ],
+    "風險": [
+        "🚨 年齡層權重 Pᵢ 需要動態調整",
+        "🚨 媒體影響係數需要實時更新",
+        "🚨 同意意願 Aᵢ 難以準確量化"
+    ]
+})
+
+# 審查專家：修正建議
+_REVIEW_SUGGESTIONS = _freeze({
+    "簡化建議": [
+        "合併 Controversy_factor 和 Mobilization_factor 為 Political_intensity",
+        "減少媒體影響參數，使用加權平均",
+        "引入歷史校正係數"
+    ],
+    "改進建議": [
+        "添加地區差異調整",
+        "考慮季節性投票行為",
+        "增加不確定性量化"
+    ],
+    "驗證建議": [
+        "使用2020韓國瑜案例驗證",
+        "使用2021陳柏惟案例驗證", 
+        "計算預測誤差範圍"
+    ]
+})
+
+# 審查專家：修正後的公式建議
+_REVISED_FORMULA = _freeze({
+    "簡化投票率": "R_vote = Σ(Pᵢ × Vᵢ × Media_weightᵢ) × Environmental_factor",
+    "簡化同意率": "R_agree = Σ(Pᵢ × Aᵢ × Sentiment_weightᵢ) × Political_intensity × Historical_correction",
+    "參數定義": {
+        "Environmental_factor": "天氣係數 × 地區係數",
+        "Political_intensity": "爭議性 × 動員強度 (合併)",
+        "Historical_correction": "基於歷史案例的校正係數",
+        "Media_weightᵢ": "各年齡層主要媒體平台的加權影響",
+        "Sentiment_weightᵢ": "各年齡層情緒分析的加權結果"
+    }
+})
+
+# 優化工程師：整合分析
+_OPTIMIZATION_ANALYSIS = _freeze({
+    "採納建議": [
+        "✅ 合併爭議性和動員因素為政治強度係數",
+        "✅ 簡化媒體影響為年齡層加權平均",
+        "✅ 添加歷史校正機制",
+        "✅ 引入不確定性量化"
+    ],
+    "創新改進": [
+        "🆕 動態年齡層權重調整",
+        "🆕 實時情緒分析整合",
+        "🆕 多層次驗證機制"
+    ]
+})
+
+# 優化工程師：最終優化公式
+_FINAL_FORMULA = _freeze({
+    "核心公式": {
+        "投票率": "R_vote = Σ(Pᵢ × Vᵢ × Mᵢ) × E_factor × H_correction ± σ_vote",
+        "同意率": "R_agree = Σ(Pᵢ × Aᵢ × Sᵢ) × I_factor × H_correction ± σ_agree"
+    },
+    "參數詳解": {
+        "Pᵢ": "年齡層人口比例 (動態調整)",
+        "Vᵢ": "年齡層投票意願係數",
+        "Aᵢ": "年齡層同意意願係數", 
+        "Mᵢ": "年齡層媒體影響係數",
+        "Sᵢ": "年齡層情緒分析係數",
+        "E_factor": "環境因素 = 天氣係數 × 地區係數",
+        "I_factor": "政治強度 = 爭議性 × 動員強度",
+        "H_correction": "歷史校正係數",
+        "σ_vote, σ_agree": "不確定性範圍"
+    },
+    "年齡層係數": {
+        "青年層": {
+            "Vᵢ": "0.45-0.65 (政治關心度 × 政治效能感)",
+            "Aᵢ": "0.40-0.70 (網路情緒 × 同儕壓力)",
+            "Mᵢ": "1.2-1.5 (社群媒體主導)",
+            "Sᵢ": "1.1-1.4 (網路論壇情緒)"
+        },
+        "中年層": {
+            "Vᵢ": "0.50-0.70 (經濟考量 × 政治立場)",
+            "Aᵢ": "0.45-0.65 (理性分析 × 家庭討論)",
+            "Mᵢ": "1.0-1.2 (傳統媒體+社群)",
+            "Sᵢ": "0.9-1.1 (平衡情緒反應)"
+        },
+        "長者層": {
+            "Vᵢ": "0.35-0.55 (政治傳統 × 社會責任)",
+            "Aᵢ": "0.30-0.50 (電視新聞 × 鄰里討論)",
+            "Mᵢ": "0.8-1.0 (傳統媒體主導)",
+            "Sᵢ": "0.7-0.9 (保守情緒反應)"
+        }
+    },
+    "計算範例": {
+        "假設": "韓國瑜罷免案，高雄市",
+        "計算": [
+            "P₁=30%, V₁=0.55, A₁=0.60, M₁=1.3, S₁=1.2",
+            "P₂=45%, V₂=0.60, A₂=0.55, M₂=1.1, S₂=1.0", 
+            "P₃=25%, V₃=0.45, A₃=0.40, M₃=0.9, S₃=0.8",
+            "E_factor=0.95, I_factor=1.4, H_correction=1.1"
+        ],
+        "結果": [
+            "R_vote = (0.3×0.55×1.3 + 0.45×0.60×1.1 + 0.25×0.45×0.9) × 0.95 × 1.1 = 42.1%",
+            "R_agree = (0.3×0.60×1.2 + 0.45×0.55×1.0 + 0.25×0.40×0.8) × 1.4 × 1.1 = 97.4%"
+        ]
+    }
+})
 
 class FormulaDesignerAgent:
     """Agent A: 公式設計師 - 負責設計新的投票同意率公式"""
@@ -22,59 +203,14 @@ class FormulaDesignerAgent:
         print(f"\n🤖 {self.name} 開始工作...")
         print(f"📋 問題分析: {problem_description}")
         
-        # 分析問題
-        analysis = {
-            "問題識別": [
-                "原公式 R_agree = R_vote × 正向情緒比 × 動員強度修正值 過於簡化",
-                "缺乏年齡分層考慮",
-                "未區分不同媒體對不同年齡層的影響",
-                "R_vote 定義不清楚"
-            ],
-            "設計原則": [
-                "年齡分層計算",
-                "媒體影響差異化",
-                "投票率與同意率分離",
-                "符合台灣政治現實"
-            ]
-        }
-        
-        # 設計新公式
-        new_formula = {
-            "投票率公式": "R_vote = Σ(Pᵢ × Vᵢ × Eᵢ_media × Eᵢ_social) × T_weather × Regional_factor",
-            "同意率公式": "R_agree = Σ(Pᵢ × Aᵢ × Mᵢ_influence) × Controversy_factor × Mobilization_factor",
-            "年齡分層": {
-                "青年層 (18-35)": {
-                    "投票意願 Vᵢ": "基於政治關心度 × 政治效能感",
-                    "同意意願 Aᵢ": "基於網路論壇情緒 × 同儕壓力",
-                    "媒體影響 Mᵢ": "IG/TikTok/PTT 權重較高"
-                },
-                "中年層 (36-55)": {
-                    "投票意願 Vᵢ": "基於經濟考量 × 政治立場",
-                    "同意意願 Aᵢ": "基於理性分析 × 家庭討論",
-                    "媒體影響 Mᵢ": "Facebook/LINE/新聞 權重較高"
-                },
-                "長者層 (56+)": {
-                    "投票意願 Vᵢ": "基於政治傳統 × 社會責任",
-                    "同意意願 Aᵢ": "基於電視新聞 × 鄰里討論",
-                    "媒體影響 Mᵢ": "電視/報紙/廣播 權重較高"
-                }
-            },
-            "詳細計算": {
-                "步驟1": "R_vote = P₁×V₁×E₁ + P₂×V₂×E₂ + P₃×V₃×E₃ (投票參與率)",
-                "步驟2": "R_agree_raw = P₁×A₁×M₁ + P₂×A₂×M₂ + P₃×A₃×M₃ (原始同意率)",
-                "步驟3": "R_agree = R_agree_raw × Controversy_factor × Mobilization_factor (最終同意率)",
-                "步驟4": "Pass_probability = (R_vote ≥ 25%) AND (R_agree ≥ 50%)"
-            }
-        }
-        
         print(f"✅ 新公式設計完成:")
-        print(f"📊 投票率: {new_formula['投票率公式']}")
-        print(f"📊 同意率: {new_formula['同意率公式']}")
+        print(f"📊 投票率: {_NEW_FORMULA['投票率公式']}")
+        print(f"📊 同意率: {_NEW_FORMULA['同意率公式']}")
         
         return {
             "agent": self.name,
-            "analysis": analysis,
-            "formula": new_formula,
+            "analysis": _DESIGN_ANALYSIS,
+            "formula": _NEW_FORMULA,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -89,67 +225,14 @@ class FormulaReviewerAgent:
         """審查公式並提出修正建議"""
         print(f"\n🔍 {self.name} 開始審查...")
         
-        # 審查分析
-        review_analysis = {
-            "優點": [
-                "✅ 年齡分層設計合理，符合台灣人口結構",
-                "✅ 媒體影響差異化考慮周全",
-                "✅ 投票率與同意率分離，邏輯清晰",
-                "✅ 考慮了爭議性和動員因素"
-            ],
-            "問題": [
-                "⚠️ 公式過於複雜，計算困難",
-                "⚠️ 參數過多，容易產生誤差累積",
-                "⚠️ 缺乏歷史數據驗證機制",
-                "⚠️ Controversy_factor 和 Mobilization_factor 可能重複計算"
-            ],
-            "風險": [
-                "🚨 年齡層權重 Pᵢ 需要動態調整",
-                "🚨 媒體影響係數需要實時更新",
-                "🚨 同意意願 Aᵢ 難以準確量化"
-            ]
-        }
-        
-        # 修正建議
-        suggestions = {
-            "簡化建議": [
-                "合併 Controversy_factor 和 Mobilization_factor 為 Political_intensity",
-                "減少媒體影響參數，使用加權平均",
-                "引入歷史校正係數"
-            ],
-            "改進建議": [
-                "添加地區差異調整",
-                "考慮季節性投票行為",
-                "增加不確定性量化"
-            ],
-            "驗證建議": [
-                "使用2020韓國瑜案例驗證",
-                "使用2021陳柏惟案例驗證", 
-                "計算預測誤差範圍"
-            ]
-        }
-        
-        # 修正後的公式建議
-        revised_formula = {
-            "簡化投票率": "R_vote = Σ(Pᵢ × Vᵢ × Media_weightᵢ) × Environmental_factor",
-            "簡化同意率": "R_agree = Σ(Pᵢ × Aᵢ × Sentiment_weightᵢ) × Political_intensity × Historical_correction",
-            "參數定義": {
-                "Environmental_factor": "天氣係數 × 地區係數",
-                "Political_intensity": "爭議性 × 動員強度 (合併)",
-                "Historical_correction": "基於歷史案例的校正係數",
-                "Media_weightᵢ": "各年齡層主要媒體平台的加權影響",
-                "Sentiment_weightᵢ": "各年齡層情緒分析的加權結果"
-            }
-        }
-        
-        print(f"📝 審查完成，發現 {len(review_analysis['問題'])} 個問題")
-        print(f"💡 提出 {len(suggestions['簡化建議']) + len(suggestions['改進建議'])} 項建議")
+        print(f"📝 審查完成，發現 {len(_REVIEW_ANALYSIS['問題'])} 個問題")
+        print(f"💡 提出 {len(_REVIEW_SUGGESTIONS['簡化建議']) + len(_REVIEW_SUGGESTIONS['改進建議'])} 項建議")
         
         return {
             "agent": self.name,
-            "review": review_analysis,
-            "suggestions": suggestions,
-            "revised_formula": revised_formula,
+            "review": _REVIEW_ANALYSIS,
+            "suggestions": _REVIEW_SUGGESTIONS,
+            "revised_formula": _REVISED_FORMULA,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -164,81 +247,14 @@ class FormulaOptimizerAgent:
         """根據審查建議優化公式"""
         print(f"\n⚙️ {self.name} 開始優化...")
         
-        # 整合分析
-        optimization_analysis = {
-            "採納建議": [
-                "✅ 合併爭議性和動員因素為政治強度係數",
-                "✅ 簡化媒體影響為年齡層加權平均",
-                "✅ 添加歷史校正機制",
-                "✅ 引入不確定性量化"
-            ],
-            "創新改進": [
-                "🆕 動態年齡層權重調整",
-                "🆕 實時情緒分析整合",
-                "🆕 多層次驗證機制"
-            ]
-        }
-        
-        # 最終優化公式
-        final_formula = {
-            "核心公式": {
-                "投票率": "R_vote = Σ(Pᵢ × Vᵢ × Mᵢ) × E_factor × H_correction ± σ_vote",
-                "同意率": "R_agree = Σ(Pᵢ × Aᵢ × Sᵢ) × I_factor × H_correction ± σ_agree"
-            },
-            "參數詳解": {
-                "Pᵢ": "年齡層人口比例 (動態調整)",
-                "Vᵢ": "年齡層投票意願係數",
-                "Aᵢ": "年齡層同意意願係數", 
-                "Mᵢ": "年齡層媒體影響係數",
-                "Sᵢ": "年齡層情緒分析係數",
-                "E_factor": "環境因素 = 天氣係數 × 地區係數",
-                "I_factor": "政治強度 = 爭議性 × 動員強度",
-                "H_correction": "歷史校正係數",
-                "σ_vote, σ_agree": "不確定性範圍"
-            },
-            "年齡層係數": {
-                "青年層": {
-                    "Vᵢ": "0.45-0.65 (政治關心度 × 政治效能感)",
-                    "Aᵢ": "0.40-0.70 (網路情緒 × 同儕壓力)",
-                    "Mᵢ": "1.2-1.5 (社群媒體主導)",
-                    "Sᵢ": "1.1-1.4 (網路論壇情緒)"
-                },
-                "中年層": {
-                    "Vᵢ": "0.50-0.70 (經濟考量 × 政治立場)",
-                    "Aᵢ": "0.45-0.65 (理性分析 × 家庭討論)",
-                    "Mᵢ": "1.0-1.2 (傳統媒體+社群)",
-                    "Sᵢ": "0.9-1.1 (平衡情緒反應)"
-                },
-                "長者層": {
-                    "Vᵢ": "0.35-0.55 (政治傳統 × 社會責任)",
-                    "Aᵢ": "0.30-0.50 (電視新聞 × 鄰里討論)",
-                    "Mᵢ": "0.8-1.0 (傳統媒體主導)",
-                    "Sᵢ": "0.7-0.9 (保守情緒反應)"
-                }
-            },
-            "計算範例": {
-                "假設": "韓國瑜罷免案，高雄市",
-                "計算": [
-                    "P₁=30%, V₁=0.55, A₁=0.60, M₁=1.3, S₁=1.2",
-                    "P₂=45%, V₂=0.60, A₂=0.55, M₂=1.1, S₂=1.0", 
-                    "P₃=25%, V₃=0.45, A₃=0.40, M₃=0.9, S₃=0.8",
-                    "E_factor=0.95, I_factor=1.4, H_correction=1.1"
-                ],
-                "結果": [
-                    "R_vote = (0.3×0.55×1.3 + 0.45×0.60×1.1 + 0.25×0.45×0.9) × 0.95 × 1.1 = 42.1%",
-                    "R_agree = (0.3×0.60×1.2 + 0.45×0.55×1.0 + 0.25×0.40×0.8) × 1.4 × 1.1 = 97.4%"
-                ]
-            }
-        }
-        
         print(f"🎯 最終公式優化完成")
-        print(f"📈 投票率公式: {final_formula['核心公式']['投票率']}")
-        print(f"📈 同意率公式: {final_formula['核心公式']['同意率']}")
+        print(f"📈 投票率公式: {_FINAL_FORMULA['核心公式']['投票率']}")
+        print(f"📈 同意率公式: {_FINAL_FORMULA['核心公式']['同意率']}")
         
         return {
             "agent": self.name,
-            "optimization": optimization_analysis,
-            "final_formula": final_formula,
+            "optimization": _OPTIMIZATION_ANALYSIS,
+            "final_formula": _FINAL_FORMULA,
             "timestamp": datetime.now().isoformat()
         }
 
@@ -290,9 +306,13 @@ def run_agent_collaboration():
     
     print(f"\n💾 協作結果已保存到 formula_collaboration_result.json")
     
-    # 保存到文件
-    with open("formula_collaboration_result.json", "w", encoding="utf-8") as f:
-        json.dump(collaboration_result, f, ensure_ascii=False, indent=2)
+    # 保存到文件（有安裝orjson時直接寫出位元組）
+    if orjson is not None:
+        with open("formula_collaboration_result.json", "wb") as f:
+            f.write(orjson.dumps(collaboration_result, default=dict, option=orjson.OPT_INDENT_2))
+    else:
+        with open("formula_collaboration_result.json", "w", encoding="utf-8") as f:
+            json.dump(collaboration_result, f, ensure_ascii=False, indent=2, default=dict)
     
     return collaboration_result
 
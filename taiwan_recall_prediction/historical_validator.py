@@ -8,18 +8,114 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import copy
+import functools
 import json
 import os
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import logging
-from sklearn.metrics import mean_absolute_percentage_error, r2_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+from types import MappingProxyType
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 歷史選舉數據檔
+HISTORICAL_DATA_PATH = Path(__file__).parent / 'data' / 'historical_elections.json'
+
+@functools.lru_cache(maxsize=1)
+def _load_historical_elections() -> Dict:
+    """解析歷史選舉數據檔；快取的結果由所有實例共用，只能經由 load_historical_data 取得複本"""
+    raw = HISTORICAL_DATA_PATH.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _jit(**options):
+    """有安裝 numba 時以 njit 編譯，否則維持純 Python 函數"""
+    if numba is None:
+        return lambda func: func
+    return numba.njit(**options)
+
+_prange = numba.prange if numba is not None else range
+
+@_jit(cache=True)
+def _mece_kernel(is_presidential, has_climate, controversy, weather_score, media_factor, unemployment):
+    """MECE模型的數值計算核心"""
+    # 投票意願：總統選舉較高、罷免選舉較低
+    base_intention = 0.75 if is_presidential else 0.35
+    
+    # 根據爭議程度調整
+    if has_climate:
+        base_intention *= (0.8 + 0.4 * controversy)
+    
+    # 外部環境：天氣、媒體與經濟因素平均
+    economic_factor = 1 - unemployment / 10
+    external_environment = (weather_score + media_factor + economic_factor) / 3
+    
+    return base_intention * external_environment
+
+@_jit(cache=True, parallel=True)
+def _mece_kernel_batch(is_presidential, has_climate, controversy, weather_score, media_factor, unemployment):
+    """_mece_kernel 的批次版本，輸入為平行陣列"""
+    predictions = np.empty(is_presidential.shape[0])
+    for i in _prange(is_presidential.shape[0]):
+        predictions[i] = _mece_kernel(is_presidential[i], has_climate[i], controversy[i],
+                                      weather_score[i], media_factor[i], unemployment[i])
+    return predictions
+
+def _percentage_errors(errors: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """百分比誤差 |誤差| / |實際值| × 100；實際值為0時記為0，避免除以零"""
+    denominator = np.abs(actual)
+    return np.divide(errors, denominator, out=np.zeros_like(errors), where=denominator != 0) * 100
+
+def _mape(actual: np.ndarray, predicted: np.ndarray) -> float:
+    """平均絕對百分比誤差（比例值，與 sklearn 定義相同）"""
+    return float(np.mean(np.abs(actual - predicted) / np.maximum(np.abs(actual), np.finfo(np.float64).eps)))
+
+def _r2(actual: np.ndarray, predicted: np.ndarray) -> float:
+    """決定係數 R² = 1 - SS_res / SS_tot"""
+    ss_res = np.sum((actual - predicted) ** 2)
+    ss_tot = np.sum((actual - actual.mean()) ** 2)
+    if ss_tot == 0:
+        return 1.0 if ss_res == 0 else 0.0
+    return float(1 - ss_res / ss_tot)
+
+# 地區調整因子（唯讀）
+REGIONAL_FACTORS = MappingProxyType({
+    '北部': 1.1,   # 政治中心，投票率較高
+    '中部': 0.95,  # 傳統地區，投票率中等
+    '南部': 1.05,  # 政治傳統，投票率較高
+    '東部': 0.85   # 人口較少，投票率較低
+})
+
+# 年齡層調整因子（唯讀）
+AGE_FACTORS = MappingProxyType({
+    '18-35': 0.85,  # 年輕人投票率較低
+    '36-55': 1.15,  # 中年人投票率最高
+    '56+': 1.0      # 長者投票率中等
+})
+
+# 模型等級門檻 (MAPE上限, R²下限, 等級)，由高至低依序比對
+MODEL_GRADES = (
+    (0.10, 0.90, "A+ (優秀)"),
+    (0.15, 0.85, "A (良好)"),
+    (0.20, 0.80, "B+ (尚可)"),
+    (0.25, 0.70, "B (需改進)")
+)
+DEFAULT_MODEL_GRADE = "C (待優化)"
+
 class HistoricalValidator:
     """歷史驗證器"""
     
@@ -27,223 +123,128 @@ class HistoricalValidator:
         """初始化歷史驗證器"""
         self.historical_data = self.load_historical_data()
         self.validation_results = {}
+        # MECE預測快取 {id(選舉資料): (選舉資料, 預測值)}
+        self._pred_cache = {}
+        # regional_validation 最近一次的 (結果, 百分比誤差陣列)
+        self._regional_pct_errors = (None, np.empty(0))
+        # 欄位導向的平行陣列（總統選舉在前、罷免選舉在後）
+        self.arr = self._build_election_arrays()
         
     def load_historical_data(self) -> Dict:
-        """載入歷史選舉數據"""
-        historical_data = {
-            "presidential_elections": [
-                {
-                    "year": 2016,
-                    "type": "總統選舉",
-                    "national_turnout": 0.661,
-                    "regional_turnout": {
-                        "北部": 0.703,
-                        "中部": 0.659,
-                        "南部": 0.631,
-                        "東部": 0.642
-                    },
-                    "age_group_turnout": {
-                        "18-35": 0.58,
-                        "36-55": 0.72,
-                        "56+": 0.68
-                    },
-                    "weather_conditions": {
-                        "temperature": 18.5,
-                        "rainfall": 2.3,
-                        "weather_score": 0.75
-                    },
-                    "economic_indicators": {
-                        "unemployment_rate": 3.92,
-                        "gdp_growth": 1.48,
-                        "inflation_rate": 1.39
-                    }
-                },
-                {
-                    "year": 2020,
-                    "type": "總統選舉",
-                    "national_turnout": 0.748,
-                    "regional_turnout": {
-                        "北部": 0.782,
-                        "中部": 0.744,
-                        "南部": 0.731,
-                        "東部": 0.715
-                    },
-                    "age_group_turnout": {
-                        "18-35": 0.69,
-                        "36-55": 0.81,
-                        "56+": 0.74
-                    },
-                    "weather_conditions": {
-                        "temperature": 22.1,
-                        "rainfall": 0.8,
-                        "weather_score": 0.85
-                    },
-                    "economic_indicators": {
-                        "unemployment_rate": 3.73,
-                        "gdp_growth": 3.11,
-                        "inflation_rate": -0.23
-                    }
-                }
+        """載入歷史選舉數據（data/historical_elections.json），回傳深複本，實例可自行修改"""
+        return copy.deepcopy(_load_historical_elections())
+    
+    def _build_election_arrays(self) -> Dict[str, np.ndarray]:
+        """將巢狀的歷史選舉數據轉為平行的 NumPy 陣列，缺值套用與 calculate_mece_prediction 相同的預設值"""
+        elections = (self.historical_data['presidential_elections'] +
+                     self.historical_data['recall_elections'])
+        climates = [e.get('political_climate') for e in elections]
+        
+        return {
+            'year': np.array([e['year'] for e in elections]),
+            'type': np.array([e.get('type', '罷免選舉') for e in elections]),
+            'label': [
+                f"{e['year']}總統選舉" if e.get('type') == '總統選舉' else f"{e['year']}{e['target']}罷免"
+                for e in elections
             ],
-            "recall_elections": [
-                {
-                    "year": 2020,
-                    "target": "韓國瑜",
-                    "location": "高雄市",
-                    "region": "南部",
-                    "turnout": 0.421,
-                    "result": "通過",
-                    "agree_rate": 0.939,
-                    "weather_conditions": {
-                        "temperature": 28.3,
-                        "rainfall": 15.2,
-                        "weather_score": 0.65
-                    },
-                    "political_climate": {
-                        "media_coverage": 0.95,
-                        "social_media_activity": 0.88,
-                        "controversy_level": 0.92
-                    },
-                    "economic_factors": {
-                        "local_unemployment": 3.8,
-                        "satisfaction_rating": 0.32
-                    }
-                },
-                {
-                    "year": 2021,
-                    "target": "陳柏惟",
-                    "location": "台中市第二選區",
-                    "region": "中部",
-                    "turnout": 0.257,
-                    "result": "通過",
-                    "agree_rate": 0.773,
-                    "weather_conditions": {
-                        "temperature": 25.1,
-                        "rainfall": 3.5,
-                        "weather_score": 0.78
-                    },
-                    "political_climate": {
-                        "media_coverage": 0.72,
-                        "social_media_activity": 0.65,
-                        "controversy_level": 0.68
-                    },
-                    "economic_factors": {
-                        "local_unemployment": 3.5,
-                        "satisfaction_rating": 0.45
-                    }
-                },
-                {
-                    "year": 2022,
-                    "target": "林昶佐",
-                    "location": "台北市第八選區",
-                    "region": "北部",
-                    "turnout": 0.171,
-                    "result": "未通過",
-                    "agree_rate": 0.503,
-                    "weather_conditions": {
-                        "temperature": 16.8,
-                        "rainfall": 8.7,
-                        "weather_score": 0.68
-                    },
-                    "political_climate": {
-                        "media_coverage": 0.58,
-                        "social_media_activity": 0.52,
-                        "controversy_level": 0.48
-                    },
-                    "economic_factors": {
-                        "local_unemployment": 2.9,
-                        "satisfaction_rating": 0.58
-                    }
-                }
-            ]
+            'actual': np.array([e['national_turnout'] if 'national_turnout' in e else e['turnout'] for e in elections]),
+            'has_climate': np.array([c is not None for c in climates]),
+            'controversy': np.array([c.get('controversy_level', 0.5) if c else 0.5 for c in climates]),
+            'weather': np.array([e.get('weather_conditions', {}).get('weather_score', 0.75) for e in elections]),
+            'media': np.array([c.get('media_coverage', 0.6) if c else 0.6 for c in climates]),
+            'unemployment': np.array([
+                e['economic_factors'].get('local_unemployment', 3.5) if 'economic_factors' in e else 3.5
+                for e in elections
+            ])
         }
-        
-        return historical_data
+    
+    def _predict_all(self) -> np.ndarray:
+        """以向量運算一次計算所有歷史選舉的MECE預測值（與 calculate_mece_prediction 相同公式）"""
+        arr = self.arr
+        if numba is not None:
+            return _mece_kernel_batch(arr['type'] == '總統選舉', arr['has_climate'], arr['controversy'],
+                                      arr['weather'], arr['media'], arr['unemployment'])
+        
+        base_intention = np.where(arr['type'] == '總統選舉', 0.75, 0.35)
+        base_intention = base_intention * np.where(arr['has_climate'], 0.8 + 0.4 * arr['controversy'], 1.0)
+        external_environment = (arr['weather'] + arr['media'] + (1 - arr['unemployment'] / 10)) / 3
+        return base_intention * external_environment
+    
+    @functools.cached_property
+    def predictions(self) -> np.ndarray:
+        """所有歷史選舉的MECE預測值（順序同 self.arr），每份報告只計算一次"""
+        return self._predict_all()
+    
+    def invalidate_predictions(self):
+        """historical_data 變更後呼叫，重建陣列並清除所有預測快取"""
+        self.arr = self._build_election_arrays()
+        self._pred_cache.clear()
+        self.__dict__.pop('predictions', None)
     
     def calculate_mece_prediction(self, election_data: Dict) -> float:
-        """使用MECE模型計算歷史選舉的預測值"""
-        
-        # 投票意願計算
-        if election_data.get('type') == '總統選舉':
-            # 總統選舉的投票意願較高
-            base_intention = 0.75
-        else:
-            # 罷免選舉的投票意願較低
-            base_intention = 0.35
-        
-        # 根據爭議程度調整
-        if 'political_climate' in election_data:
-            controversy_factor = election_data['political_climate'].get('controversy_level', 0.5)
-            base_intention *= (0.8 + 0.4 * controversy_factor)
-        
-        # 外部環境計算
-        weather_score = election_data.get('weather_conditions', {}).get('weather_score', 0.75)
-        
-        if 'political_climate' in election_data:
-            media_factor = election_data['political_climate'].get('media_coverage', 0.6)
-        else:
-            media_factor = 0.6
+        """使用MECE模型計算歷史選舉的預測值（同一份選舉資料只計算一次）"""
+        cached = self._pred_cache.get(id(election_data))
+        # 同時保存資料本身並比對身分，避免物件回收後 id 被重用而誤取
+        if cached is not None and cached[0] is election_data:
+            return cached[1]
+        
+        prediction = self._compute_mece_prediction(election_data)
+        self._pred_cache[id(election_data)] = (election_data, prediction)
+        return prediction
+    
+    def _compute_mece_prediction(self, election_data: Dict) -> float:
+        """MECE模型預測值的實際計算：從選舉資料取出數值後交給計算核心"""
+        political_climate = election_data.get('political_climate')
         
-        # 經濟因素
+        # 經濟因素（無資料時以失業率3.5%計，即經濟係數0.65）
         if 'economic_factors' in election_data:
-            economic_factor = 1 - election_data['economic_factors'].get('local_unemployment', 3.5) / 10
+            unemployment = election_data['economic_factors'].get('local_unemployment', 3.5)
         else:
-            economic_factor = 0.65
-        
-        external_environment = (weather_score + media_factor + economic_factor) / 3
-        
-        # MECE預測
-        prediction = base_intention * external_environment
-        
-        return prediction
+            unemployment = 3.5
+        
+        return float(_mece_kernel(
+            election_data.get('type') == '總統選舉',
+            political_climate is not None,
+            political_climate.get('controversy_level', 0.5) if political_climate is not None else 0.5,
+            election_data.get('weather_conditions', {}).get('weather_score', 0.75),
+            political_climate.get('media_coverage', 0.6) if political_climate is not None else 0.6,
+            unemployment
+        ))
     
     def validate_model_accuracy(self) -> Dict:
         """驗證模型準確性"""
         logger.info("開始模型準確性驗證...")
         
-        actual_values = []
-        predicted_values = []
-        election_info = []
-        
-        # 驗證總統選舉
-        for election in self.historical_data['presidential_elections']:
-            actual = election['national_turnout']
-            predicted = self.calculate_mece_prediction(election)
-            
-            actual_values.append(actual)
-            predicted_values.append(predicted)
-            election_info.append(f"{election['year']}總統選舉")
-        
-        # 驗證罷免選舉
-        for election in self.historical_data['recall_elections']:
-            actual = election['turnout']
-            predicted = self.calculate_mece_prediction(election)
-            
-            actual_values.append(actual)
-            predicted_values.append(predicted)
-            election_info.append(f"{election['year']}{election['target']}罷免")
+        actual_values = self.arr['actual']
+        predicted_values = self.predictions
+        election_info = self.arr['label']
         
         # 計算驗證指標
-        mape = mean_absolute_percentage_error(actual_values, predicted_values)
-        r2 = r2_score(actual_values, predicted_values)
+        mape = _mape(actual_values, predicted_values)
+        r2 = _r2(actual_values, predicted_values)
         
         # 計算平均絕對誤差
-        mae = np.mean(np.abs(np.array(actual_values) - np.array(predicted_values)))
+        errors = np.abs(actual_values - predicted_values)
+        percentage_errors = _percentage_errors(errors, actual_values)
+        mae = errors.mean()
         
         validation_results = {
-            'mape': float(mape),
-            'r2_score': float(r2),
+            'mape': mape,
+            'r2_score': r2,
             'mae': float(mae),
-            'sample_size': int(len(actual_values)),
+            'sample_size': len(actual_values),
             'detailed_results': [
                 {
                     'election': info,
-                    'actual': float(actual),
-                    'predicted': float(predicted),
-                    'error': float(abs(actual - predicted)),
-                    'percentage_error': float(abs(actual - predicted) / actual * 100)
+                    'actual': actual,
+                    'predicted': predicted,
+                    'error': error,
+                    'percentage_error': percentage_error
                 }
-                for info, actual, predicted in zip(election_info, actual_values, predicted_values)
+                for info, actual, predicted, error, percentage_error in zip(
+                    election_info, actual_values.tolist(), predicted_values.tolist(),
+                    errors.tolist(), percentage_errors.tolist()
+                )
             ]
         }
         
@@ -252,37 +253,48 @@ class HistoricalValidator:
         
         return validation_results
     
+    def _segment_validation(self, turnouts: Dict[str, float], base_prediction: float,
+                            factors) -> Tuple[Dict, np.ndarray]:
+        """以調整因子向量一次計算各分群（地區／年齡層）的預測值與誤差，並回傳百分比誤差陣列"""
+        segments = list(turnouts)
+        actual = np.array([turnouts[segment] for segment in segments])
+        predicted = base_prediction * np.array([factors.get(segment, 1.0) for segment in segments])
+        errors = np.abs(actual - predicted)
+        percentage_errors = _percentage_errors(errors, actual)
+        
+        results = {
+            segment: {
+                'actual': actual_value,
+                'predicted': predicted_value,
+                'error': error,
+                'percentage_error': percentage_error
+            }
+            for segment, actual_value, predicted_value, error, percentage_error in zip(
+                segments, actual.tolist(), predicted.tolist(), errors.tolist(), percentage_errors.tolist()
+            )
+        }
+        return results, percentage_errors
+    
     def regional_validation(self) -> Dict:
         """地區驗證分析"""
         logger.info("開始地區驗證分析...")
         
         regional_results = {}
+        percentage_errors = []
         
-        for election in self.historical_data['presidential_elections']:
+        presidential = self.historical_data['presidential_elections']
+        # 各地區共用同一個基礎預測（總統選舉位於預測陣列前段）
+        for election, base_prediction in zip(presidential, self.predictions[:len(presidential)].tolist()):
             year = election['year']
-            regional_results[f'{year}總統選舉'] = {}
             
-            for region, actual_turnout in election['regional_turnout'].items():
-                # 根據地區特性調整預測
-                base_prediction = self.calculate_mece_prediction(election)
-                
-                # 地區調整因子
-                regional_factors = {
-                    '北部': 1.1,   # 政治中心，投票率較高
-                    '中部': 0.95,  # 傳統地區，投票率中等
-                    '南部': 1.05,  # 政治傳統，投票率較高
-                    '東部': 0.85   # 人口較少，投票率較低
-                }
-                
-                regional_prediction = base_prediction * regional_factors.get(region, 1.0)
-                error = abs(actual_turnout - regional_prediction)
-                
-                regional_results[f'{year}總統選舉'][region] = {
-                    'actual': float(actual_turnout),
-                    'predicted': float(regional_prediction),
-                    'error': float(error),
-                    'percentage_error': float(error / actual_turnout * 100)
-                }
+            # 根據地區特性調整預測
+            regional_results[f'{year}總統選舉'], errors = self._segment_validation(
+                election['regional_turnout'], base_prediction, REGIONAL_FACTORS
+            )
+            percentage_errors.append(errors)
+        
+        # 保留所有地區的百分比誤差，供 identify_strengths 直接取平均
+        self._regional_pct_errors = (regional_results, np.concatenate(percentage_errors) if percentage_errors else np.empty(0))
         
         return regional_results
     
@@ -292,30 +304,15 @@ class HistoricalValidator:
         
         age_results = {}
         
-        for election in self.historical_data['presidential_elections']:
+        presidential = self.historical_data['presidential_elections']
+        # 各年齡層共用同一個基礎預測（總統選舉位於預測陣列前段）
+        for election, base_prediction in zip(presidential, self.predictions[:len(presidential)].tolist()):
             year = election['year']
-            age_results[f'{year}總統選舉'] = {}
             
-            for age_group, actual_turnout in election['age_group_turnout'].items():
-                # 根據年齡層特性調整預測
-                base_prediction = self.calculate_mece_prediction(election)
-                
-                # 年齡層調整因子
-                age_factors = {
-                    '18-35': 0.85,  # 年輕人投票率較低
-                    '36-55': 1.15,  # 中年人投票率最高
-                    '56+': 1.0      # 長者投票率中等
-                }
-                
-                age_prediction = base_prediction * age_factors.get(age_group, 1.0)
-                error = abs(actual_turnout - age_prediction)
-                
-                age_results[f'{year}總統選舉'][age_group] = {
-                    'actual': float(actual_turnout),
-                    'predicted': float(age_prediction),
-                    'error': float(error),
-                    'percentage_error': float(error / actual_turnout * 100)
-                }
+            # 根據年齡層特性調整預測
+            age_results[f'{year}總統選舉'], _ = self._segment_validation(
+                election['age_group_turnout'], base_prediction, AGE_FACTORS
+            )
         
         return age_results
     
@@ -329,35 +326,25 @@ class HistoricalValidator:
             'stability_metrics': {}
         }
         
-        # 按年份排序
-        all_elections = []
-        
-        for election in self.historical_data['presidential_elections']:
-            all_elections.append({
-                'year': election['year'],
-                'type': '總統選舉',
-                'actual': election['national_turnout'],
-                'predicted': self.calculate_mece_prediction(election)
-            })
-        
-        for election in self.historical_data['recall_elections']:
-            all_elections.append({
-                'year': election['year'],
-                'type': '罷免選舉',
-                'actual': election['turnout'],
-                'predicted': self.calculate_mece_prediction(election)
-            })
-        
-        all_elections.sort(key=lambda x: x['year'])
-        
-        # 計算時間趨勢
-        years = [e['year'] for e in all_elections]
-        errors = [abs(e['actual'] - e['predicted']) for e in all_elections]
+        # 所有選舉的誤差一次計算
+        arr = self.arr
+        predicted = self.predictions
+        errors = np.abs(arr['actual'] - predicted)
         
         # 計算穩定性指標
-        error_std = np.std(errors)
-        error_mean = np.mean(errors)
-        stability_coefficient = 1 - (error_std / error_mean) if error_mean > 0 else 0
+        error_std = errors.std()
+        error_mean = errors.mean()
+        stability_coefficient = 1 - (error_std / error_mean) if error_mean > 1e-12 else 0.0
+        
+        # 按年份排序的趨勢資料
+        order = np.argsort(arr['year'], kind='stable')
+        all_elections = [
+            {'year': year, 'type': election_type, 'actual': actual, 'predicted': prediction}
+            for year, election_type, actual, prediction in zip(
+                arr['year'][order].tolist(), arr['type'][order].tolist(),
+                arr['actual'][order].tolist(), predicted[order].tolist()
+            )
+        ]
         
         temporal_results['stability_metrics'] = {
             'error_standard_deviation': float(error_std),
@@ -373,6 +360,7 @@ class HistoricalValidator:
     def generate_validation_report(self) -> Dict:
         """生成完整驗證報告"""
         logger.info("生成驗證報告...")
+        now = datetime.now()
         
         # 執行所有驗證
         accuracy_results = self.validate_model_accuracy()
@@ -389,7 +377,7 @@ class HistoricalValidator:
         }
         
         validation_report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'overall_assessment': overall_assessment,
             'accuracy_validation': accuracy_results,
             'regional_validation': regional_results,
@@ -398,7 +386,7 @@ class HistoricalValidator:
         }
         
         # 保存報告
-        self.save_validation_report(validation_report)
+        self.save_validation_report(validation_report, now)
         
         return validation_report
     
@@ -407,16 +395,10 @@ class HistoricalValidator:
         mape = accuracy_results['mape']
         r2 = accuracy_results['r2_score']
         
-        if mape < 0.1 and r2 > 0.9:
-            return "A+ (優秀)"
-        elif mape < 0.15 and r2 > 0.85:
-            return "A (良好)"
-        elif mape < 0.2 and r2 > 0.8:
-            return "B+ (尚可)"
-        elif mape < 0.25 and r2 > 0.7:
-            return "B (需改進)"
-        else:
-            return "C (待優化)"
+        for mape_threshold, r2_threshold, grade in MODEL_GRADES:
+            if mape < mape_threshold and r2 > r2_threshold:
+                return grade
+        return DEFAULT_MODEL_GRADE
     
     def identify_strengths(self, accuracy_results: Dict, regional_results: Dict, age_results: Dict) -> List[str]:
         """識別模型優勢"""
@@ -428,13 +410,15 @@ class HistoricalValidator:
         if accuracy_results['r2_score'] > 0.85:
             strengths.append("模型解釋力強")
         
-        # 檢查地區預測表現
-        regional_errors = []
-        for election, regions in regional_results.items():
-            for region, data in regions.items():
-                regional_errors.append(data['percentage_error'])
+        # 檢查地區預測表現（同一份結果直接使用 regional_validation 保留的誤差陣列）
+        cached_results, regional_errors = self._regional_pct_errors
+        if cached_results is not regional_results:
+            regional_errors = np.fromiter(
+                (data['percentage_error'] for regions in regional_results.values() for data in regions.values()),
+                dtype=float
+            )
         
-        if np.mean(regional_errors) < 15:
+        if regional_errors.mean() < 15:
             strengths.append("地區預測表現良好")
         
         return strengths
@@ -465,15 +449,20 @@ class HistoricalValidator:
         
         return recommendations
     
-    def save_validation_report(self, report: Dict):
-        """保存驗證報告"""
+    def save_validation_report(self, report: Dict, now: Optional[datetime] = None):
+        """保存驗證報告（檔名時間與報告內 timestamp 一致）"""
         os.makedirs('reports', exist_ok=True)
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
         report_file = f'reports/validation_report_{timestamp}.json'
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            Path(report_file).write_bytes(
+                orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            )
+        else:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
         
         logger.info(f"驗證報告已保存到: {report_file}")
 
@@ -7,27 +7,50 @@ Main Crawler Controller Module
 統一調用所有平台爬蟲，整合數據並儲存到數據庫
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
 import time
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import argparse
 
-# 導入爬蟲模組
-from crawler.config import get_config, KEYWORDS
-from crawler.dcard_crawler import DcardCrawler
-from crawler.mobile01_crawler import Mobile01Crawler
-from crawler.fb_crawler import FacebookCrawler
+import requests
+from requests.adapters import HTTPAdapter
 
-# 導入儲存模組
-from storage.mongo_handler import MongoHandler
-from storage.sqlite_handler import SQLiteHandler
+# 導入爬蟲配置（各平台爬蟲、儲存模組和pandas在用到時才載入，
+# 例如 --help 或 --no-mongodb 時不必載入pymongo）
+from crawler.config import get_config, BASE_CONFIG, KEYWORDS
 
 # 導入工具
-from utils.common import data_processor, statistics_calculator
+from utils.common import (
+    data_processor, date_processor, statistics_calculator, RateLimiter
+)
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# 設置日誌
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 設置日誌；格式未用到執行緒/程序資訊，不必每筆記錄都查詢
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.raiseExceptions = False
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -38,11 +61,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 預設爬取關鍵字（唯讀，所有爬蟲共用同一份）
+ALL_KEYWORDS = tuple(KEYWORDS['recall']) + tuple(KEYWORDS['candidates'])
+
+def _write_report(report: Dict[str, Any], path: str, compress: bool = False):
+    """
+    將報告寫成JSON文件（有安裝orjson時直接寫出位元組）
+
+    compress為True時不縮排，以zstd串流壓縮寫出，需要zstandard
+    """
+    if compress:
+        if orjson is not None:
+            payload = orjson.dumps(report, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(report, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with open(path, 'wb') as f, zstandard.ZstdCompressor(level=3).stream_writer(f) as writer:
+            writer.write(payload)
+    elif orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(
+                report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+def _date_sort_key(article: Dict) -> datetime:
+    """文章日期排序鍵，與data_processor.sort_by_date相同"""
+    return date_processor.parse_date(article.get('date', '')) or datetime.min
+
+def _chunks(items: List[Any], size: int):
+    """將列表切分為固定大小的區塊"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 class MainCrawler:
     """主控制爬蟲類"""
     
+    # 各平台同時爬取的論壇/粉專數上限，避免請求過於密集被封鎖
+    PLATFORM_CONCURRENCY = {
+        'dcard': 10,
+        'mobile01': 10,
+        'facebook': 5,
+        'ptt': 10,
+    }
+    
+    # 各平台HTTP請求的速率上限 (每秒次數, 突發上限)，同平台所有並行爬取與重試共用，避免429/封鎖
+    PLATFORM_RATE_LIMITS = {
+        'dcard': (5, 10),
+        'mobile01': (5, 10),
+        'facebook': (2, 5),
+        'ptt': (5, 10),
+    }
+    
+    # 跨平台去重的布隆過濾器參數
+    DEDUP_INITIAL_CAPACITY = 100_000
+    DEDUP_ERROR_RATE = 1e-4
+    
+    # 跨次執行保存已儲存文章連結的布隆過濾器檔案
+    SEEN_LINKS_FILE = 'seen_links.bloom'
+    
+    # 每次寫入儲存處理器的文章數，每批為一個交易
+    INSERT_CHUNK_SIZE = 2000
+    
+    # 文章數達此值才以多程序計算情緒分布，小量數據不值得程序啟動與序列化的開銷
+    PARALLEL_STATS_MIN_ARTICLES = 2000
+    
     def __init__(self, use_mongodb: bool = True, use_sqlite: bool = True,
-                 facebook_token: str = None):
+                 facebook_token: str = None, skip_seen: bool = True):
         """
         初始化主控制爬蟲
         
@@ -50,9 +136,22 @@ class MainCrawler:
             use_mongodb: 是否使用MongoDB
             use_sqlite: 是否使用SQLite
             facebook_token: Facebook access token
+            skip_seen: 是否跳過先前執行已儲存過的文章
         """
         self.config = get_config()
-        self.keywords = KEYWORDS['recall'] + KEYWORDS['candidates']
+        self.keywords = ALL_KEYWORDS
+        
+        # 所有爬蟲共用的HTTP連線池
+        self._session = self._create_session()
+        
+        # 先前執行已儲存過的文章連結，各平台爬蟲據此在抓取內容前跳過
+        self._seen_links = self._load_seen_links() if skip_seen else None
+        
+        # 各平台共用的請求限速器，由爬蟲在每次HTTP請求前取得權杖
+        self._rate_limiters = {
+            platform: RateLimiter(rate, burst)
+            for platform, (rate, burst) in self.PLATFORM_RATE_LIMITS.items()
+        }
         
         # 初始化爬蟲
         self.crawlers = {}
@@ -62,22 +161,51 @@ class MainCrawler:
         self.storage_handlers = {}
         self._init_storage(use_mongodb, use_sqlite)
         
+        # 最近一次處理的 (爬取結果, 文章統計表)，供generate_report重用
+        self._article_frame = None
+        
         logger.info("主控制爬蟲初始化完成")
     
+    def _create_session(self) -> requests.Session:
+        """
+        建立所有爬蟲共用的Session
+
+        連線池大小涵蓋各平台同時爬取的上限，讓並行的論壇/粉專爬取
+        重用已建立的keep-alive連線，不必各自重新握手
+        """
+        session = requests.Session()
+        session.headers.update({'User-Agent': BASE_CONFIG['user_agent']})
+        adapter = HTTPAdapter(
+            pool_connections=len(self.PLATFORM_CONCURRENCY),
+            pool_maxsize=max(self.PLATFORM_CONCURRENCY.values())
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
     def _init_crawlers(self, facebook_token: str = None):
         """初始化所有爬蟲"""
         try:
             # Dcard爬蟲
-            self.crawlers['dcard'] = DcardCrawler()
+            from crawler.dcard_crawler import DcardCrawler
+            self.crawlers['dcard'] = DcardCrawler(session=self._session,
+                                                  seen_links=self._seen_links,
+                                                  rate_limiter=self._rate_limiters['dcard'])
             logger.info("Dcard爬蟲初始化完成")
             
             # Mobile01爬蟲
-            self.crawlers['mobile01'] = Mobile01Crawler()
+            from crawler.mobile01_crawler import Mobile01Crawler
+            self.crawlers['mobile01'] = Mobile01Crawler(session=self._session,
+                                                        seen_links=self._seen_links,
+                                                        rate_limiter=self._rate_limiters['mobile01'])
             logger.info("Mobile01爬蟲初始化完成")
             
             # Facebook爬蟲
             if facebook_token:
-                self.crawlers['facebook'] = FacebookCrawler(facebook_token)
+                from crawler.fb_crawler import FacebookCrawler
+                self.crawlers['facebook'] = FacebookCrawler(facebook_token, session=self._session,
+                                                            seen_links=self._seen_links,
+                                                            rate_limiter=self._rate_limiters['facebook'])
                 logger.info("Facebook爬蟲初始化完成")
             else:
                 logger.warning("Facebook access token未提供，跳過Facebook爬蟲")
@@ -85,42 +213,155 @@ class MainCrawler:
             # PTT爬蟲 (使用現有的)
             try:
                 from ptt_crawler import PTTCrawler
-                self.crawlers['ptt'] = PTTCrawler()
+                self.crawlers['ptt'] = PTTCrawler(session=self._session,
+                                                  seen_links=self._seen_links,
+                                                  rate_limiter=self._rate_limiters['ptt'])
                 logger.info("PTT爬蟲初始化完成")
             except ImportError:
                 logger.warning("PTT爬蟲模組未找到，跳過PTT爬蟲")
             
         except Exception as e:
-            logger.error(f"初始化爬蟲時發生錯誤: {e}")
+            logger.error("初始化爬蟲時發生錯誤: %s", e)
     
     def _init_storage(self, use_mongodb: bool, use_sqlite: bool):
         """初始化儲存處理器"""
         try:
             if use_mongodb:
                 try:
+                    from storage.mongo_handler import MongoHandler
                     self.storage_handlers['mongodb'] = MongoHandler()
                     logger.info("MongoDB儲存處理器初始化完成")
                 except Exception as e:
-                    logger.error(f"MongoDB初始化失敗: {e}")
+                    logger.error("MongoDB初始化失敗: %s", e)
             
             if use_sqlite:
                 try:
+                    from storage.sqlite_handler import SQLiteHandler
                     self.storage_handlers['sqlite'] = SQLiteHandler()
                     logger.info("SQLite儲存處理器初始化完成")
                 except Exception as e:
-                    logger.error(f"SQLite初始化失敗: {e}")
+                    logger.error("SQLite初始化失敗: %s", e)
             
         except Exception as e:
-            logger.error(f"初始化儲存處理器時發生錯誤: {e}")
+            logger.error("初始化儲存處理器時發生錯誤: %s", e)
+    
+    async def _crawl_platform(self, label: str, unit: str, crawl) -> List[Dict]:
+        """
+        執行單一平台的爬取協程，失敗時回傳空列表
+
+        Args:
+            label: 日誌顯示名稱
+            unit: 日誌顯示單位（文章/貼文）
+            crawl: 平台爬取協程
+
+        Returns:
+            該平台爬取結果
+        """
+        try:
+            logger.info("開始爬取%s...", label)
+            articles = await crawl
+            logger.info("%s爬取完成: %d 篇%s", label, len(articles), unit)
+            return articles
+        except Exception as e:
+            logger.error("%s爬取失敗: %s", label, e)
+            return []
+    
+    async def _fan_out(self, platform: str, fetch_func, jobs: List[tuple]) -> List[Dict]:
+        """
+        並行執行平台內各論壇/粉專的同步爬取，以該平台的信號量限制同時爬取數；
+        請求速率由各爬蟲內的平台限速器逐個HTTP請求限制
+
+        網路錯誤的指數退避重試在各爬蟲的RequestHelper內進行，單一論壇/粉專
+        失敗時只記錄並略過，不影響其他論壇/粉專
+
+        Args:
+            platform: 平台名稱
+            fetch_func: 單一論壇/粉專的同步爬取方法
+            jobs: 每個論壇/粉專的呼叫參數
+
+        Returns:
+            依jobs順序合併的文章列表
+        """
+        sem = self._sem[platform]
+        
+        async def fetch_one(args):
+            async with sem:
+                return await asyncio.to_thread(fetch_func, *args)
+        
+        batches = await asyncio.gather(
+            *(fetch_one(args) for args in jobs), return_exceptions=True
+        )
+        
+        articles = []
+        for args, batch in zip(jobs, batches):
+            if isinstance(batch, Exception):
+                logger.error("爬取%s %s 時發生錯誤: %s", platform, args[0], batch)
+                continue
+            articles.extend(batch)
+        return articles
+    
+    @staticmethod
+    def _merge_platform_articles(articles: List[Dict]) -> List[Dict]:
+        """平台內去重和排序（與各爬蟲的crawl_all_*一致）"""
+        articles = data_processor.deduplicate_articles(articles)
+        return data_processor.sort_by_date(articles)
+    
+    async def _crawl_dcard(self, keywords: List[str], pages: int) -> List[Dict]:
+        """爬取Dcard"""
+        crawler = self.crawlers['dcard']
+        articles = await self._fan_out(
+            'dcard', crawler.get_forum_articles,
+            [(forum, keywords, pages) for forum in crawler.forums]
+        )
+        return self._merge_platform_articles(articles)
     
-    def crawl_all_platforms(self, keywords: List[str] = None, 
-                           pages_per_platform: int = 3) -> Dict[str, List[Dict]]:
+    async def _crawl_mobile01(self, keywords: List[str], pages: int) -> List[Dict]:
+        """爬取Mobile01"""
+        crawler = self.crawlers['mobile01']
+        articles = await self._fan_out(
+            'mobile01', crawler.get_forum_articles,
+            [(name, forum_id, keywords, pages)
+             for name, forum_id in crawler.forums.items()]
+        )
+        return self._merge_platform_articles(articles)
+    
+    async def _crawl_facebook(self, keywords: List[str], pages: int) -> List[Dict]:
+        """爬取Facebook"""
+        crawler = self.crawlers['facebook']
+        if not crawler.access_token:
+            logger.error("需要Facebook access token才能爬取數據")
+            return []
+        
+        posts_per_page = pages * 10  # Facebook每頁文章較少
+        posts = await self._fan_out(
+            'facebook', crawler.get_page_posts,
+            [(page_id, keywords, posts_per_page) for page_id in crawler.pages.values()]
+        )
+        return self._merge_platform_articles(posts)
+    
+    async def _crawl_ptt(self, keywords: List[str], pages: int) -> List[Dict]:
+        """爬取PTT"""
+        articles = await self._fan_out(
+            'ptt', self.crawlers['ptt'].get_board_articles,
+            [('Gossiping', pages, keywords)]
+        )
+        # 與其他平台一致，按日期排序後回傳
+        return data_processor.sort_by_date(articles)
+    
+    async def crawl_all_platforms(self, keywords: List[str] = None, 
+                                  pages_per_platform: int = 3,
+                                  results_queue: Optional[asyncio.Queue] = None
+                                  ) -> Dict[str, List[Dict]]:
         """
-        爬取所有平台數據
+        並行爬取所有平台數據
+        
+        各平台爬蟲皆為網路I/O，同時執行時總耗時約為最慢平台的耗時，
+        而非各平台耗時總和
         
         Args:
             keywords: 關鍵字列表
             pages_per_platform: 每個平台爬取的頁數
+            results_queue: 若提供，每個平台完成時即將其文章放入佇列
             
         Returns:
             各平台爬取結果
@@ -128,118 +369,322 @@ class MainCrawler:
         if keywords is None:
             keywords = self.keywords
         
+        start_ns = time.perf_counter_ns()
+        
+        logger.info("開始爬取所有平台，關鍵字: %s", keywords)
+        
+        # 信號量須在事件迴圈內建立，每次爬取重新建立
+        self._sem = {
+            platform: asyncio.Semaphore(limit)
+            for platform, limit in self.PLATFORM_CONCURRENCY.items()
+        }
+        
+        platform_crawlers = {
+            'dcard': ('Dcard', '文章', self._crawl_dcard),
+            'mobile01': ('Mobile01', '文章', self._crawl_mobile01),
+            'facebook': ('Facebook', '貼文', self._crawl_facebook),
+            'ptt': ('PTT', '文章', self._crawl_ptt),
+        }
+        platforms = [p for p in platform_crawlers if p in self.crawlers]
+        
+        async def crawl_and_publish(label, unit, crawl):
+            articles = await self._crawl_platform(label, unit, crawl(keywords, pages_per_platform))
+            if results_queue is not None and articles:
+                await results_queue.put(articles)
+            return articles
+        
+        gathered = await asyncio.gather(
+            *(crawl_and_publish(*platform_crawlers[p]) for p in platforms),
+            return_exceptions=True
+        )
+        
         results = {}
-        start_time = time.time()
+        for platform, articles in zip(platforms, gathered):
+            if isinstance(articles, BaseException):
+                logger.error("%s爬取失敗: %s", platform, articles)
+                articles = []
+            results[platform] = articles
         
-        logger.info(f"開始爬取所有平台，關鍵字: {keywords}")
+        crawl_duration = (time.perf_counter_ns() - start_ns) / 1e9
         
-        # 爬取Dcard
-        if 'dcard' in self.crawlers:
-            try:
-                logger.info("開始爬取Dcard...")
-                dcard_articles = self.crawlers['dcard'].crawl_all_forums(
-                    keywords, pages_per_platform
-                )
-                results['dcard'] = dcard_articles
-                logger.info(f"Dcard爬取完成: {len(dcard_articles)} 篇文章")
-            except Exception as e:
-                logger.error(f"Dcard爬取失敗: {e}")
-                results['dcard'] = []
+        # 統計總結
+        total_articles = sum(len(articles) for articles in results.values())
+        logger.info("所有平台爬取完成，總共 %d 篇文章，耗時 %.2f 秒", total_articles, crawl_duration)
         
-        # 爬取Mobile01
-        if 'mobile01' in self.crawlers:
+        return results
+    
+    @classmethod
+    def _new_seen_filter(cls):
+        """
+        建立去重用的已見集合
+
+        有pybloom_live時使用可擴展布隆過濾器，記憶體約為每篇 1.44*log2(1/ε) 位元；
+        否則退回精確的set
+        """
+        if ScalableBloomFilter is None:
+            return set()
+        return ScalableBloomFilter(
+            initial_capacity=cls.DEDUP_INITIAL_CAPACITY,
+            error_rate=cls.DEDUP_ERROR_RATE
+        )
+    
+    def _load_seen_links(self):
+        """
+        載入先前執行保存的已儲存文章連結過濾器
+
+        需要pybloom_live，未安裝時回傳None（不跳過任何文章）；
+        檔案不存在或損毀時建立新的過濾器
+        """
+        if ScalableBloomFilter is None:
+            return None
+        if os.path.exists(self.SEEN_LINKS_FILE):
             try:
-                logger.info("開始爬取Mobile01...")
-                mobile01_articles = self.crawlers['mobile01'].crawl_all_forums(
-                    keywords, pages_per_platform
-                )
-                results['mobile01'] = mobile01_articles
-                logger.info(f"Mobile01爬取完成: {len(mobile01_articles)} 篇文章")
+                with open(self.SEEN_LINKS_FILE, 'rb') as f:
+                    seen_links = ScalableBloomFilter.fromfile(f)
+                logger.info("已載入已儲存文章過濾器: %s", self.SEEN_LINKS_FILE)
+                return seen_links
             except Exception as e:
-                logger.error(f"Mobile01爬取失敗: {e}")
-                results['mobile01'] = []
+                logger.error("載入已儲存文章過濾器失敗，重新建立: %s", e)
+        return self._new_seen_filter()
+    
+    def _save_seen_links(self):
+        """將已儲存文章連結過濾器寫回檔案，先寫暫存檔再替換以免中斷時損毀"""
+        if self._seen_links is None:
+            return
+        temp_path = f"{self.SEEN_LINKS_FILE}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                self._seen_links.tofile(f)
+            os.replace(temp_path, self.SEEN_LINKS_FILE)
+        except Exception as e:
+            logger.error("保存已儲存文章過濾器時發生錯誤: %s", e)
+    
+    def _remember_stored(self, articles: List[Dict], storage_results: Dict[str, Dict]):
+        """至少一個儲存處理器寫入成功時，記錄這批文章的連結供下次執行跳過"""
+        if self._seen_links is None:
+            return
+        if not any('error' not in result for result in storage_results.values()):
+            return
+        for article in articles:
+            link = article.get('link')
+            if link:
+                self._seen_links.add(link)
+    
+    @staticmethod
+    def _first_seen(article: Dict, seen) -> bool:
+        """
+        依標題和內容哈希判斷文章是否首次出現，首次出現時記錄並寫入content_hash
+
+        鍵值與data_processor.deduplicate_articles相同
+        """
+        content_hash = data_processor.generate_hash(
+            f"{article.get('title', '')}{article.get('content', '')}"
+        )
+        if content_hash in seen:
+            return False
+        seen.add(content_hash)
+        article['content_hash'] = content_hash
+        return True
+    
+    async def _save_crawl_statistics(self, crawl_stats: Dict[str, Any]):
+        """
+        同時將統計數據寫入所有儲存處理器
+
+        各處理器會修改傳入的字典（如MongoDB加入timestamp和_id），
+        因此各自使用一份淺拷貝
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(handler.save_crawl_statistics, dict(crawl_stats))
+              for handler in self.storage_handlers.values()),
+            return_exceptions=True
+        )
         
-        # 爬取Facebook
-        if 'facebook' in self.crawlers:
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("保存統計數據失敗: %s", result)
+    
+    def _classify_sentiments(self, articles: List[Dict]) -> List[str]:
+        """
+        依序計算每篇文章的情緒類別
+
+        情緒分析為CPU密集運算，受GIL限制無法以執行緒並行；文章數量大時
+        切分給各CPU核心的子程序計算
+        """
+        workers = os.cpu_count() or 1
+        if workers < 2 or len(articles) < self.PARALLEL_STATS_MIN_ARTICLES:
+            return statistics_calculator.classify_sentiments(articles)
+        
+        shard_size = -(-len(articles) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = executor.map(
+                statistics_calculator.classify_sentiments, _chunks(articles, shard_size)
+            )
+            return list(itertools.chain.from_iterable(shards))
+    
+    def _build_article_frame(self, crawl_results: Dict[str, List[Dict]]) -> tuple:
+        """
+        單次走訪按日期合併的所有文章，建立欄位式（SoA）的文章統計表並去重
+
+        每篇原始文章只做一次情緒分析；整體統計取去重後的列，各平台統計
+        （generate_report）取該平台的所有列，皆以向量化運算完成
+
+        Args:
+            crawl_results: 爬取結果，各平台列表需已按日期由新到舊排序
+
+        Returns:
+            (去重後文章列表, 文章統計表)，統計表欄位為
+            platform, sentiment, comments, unique
+        """
+        import pandas as pd
+        
+        # 各平台結果已按日期排序，逐路合併即為整體排序（穩定，與整體排序結果相同）
+        merged = heapq.merge(
+            *(zip(itertools.repeat(platform), articles)
+              for platform, articles in crawl_results.items()),
+            key=lambda row: _date_sort_key(row[1]),
+            reverse=True
+        )
+        
+        seen = self._new_seen_filter()
+        articles = []
+        platforms = []
+        unique_flags = []
+        unique_articles = []
+        
+        for platform, article in merged:
+            is_unique = self._first_seen(article, seen)
+            articles.append(article)
+            platforms.append(platform)
+            unique_flags.append(is_unique)
+            if is_unique:
+                unique_articles.append(article)
+        
+        frame = pd.DataFrame({
+            'platform': platforms,
+            'sentiment': self._classify_sentiments(articles),
+            'comments': pd.Series(
+                [statistics_calculator.count_comments(a) for a in articles], dtype='int64'
+            ),
+            'unique': pd.Series(unique_flags, dtype=bool),
+        })
+        return unique_articles, frame
+    
+    @staticmethod
+    def _sentiment_counts(sentiments: 'pd.Series') -> Dict[str, int]:
+        """各情緒類別計數（轉為Python int以便序列化）"""
+        counts = sentiments.value_counts()
+        return {
+            sentiment: int(counts.get(sentiment, 0))
+            for sentiment in statistics_calculator.SENTIMENTS
+        }
+    
+    def _store_articles(self, articles: List[Dict], storage_results: Dict[str, Dict]):
+        """
+        將文章分批寫入所有儲存處理器，結果累加到storage_results
+
+        某處理器寫入失敗後記錄錯誤，之後的批次不再寫入該處理器
+        """
+        for storage_name, handler in self.storage_handlers.items():
+            result = storage_results.setdefault(
+                storage_name, {'inserted': 0, 'duplicates': 0, 'errors': 0}
+            )
+            if 'error' in result:
+                continue
+            
             try:
-                logger.info("開始爬取Facebook...")
-                facebook_posts = self.crawlers['facebook'].crawl_all_pages(
-                    keywords, pages_per_platform * 10  # Facebook每頁文章較少
-                )
-                results['facebook'] = facebook_posts
-                logger.info(f"Facebook爬取完成: {len(facebook_posts)} 篇貼文")
+                for chunk in _chunks(articles, self.INSERT_CHUNK_SIZE):
+                    chunk_result = handler.insert_articles(chunk, bulk=True)
+                    for key, value in chunk_result.items():
+                        result[key] = result.get(key, 0) + value
+                logger.info("%s 儲存結果: %s", storage_name, result)
             except Exception as e:
-                logger.error(f"Facebook爬取失敗: {e}")
-                results['facebook'] = []
+                logger.error("%s 儲存失敗: %s", storage_name, e)
+                storage_results[storage_name] = {'error': str(e)}
+    
+    async def _crawl_and_store(self, keywords: List[str] = None,
+                               pages_per_platform: int = 3) -> tuple:
+        """
+        爬取所有平台，並在每個平台完成時就去重寫入數據庫
+
+        寫入在背景協程中與其他平台的爬取重疊，整體耗時約為
+        max(爬取, 寫入)而非兩者相加
+
+        Returns:
+            (各平台爬取結果, 各儲存處理器的寫入結果)
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=8)
+        storage_results = {}
         
-        # 爬取PTT
-        if 'ptt' in self.crawlers:
+        # 寫入使用獨立的單一執行緒：依序使用各處理器的連線，且不佔用爬取的執行緒
+        with ThreadPoolExecutor(max_workers=1) as write_executor:
+            async def writer():
+                seen = self._new_seen_filter()
+                while True:
+                    batch = await queue.get()
+                    if batch is None:
+                        break
+                    batch = [article for article in batch if self._first_seen(article, seen)]
+                    await loop.run_in_executor(
+                        write_executor, self._store_articles, batch, storage_results
+                    )
+                    self._remember_stored(batch, storage_results)
+            
+            writer_task = asyncio.create_task(writer())
             try:
-                logger.info("開始爬取PTT...")
-                ptt_articles = self.crawlers['ptt'].get_board_articles(
-                    'Gossiping', pages_per_platform, keywords
+                crawl_results = await self.crawl_all_platforms(
+                    keywords, pages_per_platform, results_queue=queue
                 )
-                results['ptt'] = ptt_articles
-                logger.info(f"PTT爬取完成: {len(ptt_articles)} 篇文章")
-            except Exception as e:
-                logger.error(f"PTT爬取失敗: {e}")
-                results['ptt'] = []
-        
-        end_time = time.time()
-        crawl_duration = end_time - start_time
-        
-        # 統計總結
-        total_articles = sum(len(articles) for articles in results.values())
-        logger.info(f"所有平台爬取完成，總共 {total_articles} 篇文章，耗時 {crawl_duration:.2f} 秒")
+            finally:
+                await queue.put(None)
+                await writer_task
         
-        return results
+        return crawl_results, storage_results
     
-    def process_and_store_data(self, crawl_results: Dict[str, List[Dict]]) -> Dict[str, Any]:
+    def process_and_store_data(self, crawl_results: Dict[str, List[Dict]],
+                               now: Optional[str] = None,
+                               storage_results: Optional[Dict[str, Dict]] = None
+                               ) -> Dict[str, Any]:
         """
         處理和儲存爬取數據
         
         Args:
-            crawl_results: 爬取結果
+            crawl_results: 爬取結果，各平台列表需已按日期由新到舊排序
+                           （crawl_all_platforms的輸出即是）
+            now: 本次流程的ISO時間，未提供時取當前時間
+            storage_results: 已在爬取期間寫入數據庫時的寫入結果（見
+                             _crawl_and_store），提供時不再重複寫入
             
         Returns:
             處理統計結果
         """
         logger.info("開始處理和儲存數據...")
         
-        # 合併所有文章
-        all_articles = []
-        for platform, articles in crawl_results.items():
-            all_articles.extend(articles)
-        
         # 數據處理
-        logger.info(f"處理前文章數: {len(all_articles)}")
-        
-        # 去重
-        all_articles = data_processor.deduplicate_articles(all_articles)
-        logger.info(f"去重後文章數: {len(all_articles)}")
+        logger.info("處理前文章數: %d", sum(len(articles) for articles in crawl_results.values()))
         
-        # 按日期排序
-        all_articles = data_processor.sort_by_date(all_articles)
+        # 合併、去重並建立欄位式統計表；供generate_report重用
+        all_articles, frame = self._build_article_frame(crawl_results)
+        self._article_frame = (crawl_results, frame)
+        logger.info("去重後文章數: %d", len(all_articles))
         
         # 儲存到數據庫
-        storage_results = {}
-        
-        for storage_name, handler in self.storage_handlers.items():
-            try:
-                result = handler.insert_articles(all_articles)
-                storage_results[storage_name] = result
-                logger.info(f"{storage_name} 儲存結果: {result}")
-            except Exception as e:
-                logger.error(f"{storage_name} 儲存失敗: {e}")
-                storage_results[storage_name] = {'error': str(e)}
+        if storage_results is None:
+            storage_results = {}
+            self._store_articles(all_articles, storage_results)
         
         # 計算統計數據
-        stats = statistics_calculator.calculate_sentiment_distribution(all_articles)
-        engagement_stats = statistics_calculator.calculate_engagement_rate(all_articles)
+        unique_rows = frame[frame['unique']]
+        stats = statistics_calculator.summarize_sentiment(
+            self._sentiment_counts(unique_rows['sentiment']), len(all_articles)
+        )
+        engagement_stats = statistics_calculator.summarize_engagement(
+            int(unique_rows['comments'].sum()), len(all_articles)
+        )
         
         # 保存統計數據
         crawl_stats = {
-            'date': datetime.now().isoformat(),
+            'date': now or datetime.now().isoformat(),
             'platforms': list(crawl_results.keys()),
             'total_articles': len(all_articles),
             'platform_breakdown': {
@@ -250,11 +695,7 @@ class MainCrawler:
             'storage_results': storage_results
         }
         
-        for handler in self.storage_handlers.values():
-            try:
-                handler.save_crawl_statistics(crawl_stats)
-            except Exception as e:
-                logger.error(f"保存統計數據失敗: {e}")
+        asyncio.run(self._save_crawl_statistics(crawl_stats))
         
         logger.info("數據處理和儲存完成")
         return crawl_stats
@@ -273,37 +714,44 @@ class MainCrawler:
         """
         logger.info("開始執行完整爬取流程")
         
+        # 整個流程共用同一個時間戳
+        now = datetime.now().isoformat()
+        
         try:
-            # 爬取數據
-            crawl_results = self.crawl_all_platforms(keywords, pages_per_platform)
+            # 爬取數據，各平台完成即寫入數據庫
+            crawl_results, storage_results = asyncio.run(
+                self._crawl_and_store(keywords, pages_per_platform)
+            )
             
-            # 處理和儲存數據
-            process_stats = self.process_and_store_data(crawl_results)
+            # 處理數據
+            process_stats = self.process_and_store_data(crawl_results, now, storage_results)
             
             # 生成報告
-            report = self.generate_report(crawl_results, process_stats)
+            report = self.generate_report(crawl_results, process_stats, now)
             
             logger.info("完整爬取流程執行完成")
             return report
             
         except Exception as e:
-            logger.error(f"執行完整爬取流程時發生錯誤: {e}")
+            logger.error("執行完整爬取流程時發生錯誤: %s", e)
             return {'error': str(e)}
     
     def generate_report(self, crawl_results: Dict[str, List[Dict]], 
-                       process_stats: Dict[str, Any]) -> Dict[str, Any]:
+                       process_stats: Dict[str, Any],
+                       now: Optional[str] = None) -> Dict[str, Any]:
         """
         生成爬取報告
         
         Args:
             crawl_results: 爬取結果
             process_stats: 處理統計
+            now: 報告的ISO時間，未提供時取當前時間
             
         Returns:
             完整報告
         """
         report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now or datetime.now().isoformat(),
             'summary': {
                 'total_platforms': len(crawl_results),
                 'total_articles': process_stats.get('total_articles', 0),
@@ -320,9 +768,19 @@ class MainCrawler:
             'recommendations': []
         }
         
-        # 各平台詳情
+        # 各平台詳情（同一批爬取結果已在process_and_store_data算過情緒時直接重用）
+        frame = None
+        if self._article_frame is not None and self._article_frame[0] is crawl_results:
+            frame = self._article_frame[1]
+        
         for platform, articles in crawl_results.items():
-            platform_stats = statistics_calculator.calculate_sentiment_distribution(articles)
+            if frame is not None:
+                platform_stats = statistics_calculator.summarize_sentiment(
+                    self._sentiment_counts(frame.loc[frame['platform'] == platform, 'sentiment']),
+                    len(articles)
+                )
+            else:
+                platform_stats = statistics_calculator.calculate_sentiment_distribution(articles)
             report['platform_details'][platform] = {
                 'article_count': len(articles),
                 'sentiment_distribution': platform_stats,
@@ -344,10 +802,21 @@ class MainCrawler:
             try:
                 handler.close()
             except Exception as e:
-                logger.error(f"關閉儲存處理器時發生錯誤: {e}")
+                logger.error("關閉儲存處理器時發生錯誤: %s", e)
+        
+        self._session.close()
+        self._save_seen_links()
         
         logger.info("主控制爬蟲已關閉")
 
+async def _finish(crawler: MainCrawler, report: Dict[str, Any], output: Optional[str],
+                  compress: bool = False):
+    """寫出報告的同時關閉爬蟲的資料庫和HTTP連接，不必等報告寫完才釋放"""
+    tasks = [asyncio.to_thread(crawler.close)]
+    if output:
+        tasks.append(asyncio.to_thread(_write_report, report, output, compress))
+    await asyncio.gather(*tasks)
+
 def main():
     """主函數"""
     parser = argparse.ArgumentParser(description='台灣罷免預測爬蟲系統')
@@ -357,18 +826,29 @@ def main():
     parser.add_argument('--no-sqlite', action='store_true', help='不使用SQLite')
     parser.add_argument('--facebook-token', help='Facebook access token')
     parser.add_argument('--output', help='輸出報告文件路徑')
+    parser.add_argument('--compress', action='store_true', help='以zstd壓縮輸出報告（寫入 <output>.zst）')
+    parser.add_argument('--include-seen', action='store_true', help='重新處理先前已儲存過的文章')
     
     args = parser.parse_args()
     
     # 設置關鍵字
-    keywords = args.keywords or (KEYWORDS['recall'] + KEYWORDS['candidates'])
+    keywords = args.keywords or ALL_KEYWORDS
+    
+    # 設置報告輸出
+    output = args.output
+    compress = args.compress and zstandard is not None
+    if args.compress and not compress:
+        logger.warning("zstandard未安裝，報告以未壓縮JSON輸出")
+    if output and compress:
+        output = f"{output}.zst"
     
     try:
         # 創建主控制爬蟲
         crawler = MainCrawler(
             use_mongodb=not args.no_mongodb,
             use_sqlite=not args.no_sqlite,
-            facebook_token=args.facebook_token
+            facebook_token=args.facebook_token,
+            skip_seen=not args.include_seen
         )
         
         # 執行爬取
@@ -397,17 +877,13 @@ def main():
             for rec in report['recommendations']:
                 print(f"  - {rec}")
         
-        # 保存報告
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
-            print(f"\n報告已保存到: {args.output}")
-        
-        # 關閉連接
-        crawler.close()
+        # 保存報告並關閉連接（同時進行）
+        asyncio.run(_finish(crawler, report, output, compress))
+        if output:
+            print(f"\n報告已保存到: {output}")
         
     except Exception as e:
-        logger.error(f"執行主程序時發生錯誤: {e}")
+        logger.error("執行主程序時發生錯誤: %s", e)
         print(f"錯誤: {e}")
 
 if __name__ == "__main__":
@@ -13,34 +13,190 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
-import jieba
 from collections import Counter
 import re
 import requests
 import json
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingClassifier, GradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score, mean_squared_error
+from scipy import sparse
 import joblib
 import glob
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # 設定中文字體
 plt.rcParams['font.sans-serif'] = ['Microsoft JhengHei', 'SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
 class MECEAnalyzer:
+    # 以關鍵詞分類的維度
+    DEMOGRAPHIC_DIMENSIONS = ('age_groups', 'regions', 'occupation')
+    ISSUE_DIMENSIONS = ('political_issues', 'recall_reasons')
+
+    # 訓練樣本達此數量才切出驗證集做早停
+    EARLY_STOPPING_MIN_SAMPLES = 100
+
     def __init__(self):
         self.demographic_keywords = self._load_demographic_keywords()
         self.issue_keywords = self._load_issue_keywords()
         self.quantitative_indicators = self._init_quantitative_indicators()
         self.recall_threshold = 0.25  # 25%同意門檻
 
+        # 已載入的優化模型及其 (檔案路徑, 修改時間)，檔案未變動時不重新載入
+        self._optimized_model = None
+        self._optimized_model_key = None
+
+        # 各分類維度預先編譯的關鍵詞正則（每個群組一個alternation）
+        self._demographic_patterns = {
+            dimension: self._compile_keyword_patterns(self.demographic_keywords[dimension])
+            for dimension in self.DEMOGRAPHIC_DIMENSIONS
+        }
+        self._issue_patterns = {
+            dimension: self._compile_keyword_patterns(self.issue_keywords[dimension])
+            for dimension in self.ISSUE_DIMENSIONS
+        }
+
+        # 人口統計分類結果的固定類別（各群組加上unknown）
+        self._demographic_categories = {
+            dimension: list(self.demographic_keywords[dimension]) + ['unknown']
+            for dimension in self.DEMOGRAPHIC_DIMENSIONS
+        }
+
+        # 所有分類關鍵詞共用的Aho-Corasick自動機（需要pyahocorasick，否則逐群組以正則比對）
+        self._keyword_automaton = self._build_keyword_automaton({
+            **{dimension: self.demographic_keywords[dimension] for dimension in self.DEMOGRAPHIC_DIMENSIONS},
+            **{dimension: self.issue_keywords[dimension] for dimension in self.ISSUE_DIMENSIONS}
+        })
+
+    @staticmethod
+    def _compile_keyword_patterns(keyword_groups):
+        """將 {群組: 關鍵詞列表} 編譯為 {群組: 正則}"""
+        return {
+            group: re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+            for group, keywords in keyword_groups.items()
+        }
+
+    @staticmethod
+    def _build_keyword_automaton(keyword_dimensions):
+        """
+        將 {維度: {群組: 關鍵詞列表}} 建成自動機
+
+        自動機的值為關鍵詞編號；回傳 (自動機, 關鍵詞→群組的稀疏關聯矩陣, 矩陣各欄的 (維度, 群組))
+        """
+        if ahocorasick is None:
+            return None
+
+        group_columns = [(dimension, group)
+                         for dimension, keyword_groups in keyword_dimensions.items()
+                         for group in keyword_groups]
+        keyword_ids = {}
+        rows, cols = [], []
+        for col, (dimension, group) in enumerate(group_columns):
+            for keyword in keyword_dimensions[dimension][group]:
+                rows.append(keyword_ids.setdefault(keyword, len(keyword_ids)))
+                cols.append(col)
+
+        automaton = ahocorasick.Automaton()
+        for keyword, keyword_id in keyword_ids.items():
+            automaton.add_word(keyword, keyword_id)
+        automaton.make_automaton()
+
+        keyword_groups = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(keyword_ids), len(group_columns))
+        )
+        return automaton, keyword_groups, group_columns
+
+    def _keyword_hit_counts(self, texts):
+        """以自動機掃描每篇文字一次，回傳 (文字數, 關鍵詞數) 的稀疏命中次數矩陣"""
+        automaton, keyword_groups, _ = self._keyword_automaton
+        rows, keyword_ids = [], []
+        for row, text in enumerate(texts):
+            if not text:
+                continue
+            found = [keyword_id for _, keyword_id in automaton.iter(text)]
+            keyword_ids.extend(found)
+            rows.extend([row] * len(found))
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, keyword_ids)),
+            shape=(len(texts), keyword_groups.shape[0])
+        )
+
+    def _match_dimensions(self, texts, patterns_by_dimension):
+        """
+        回傳 {維度: 命中布林表}
+
+        有自動機時每篇文字只掃描一次得到稀疏的關鍵詞命中矩陣，再乘上
+        關鍵詞→群組關聯矩陣得到各群組是否命中；否則逐群組以正則比對整欄
+        """
+        if self._keyword_automaton is None:
+            return {
+                dimension: self._match_keyword_groups(texts, patterns)
+                for dimension, patterns in patterns_by_dimension.items()
+            }
+
+        _, keyword_groups, group_columns = self._keyword_automaton
+        columns = [(dimension, group)
+                   for dimension, patterns in patterns_by_dimension.items()
+                   for group in patterns]
+        positions = [group_columns.index(column) for column in columns]
+
+        group_hits = (self._keyword_hit_counts(texts) @ keyword_groups[:, positions]).toarray() > 0
+
+        frame = pd.DataFrame(group_hits, index=texts.index,
+                             columns=pd.MultiIndex.from_tuples(columns))
+        return {dimension: frame[dimension] for dimension in patterns_by_dimension}
+
+    @staticmethod
+    def _match_keyword_groups(texts, patterns):
+        """回傳每篇文字是否命中各群組的布林表（欄位順序與群組順序相同）"""
+        return pd.DataFrame(
+            {group: texts.str.contains(pattern, regex=True, na=False)
+             for group, pattern in patterns.items()},
+            index=texts.index
+        )
+
+    @staticmethod
+    def _first_matched_group(hits):
+        """取每列第一個命中的群組，皆未命中時為unknown"""
+        return hits.idxmax(axis=1).where(hits.any(axis=1), 'unknown')
+
+    @staticmethod
+    def _category_ratios(values):
+        """
+        各類別佔非空值的比例（同value_counts(normalize=True)，只含出現過的類別）
+
+        類別型欄位直接以代碼bincount計算，不必逐值雜湊字串
+        """
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            return values.value_counts(normalize=True)
+
+        codes = values.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(values.cat.categories))
+        observed = counts > 0
+        return pd.Series(counts[observed] / len(codes), index=values.cat.categories[observed])
+
+    @staticmethod
+    def _joined_matched_groups(hits):
+        """以逗號串接每列所有命中的群組，皆未命中時為none"""
+        joined = hits.dot(hits.columns + ',').str.rstrip(',')
+        return joined.where(joined != '', 'none')
+
     def _load_optimized_model(self):
-        """載入優化後的模型"""
+        """載入優化後的模型（最新的模型文件未變動時直接回傳已載入的模型）"""
         try:
             # 尋找最新的優化模型文件
             model_files = glob.glob("optimized_model_*.joblib")
@@ -48,14 +204,24 @@ class MECEAnalyzer:
                 print("未找到優化模型文件")
                 return None
 
-            # 選擇最新的模型文件
-            latest_model_file = max(model_files, key=lambda x: x.split('_')[-1])
+            # 選擇最新修改的模型文件
+            latest_model_file = max(model_files, key=os.path.getmtime)
+            model_key = (latest_model_file, os.path.getmtime(latest_model_file))
+            if model_key == self._optimized_model_key:
+                return self._optimized_model
 
             # 載入模型包
             model_package = joblib.load(latest_model_file)
+            model = model_package['model']
+
+            # 支援n_jobs的模型（如隨機森林）以執行緒共用記憶體平行預測，不必複製特徵到子程序
+            if hasattr(model, 'get_params') and 'n_jobs' in model.get_params(deep=False):
+                model.set_params(n_jobs=-1)
+            self._optimized_model = model
+            self._optimized_model_key = model_key
 
             print(f"成功載入優化模型: {latest_model_file}")
-            return model_package['model']
+            return self._optimized_model
 
         except Exception as e:
             print(f"載入優化模型失敗: {e}")
@@ -161,54 +327,46 @@ class MECEAnalyzer:
             }
         }
     
-    def classify_demographics(self, df, text_column='content'):
+    def prepare_text(self, df, text_column='content'):
+        """
+        取得分類用的小寫文字欄（空值為空字串）
+
+        同一份資料同時做人口統計和議題分類時，可先呼叫一次並以texts傳入兩者
+        """
+        return df[text_column].fillna('').astype(str).str.lower()
+
+    def classify_demographics(self, df, text_column='content', texts=None):
         """人口統計分類 (MECE: 年齡、地區、職業)"""
-        results = []
+        if texts is None:
+            texts = self.prepare_text(df, text_column)
         
-        for idx, row in df.iterrows():
-            text = str(row[text_column]).lower()
-            
-            # 年齡分類
-            age_group = 'unknown'
-            for group, keywords in self.demographic_keywords['age_groups'].items():
-                if any(keyword in text for keyword in keywords):
-                    age_group = group
-                    break
-            
-            # 地區分類
-            region = 'unknown'
-            for reg, cities in self.demographic_keywords['regions'].items():
-                if any(city in text for city in cities):
-                    region = reg
-                    break
-            
-            # 職業分類
-            occupation = 'unknown'
-            for occ, keywords in self.demographic_keywords['occupation'].items():
-                if any(keyword in text for keyword in keywords):
-                    occupation = occ
-                    break
-            
-            results.append({
-                'index': idx,
-                'age_group': age_group,
-                'region': region,
-                'occupation': occupation
-            })
+        hits = self._match_dimensions(texts, self._demographic_patterns)
+        age_group, region, occupation = (
+            self._first_matched_group(hits[dimension]) for dimension in self.DEMOGRAPHIC_DIMENSIONS
+        )
         
-        return pd.DataFrame(results)
+        categories = self._demographic_categories
+        return pd.DataFrame({
+            'index': df.index,
+            'age_group': pd.Categorical(age_group, categories=categories['age_groups']),
+            'region': pd.Categorical(region, categories=categories['regions']),
+            'occupation': pd.Categorical(occupation, categories=categories['occupation'])
+        })
 
     def predict_turnout_rate(self, df, sentiment_df, demo_df, weather_data=None):
         """預測投票率 - 基於MECE框架的三大因素"""
 
+        # 三大因素共用的欄位統計，每個欄位只掃描一次
+        summary = self._compute_summary_stats(df, sentiment_df)
+
         # A. 結構性因素分析
-        structural_factors = self._analyze_structural_factors(df, demo_df)
+        structural_factors = self._analyze_structural_factors(summary, demo_df)
 
         # B. 動機因素分析
-        motivation_factors = self._analyze_motivation_factors(df, sentiment_df)
+        motivation_factors = self._analyze_motivation_factors(summary)
 
         # C. 社群媒體聲量分析
-        social_media_factors = self._analyze_social_media_factors(df, sentiment_df)
+        social_media_factors = self._analyze_social_media_factors(summary)
 
         # D. 天氣因素 (如果有資料)
         weather_impact = self._analyze_weather_impact(weather_data) if weather_data else 0.0
@@ -242,51 +400,73 @@ class MECEAnalyzer:
             'confidence_level': self._calculate_turnout_confidence(df)
         }
 
-    def _analyze_structural_factors(self, df, demo_df):
+    def _compute_summary_stats(self, df, sentiment_df):
+        """計算投票率各因素共用的統計值，缺少的欄位為None"""
+        summary = {
+            'n_rows': len(df),
+            'n_sentiment_rows': len(sentiment_df),
+            'source_counts': df['source'].value_counts() if 'source' in df.columns else None,
+            'stance_ratios': None,
+            'sentiment_mean': None,
+            'sentiment_std': None
+        }
+
+        if 'recall_stance' in sentiment_df.columns:
+            summary['stance_ratios'] = sentiment_df['recall_stance'].value_counts(normalize=True)
+
+        if 'sentiment_score' in sentiment_df.columns:
+            sentiment_stats = sentiment_df['sentiment_score'].agg(['mean', 'std'])
+            summary['sentiment_mean'] = sentiment_stats['mean']
+            summary['sentiment_std'] = sentiment_stats['std']
+
+        return summary
+
+    def _analyze_structural_factors(self, summary, demo_df):
         """分析結構性因素 (人口與地理)"""
         factors = []
 
         # 地理便利性 (投開票所密度代理指標)
-        region_distribution = demo_df['region'].value_counts(normalize=True)
+        region_distribution = self._category_ratios(demo_df['region'])
         urban_ratio = region_distribution.get('north', 0) + region_distribution.get('central', 0)
         factors.append(urban_ratio * 0.1)  # 都市化程度提升投票率
 
         # 人口流動影響
-        if 'source' in df.columns:
-            local_discussion_ratio = len(df[df['source'] == 'PTT']) / len(df) if len(df) > 0 else 0
+        if summary['source_counts'] is not None:
+            total_posts = summary['n_rows']
+            local_discussion_ratio = summary['source_counts'].get('PTT', 0) / total_posts if total_posts > 0 else 0
             factors.append(local_discussion_ratio * 0.05)
 
         return sum(factors)
 
-    def _analyze_motivation_factors(self, df, sentiment_df):
+    def _analyze_motivation_factors(self, summary):
         """分析動機因素"""
         factors = []
 
         # 政治動員程度
-        if 'recall_stance' in sentiment_df.columns:
-            stance_distribution = sentiment_df['recall_stance'].value_counts(normalize=True)
+        if summary['stance_ratios'] is not None:
+            stance_distribution = summary['stance_ratios']
             polarization = 1 - max(stance_distribution) if len(stance_distribution) > 1 else 0
             factors.append(polarization * 0.15)  # 極化程度提升投票率
 
         # 議題熱度
-        if 'sentiment_score' in sentiment_df.columns:
-            avg_sentiment_intensity = abs(sentiment_df['sentiment_score'].mean())
+        if summary['sentiment_mean'] is not None:
+            avg_sentiment_intensity = abs(summary['sentiment_mean'])
             factors.append(avg_sentiment_intensity * 0.1)
 
         # 討論活躍度
-        discussion_volume = len(df) / 1000  # 標準化討論量
+        discussion_volume = summary['n_rows'] / 1000  # 標準化討論量
         factors.append(min(discussion_volume, 0.1))
 
         return sum(factors)
 
-    def _analyze_social_media_factors(self, df, sentiment_df):
+    def _analyze_social_media_factors(self, summary):
         """分析社群媒體聲量"""
         factors = []
 
         # PTT vs Dcard 活躍度差異
-        if 'source' in df.columns:
-            source_counts = df['source'].value_counts()
-            total_posts = len(df)
+        if summary['source_counts'] is not None:
+            source_counts = summary['source_counts']
+            total_posts = summary['n_rows']
             if total_posts > 0:
                 ptt_ratio = source_counts.get('PTT', 0) / total_posts
                 dcard_ratio = source_counts.get('Dcard', 0) / total_posts
@@ -294,9 +474,8 @@ class MECEAnalyzer:
                 factors.append(platform_diversity * 0.05)
 
         # 情緒強度變化
-        if 'sentiment_score' in sentiment_df.columns and len(sentiment_df) > 1:
-            sentiment_std = sentiment_df['sentiment_score'].std()
-            factors.append(min(sentiment_std, 0.1))
+        if summary['sentiment_std'] is not None and summary['n_sentiment_rows'] > 1:
+            factors.append(min(summary['sentiment_std'], 0.1))
 
         return sum(factors)
 
@@ -333,33 +512,21 @@ class MECEAnalyzer:
         else:
             return 0.9
 
-    def classify_issues(self, df, text_column='content'):
+    def classify_issues(self, df, text_column='content', texts=None):
         """議題分類 (MECE: 政治議題、罷免原因)"""
-        results = []
+        if texts is None:
+            texts = self.prepare_text(df, text_column)
         
-        for idx, row in df.iterrows():
-            text = str(row[text_column]).lower()
-            
-            # 政治議題分類
-            political_issues = []
-            for issue, keywords in self.issue_keywords['political_issues'].items():
-                if any(keyword in text for keyword in keywords):
-                    political_issues.append(issue)
-            
-            # 罷免原因分類
-            recall_reasons = []
-            for reason, keywords in self.issue_keywords['recall_reasons'].items():
-                if any(keyword in text for keyword in keywords):
-                    recall_reasons.append(reason)
-            
-            results.append({
-                'index': idx,
-                'political_issues': ','.join(political_issues) if political_issues else 'none',
-                'recall_reasons': ','.join(recall_reasons) if recall_reasons else 'none',
-                'issue_count': len(political_issues) + len(recall_reasons)
-            })
+        hits = self._match_dimensions(texts, self._issue_patterns)
+        political_hits = hits['political_issues']
+        reason_hits = hits['recall_reasons']
         
-        return pd.DataFrame(results)
+        return pd.DataFrame({
+            'index': df.index,
+            'political_issues': self._joined_matched_groups(political_hits).to_numpy(),
+            'recall_reasons': self._joined_matched_groups(reason_hits).to_numpy(),
+            'issue_count': (political_hits.sum(axis=1) + reason_hits.sum(axis=1)).to_numpy()
+        })
     
     def temporal_analysis(self, df, date_column='date'):
         """時間序列分析"""
@@ -452,7 +619,7 @@ class MECEAnalyzer:
 
         # 年齡結構影響
         if 'age_group' in demo_df.columns:
-            age_dist = demo_df['age_group'].value_counts(normalize=True)
+            age_dist = self._category_ratios(demo_df['age_group'])
             young_ratio = age_dist.get('young', 0)
             senior_ratio = age_dist.get('senior', 0)
 
@@ -462,7 +629,7 @@ class MECEAnalyzer:
 
         # 地區結構影響
         if 'region' in demo_df.columns:
-            region_dist = demo_df['region'].value_counts(normalize=True)
+            region_dist = self._category_ratios(demo_df['region'])
             urban_ratio = region_dist.get('north', 0) + region_dist.get('central', 0)
 
             # 都市地區通常政治參與度較高
@@ -471,7 +638,7 @@ class MECEAnalyzer:
 
         # 職業結構影響
         if 'occupation' in demo_df.columns:
-            occ_dist = demo_df['occupation'].value_counts(normalize=True)
+            occ_dist = self._category_ratios(demo_df['occupation'])
             professional_ratio = occ_dist.get('professional', 0)
             government_ratio = occ_dist.get('government', 0)
 
@@ -543,59 +710,59 @@ class MECEAnalyzer:
 
     def create_prediction_features(self, df, sentiment_df, demo_df, issue_df):
         """創建預測特徵"""
-        # 合併所有分析結果
-        combined_df = df.copy()
+        feature_source_columns = ['sentiment_score', 'stance_confidence', 'issue_count', 'source',
+                                  'age_group', 'region', 'political_issues', 'recall_stance']
         
-        # 加入情緒分析結果
-        for col in ['sentiment', 'sentiment_score', 'recall_stance', 'stance_confidence']:
-            if col in sentiment_df.columns:
-                combined_df[col] = sentiment_df[col]
+        # 合併特徵用到的分析結果欄位（依df的索引對齊）
+        combined_df = df[[col for col in feature_source_columns if col in df.columns]].copy()
+        for result_df, columns in ((sentiment_df, ['sentiment_score', 'recall_stance', 'stance_confidence']),
+                                   (demo_df, ['age_group', 'region']),
+                                   (issue_df, ['political_issues', 'issue_count'])):
+            for col in columns:
+                if col in result_df.columns:
+                    combined_df[col] = result_df[col]
         
-        # 加入人口統計分類
-        for col in ['age_group', 'region', 'occupation']:
-            if col in demo_df.columns:
-                combined_df[col] = demo_df[col]
+        # 缺少的類別欄位視為全部不命中，缺少的數值欄位以0代替；
+        # 數值縮為float32/最小整數型別，指標為int8
+        categories = combined_df.reindex(columns=['source', 'age_group', 'region', 'recall_stance'])
+        political_issues = combined_df.reindex(columns=['political_issues'])['political_issues'].astype(str)
         
-        # 加入議題分類
-        for col in ['political_issues', 'recall_reasons', 'issue_count']:
-            if col in issue_df.columns:
-                combined_df[col] = issue_df[col]
+        def numeric(col, downcast):
+            if col not in combined_df.columns:
+                return np.zeros(len(combined_df), dtype=np.int8)
+            return pd.to_numeric(combined_df[col], downcast=downcast).to_numpy()
         
-        # 創建特徵工程
-        features = []
+        def indicator(mask):
+            return mask.to_numpy().astype(np.int8)
         
-        for idx, row in combined_df.iterrows():
-            feature_dict = {
-                # 基礎特徵
-                'sentiment_score': row.get('sentiment_score', 0),
-                'stance_confidence': row.get('stance_confidence', 0),
-                'issue_count': row.get('issue_count', 0),
-                
-                # 來源特徵
-                'source_ptt': 1 if row.get('source') == 'PTT' else 0,
-                'source_dcard': 1 if row.get('source') == 'Dcard' else 0,
-                
-                # 人口統計特徵
-                'age_young': 1 if row.get('age_group') == 'young' else 0,
-                'age_middle': 1 if row.get('age_group') == 'middle' else 0,
-                'age_senior': 1 if row.get('age_group') == 'senior' else 0,
-                
-                'region_north': 1 if row.get('region') == 'north' else 0,
-                'region_central': 1 if row.get('region') == 'central' else 0,
-                'region_south': 1 if row.get('region') == 'south' else 0,
-                
-                # 議題特徵
-                'issue_governance': 1 if 'governance' in str(row.get('political_issues', '')) else 0,
-                'issue_corruption': 1 if 'corruption' in str(row.get('political_issues', '')) else 0,
-                'issue_democracy': 1 if 'democracy' in str(row.get('political_issues', '')) else 0,
-                
-                # 目標變數
-                'support_recall': 1 if row.get('recall_stance') == 'support_recall' else 0
-            }
+        # 創建特徵工程
+        return pd.DataFrame({
+            # 基礎特徵
+            'sentiment_score': numeric('sentiment_score', 'float'),
+            'stance_confidence': numeric('stance_confidence', 'float'),
+            'issue_count': numeric('issue_count', 'integer'),
             
-            features.append(feature_dict)
-        
-        return pd.DataFrame(features)
+            # 來源特徵
+            'source_ptt': indicator(categories['source'] == 'PTT'),
+            'source_dcard': indicator(categories['source'] == 'Dcard'),
+            
+            # 人口統計特徵
+            'age_young': indicator(categories['age_group'] == 'young'),
+            'age_middle': indicator(categories['age_group'] == 'middle'),
+            'age_senior': indicator(categories['age_group'] == 'senior'),
+            
+            'region_north': indicator(categories['region'] == 'north'),
+            'region_central': indicator(categories['region'] == 'central'),
+            'region_south': indicator(categories['region'] == 'south'),
+            
+            # 議題特徵
+            'issue_governance': indicator(political_issues.str.contains('governance', regex=False, na=False)),
+            'issue_corruption': indicator(political_issues.str.contains('corruption', regex=False, na=False)),
+            'issue_democracy': indicator(political_issues.str.contains('democracy', regex=False, na=False)),
+            
+            # 目標變數
+            'support_recall': indicator(categories['recall_stance'] == 'support_recall')
+        }, index=pd.RangeIndex(len(combined_df)))
     
     def build_prediction_model(self, features_df):
         """建立預測模型"""
@@ -612,21 +779,30 @@ class MECEAnalyzer:
 
         if optimized_model:
             model = optimized_model
-            self.logger.info("使用優化後的模型進行預測")
+            print("使用優化後的模型進行預測")
         else:
-            # 訓練隨機森林模型
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
+            # 訓練直方圖梯度提升模型（特徵先分箱，擬合比隨機森林快且省記憶體）
+            # 樣本太少或某類別只有一筆時無法分層切出驗證集，不啟用早停
+            early_stopping = (len(y_train) >= self.EARLY_STOPPING_MIN_SAMPLES
+                              and y_train.value_counts().min() >= 2)
+            model = HistGradientBoostingClassifier(max_iter=200, early_stopping=early_stopping,
+                                                   random_state=42)
             model.fit(X_train, y_train)
-            self.logger.info("使用基礎模型進行預測")
+            print("使用基礎模型進行預測")
         
         # 預測和評估
         y_pred = model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
         
-        # 特徵重要性
+        # 特徵重要性（模型未提供時以測試集的排列重要性代替）
+        importances = getattr(model, 'feature_importances_', None)
+        if importances is None:
+            importances = permutation_importance(
+                model, X_test, y_test, n_repeats=5, random_state=42
+            ).importances_mean
         feature_importance = pd.DataFrame({
             'feature': feature_columns,
-            'importance': model.feature_importances_
+            'importance': importances
         }).sort_values('importance', ascending=False)
         
         return {
@@ -648,7 +824,7 @@ class MECEAnalyzer:
 
         # 預測概率 - 處理單類別情況
         proba = model.predict_proba(X)
-        if proba.shape[1] == 1:
+        if proba.shape[1] == 1 or len(model.classes_) < 2:
             # 只有一個類別，使用預測值作為支持率
             predictions = model.predict(X)
             support_probs = predictions.astype(float)
@@ -673,23 +849,25 @@ class MECEAnalyzer:
         """創建MECE分析視覺化"""
         fig, axes = plt.subplots(3, 2, figsize=(16, 18))
         
+        # 各圖表共用的合併結果，各只合併一次
+        demo_sentiment = pd.merge(demo_df, sentiment_df, on='index')
+        if 'date' in df.columns or 'source' in df.columns:
+            df_sentiment = pd.merge(df, sentiment_df, left_index=True, right_on='index')
+        
         # 1. 年齡群組vs情緒
-        age_sentiment = pd.merge(demo_df, sentiment_df, on='index')
-        age_groups = age_sentiment.groupby('age_group')['sentiment_score'].mean()
+        age_groups = demo_sentiment.groupby('age_group', observed=True)['sentiment_score'].mean()
         axes[0, 0].bar(age_groups.index, age_groups.values)
         axes[0, 0].set_title('各年齡群組平均情緒分數')
         axes[0, 0].set_ylabel('情緒分數')
         
         # 2. 地區vs罷免立場
-        region_stance = pd.merge(demo_df, sentiment_df, on='index')
-        stance_by_region = region_stance.groupby(['region', 'recall_stance']).size().unstack(fill_value=0)
+        stance_by_region = demo_sentiment.groupby(['region', 'recall_stance'], observed=True).size().unstack(fill_value=0)
         stance_by_region.plot(kind='bar', ax=axes[0, 1], stacked=True)
         axes[0, 1].set_title('各地區罷免立場分布')
         axes[0, 1].legend(title='立場')
         
         # 3. 職業vs情緒
-        occ_sentiment = pd.merge(demo_df, sentiment_df, on='index')
-        occ_groups = occ_sentiment.groupby('occupation')['sentiment_score'].mean()
+        occ_groups = demo_sentiment.groupby('occupation', observed=True)['sentiment_score'].mean()
         axes[1, 0].bar(occ_groups.index, occ_groups.values)
         axes[1, 0].set_title('各職業群組平均情緒分數')
         axes[1, 0].set_ylabel('情緒分數')
@@ -704,7 +882,7 @@ class MECEAnalyzer:
         
         # 5. 時間趨勢 (如果有日期資料)
         if 'date' in df.columns:
-            temporal_data = self.temporal_analysis(pd.merge(df, sentiment_df, left_index=True, right_on='index'))
+            temporal_data = self.temporal_analysis(df_sentiment)
             if not temporal_data.empty:
                 axes[2, 0].plot(temporal_data['date'], temporal_data['avg_sentiment'])
                 axes[2, 0].set_title('情緒趨勢變化')
@@ -713,8 +891,7 @@ class MECEAnalyzer:
         
         # 6. 來源vs立場
         if 'source' in df.columns:
-            source_stance = pd.merge(df, sentiment_df, left_index=True, right_on='index')
-            source_stance_dist = source_stance.groupby(['source', 'recall_stance']).size().unstack(fill_value=0)
+            source_stance_dist = df_sentiment.groupby(['source', 'recall_stance']).size().unstack(fill_value=0)
             source_stance_dist.plot(kind='bar', ax=axes[2, 1])
             axes[2, 1].set_title('各資料來源罷免立場分布')
             axes[2, 1].legend(title='立場')
@@ -748,12 +925,14 @@ def main():
     sentiment_df = df[['index'] + [col for col in sentiment_columns if col in df.columns]].copy()
     original_df = df.drop(columns=[col for col in sentiment_columns if col in df.columns])
     
-    # 執行MECE分析
+    # 執行MECE分析（兩種分類共用同一份小寫文字）
+    texts = analyzer.prepare_text(original_df)
+
     print("執行人口統計分類...")
-    demo_df = analyzer.classify_demographics(original_df)
+    demo_df = analyzer.classify_demographics(original_df, texts=texts)
 
     print("執行議題分類...")
-    issue_df = analyzer.classify_issues(original_df)
+    issue_df = analyzer.classify_issues(original_df, texts=texts)
 
     # 新增：投票率預測
     print("預測投票率...")
@@ -845,10 +1024,10 @@ def main():
         # 特徵重要性
         'feature_importance': [
             {
-                'feature': str(row['feature']),
-                'importance': float(row['importance'])
+                'feature': str(row.feature),
+                'importance': float(row.importance)
             }
-            for _, row in model_results['feature_importance'].head(10).iterrows()
+            for row in model_results['feature_importance'].head(10).itertuples(index=False)
         ]
     }
     
@@ -13,12 +13,24 @@ import re
 from bs4 import BeautifulSoup
 
 class PTTCrawler:
-    def __init__(self):
+    def __init__(self, session=None, seen_links=None, rate_limiter=None):
         self.base_url = "https://www.ptt.cc"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            })
+        self.session = session
+        # 先前已儲存過的文章連結，命中時跳過內容抓取
+        self.seen_links = seen_links
+        # 可注入平台共用的限速器，每個HTTP請求前取得權杖
+        self.rate_limiter = rate_limiter
+    
+    def _request(self, method, url, **kwargs):
+        """經由限速器送出HTTP請求"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.session.request(method, url, **kwargs)
         
     def get_board_articles(self, board, pages=5, keywords=['罷免', '罷韓', '罷王']):
         """
@@ -31,11 +43,11 @@ class PTTCrawler:
         
         try:
             # 處理18歲確認頁面
-            resp = self.session.get(board_url)
+            resp = self._request('GET', board_url)
             if 'over18' in resp.url:
-                self.session.post(f"{self.base_url}/ask/over18", 
-                                data={'from': f'/bbs/{board}/index.html', 'yes': 'yes'})
-                resp = self.session.get(board_url)
+                self._request('POST', f"{self.base_url}/ask/over18", 
+                              data={'from': f'/bbs/{board}/index.html', 'yes': 'yes'})
+                resp = self._request('GET', board_url)
             
             soup = BeautifulSoup(resp.text, 'html.parser')
             
@@ -72,7 +84,7 @@ class PTTCrawler:
         articles = []
         
         try:
-            resp = self.session.get(page_url)
+            resp = self._request('GET', page_url)
             soup = BeautifulSoup(resp.text, 'html.parser')
             
             # 找到所有文章
@@ -90,6 +102,9 @@ class PTTCrawler:
                     
                     # 檢查是否包含關鍵詞
                     if any(keyword in title for keyword in keywords):
+                        if self.seen_links is not None and f"{self.base_url}{link}" in self.seen_links:
+                            continue
+                        
                         # 獲取作者和日期
                         author_div = div.find('div', class_='author')
                         date_div = div.find('div', class_='date')
@@ -129,7 +144,7 @@ class PTTCrawler:
         """
         try:
             article_url = f"{self.base_url}{article_path}"
-            resp = self.session.get(article_url)
+            resp = self._request('GET', article_url)
             soup = BeautifulSoup(resp.text, 'html.parser')
             
             # 獲取文章內容
@@ -6,8 +6,8 @@
 
 import pandas as pd
 import numpy as np
-import jieba
 import re
+import functools
 from collections import Counter
 from textblob import TextBlob
 import matplotlib.pyplot as plt
@@ -16,12 +16,25 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import jieba_fast as jieba
+except ImportError:
+    import jieba
+
 # 設定中文字體
 plt.rcParams['font.sans-serif'] = ['Microsoft JhengHei', 'SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
+@functools.lru_cache(maxsize=100_000)
+def _cut(text):
+    """分詞並快取結果（轉貼、引用的重複文本不必重新分詞）"""
+    return tuple(jieba.cut(text))
+
 class SentimentAnalyzer:
     def __init__(self):
+        # 預先載入分詞詞典，避免第一篇文本才付出載入時間
+        jieba.initialize()
+        
         # 載入情緒詞典
         self.positive_words = self._load_positive_words()
         self.negative_words = self._load_negative_words()
@@ -71,7 +84,7 @@ class SentimentAnalyzer:
             return {'sentiment': 'neutral', 'score': 0, 'confidence': 0}
         
         # 分詞
-        words = list(jieba.cut(text))
+        words = _cut(text)
         
         # 計算正負面詞彙數量
         positive_count = sum(1 for word in words if word in self.positive_words)
@@ -242,32 +255,36 @@ class SentimentAnalyzer:
         
         print(f"視覺化圖表已儲存至 {save_path}")
 
-def main():
-    """主要執行函數"""
-    analyzer = SentimentAnalyzer()
-    
-    # 尋找最新的資料檔案
+def load_latest_data(prefix):
+    """
+    載入最新的爬蟲資料檔（{prefix}_*.parquet 或 {prefix}_*.csv），找不到時回傳None
+
+    Dcard爬蟲有安裝pyarrow時輸出Parquet，否則輸出CSV，兩者取最新的一個
+    """
     import glob
     import os
     
-    ptt_files = glob.glob("ptt_data_*.csv")
-    dcard_files = glob.glob("dcard_data_*.csv")
+    data_files = glob.glob(f"{prefix}_*.parquet") + glob.glob(f"{prefix}_*.csv")
+    if not data_files:
+        return None
     
-    all_data = []
+    latest_file = max(data_files, key=os.path.getctime)
+    print(f"載入資料: {latest_file}")
+    if latest_file.endswith('.parquet'):
+        return pd.read_parquet(latest_file)
+    return pd.read_csv(latest_file)
+
+def main():
+    """主要執行函數"""
+    analyzer = SentimentAnalyzer()
     
-    # 載入PTT資料
-    if ptt_files:
-        latest_ptt = max(ptt_files, key=os.path.getctime)
-        print(f"載入PTT資料: {latest_ptt}")
-        ptt_df = pd.read_csv(latest_ptt)
-        all_data.append(ptt_df)
+    all_data = []
     
-    # 載入Dcard資料
-    if dcard_files:
-        latest_dcard = max(dcard_files, key=os.path.getctime)
-        print(f"載入Dcard資料: {latest_dcard}")
-        dcard_df = pd.read_csv(latest_dcard)
-        all_data.append(dcard_df)
+    # 載入PTT資料、Dcard資料
+    for prefix in ('ptt_data', 'dcard_data'):
+        data_df = load_latest_data(prefix)
+        if data_df is not None:
+            all_data.append(data_df)
     
     if not all_data:
         print("找不到資料檔案，請先執行爬蟲程式")
@@ -11,7 +11,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pymongo import MongoClient, ASCENDING, DESCENDING
-from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError
 import json
 
 # 導入配置
@@ -101,12 +101,16 @@ class MongoHandler:
         except Exception as e:
             logger.error(f"設置MongoDB索引時發生錯誤: {e}")
     
-    def insert_articles(self, articles: List[Dict]) -> Dict[str, int]:
+    def insert_articles(self, articles: List[Dict], bulk: bool = True) -> Dict[str, int]:
         """
         插入文章數據
         
+        bulk為True時以insert_many(ordered=False)一次送出，
+        重複文章（唯一索引衝突）不會中斷其他文章的寫入
+        
         Args:
             articles: 文章列表
+            bulk: 是否使用insert_many批次插入
             
         Returns:
             插入結果統計
@@ -116,6 +120,9 @@ class MongoHandler:
         
         collection = self.db[self.collections['articles']]
         
+        if bulk:
+            return self._insert_articles_bulk(collection, articles)
+        
         inserted_count = 0
         duplicate_count = 0
         error_count = 0
@@ -149,6 +156,44 @@ class MongoHandler:
         logger.info(f"文章插入完成: {result}")
         return result
     
+    def _insert_articles_bulk(self, collection, articles: List[Dict]) -> Dict[str, int]:
+        """以insert_many批次插入文章（見insert_articles）"""
+        for article in articles:
+            # 添加插入時間戳
+            article['inserted_at'] = datetime.now()
+            
+            # 確保必要字段存在
+            if 'link' not in article or not article['link']:
+                article['link'] = f"no_link_{datetime.now().timestamp()}"
+        
+        inserted_count = 0
+        duplicate_count = 0
+        error_count = 0
+        
+        try:
+            inserted_count = len(collection.insert_many(articles, ordered=False).inserted_ids)
+            
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            inserted_count = e.details.get('nInserted', 0)
+            duplicate_count = sum(1 for err in write_errors if err.get('code') == 11000)
+            error_count = len(write_errors) - duplicate_count
+            if error_count:
+                logger.error(f"批次插入文章時發生 {error_count} 個錯誤")
+            
+        except Exception as e:
+            error_count = len(articles)
+            logger.error(f"插入文章時發生錯誤: {e}")
+        
+        result = {
+            'inserted': inserted_count,
+            'duplicates': duplicate_count,
+            'errors': error_count
+        }
+        
+        logger.info(f"文章插入完成: {result}")
+        return result
+    
     def insert_comments(self, comments: List[Dict], article_id: str) -> int:
         """
         插入留言數據
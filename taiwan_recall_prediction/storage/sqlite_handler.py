@@ -174,12 +174,70 @@ class SQLiteHandler:
         except Exception as e:
             logger.error(f"創建SQLite索引時發生錯誤: {e}")
     
-    def insert_articles(self, articles: List[Dict]) -> Dict[str, int]:
+    _INSERT_ARTICLE_SQL = '''
+        INSERT OR IGNORE INTO {table} 
+        (title, content, author, date, link, source, forum, post_id, 
+         sentiment, sentiment_score, keywords_found, like_count, 
+         comment_count, reply_count, share_count, engagement_rate, 
+         crawl_time, extra_data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    @staticmethod
+    def _article_params(article: Dict) -> tuple:
+        """將文章轉為INSERT參數"""
+        keywords_json = json.dumps(article.get('keywords_found', []), ensure_ascii=False)
+        extra_data_json = json.dumps({
+            k: v for k, v in article.items() 
+            if k not in ['title', 'content', 'author', 'date', 'link', 'source', 
+                       'forum', 'post_id', 'sentiment', 'sentiment_score', 
+                       'keywords_found', 'like_count', 'comment_count', 
+                       'reply_count', 'share_count', 'engagement_rate', 'crawl_time']
+        }, ensure_ascii=False)
+        
+        return (
+            article.get('title', ''),
+            article.get('content', ''),
+            article.get('author', ''),
+            article.get('date', ''),
+            article.get('link', ''),
+            article.get('source', ''),
+            article.get('forum', ''),
+            article.get('post_id', ''),
+            article.get('sentiment', ''),
+            article.get('sentiment_score', 0),
+            keywords_json,
+            article.get('like_count', 0),
+            article.get('comment_count', 0),
+            article.get('reply_count', 0),
+            article.get('share_count', 0),
+            article.get('engagement_rate', 0),
+            article.get('crawl_time', ''),
+            extra_data_json
+        )
+    
+    def _insert_rows_bulk(self, rows: List[tuple]) -> int:
+        """以executemany批次插入文章，回傳實際插入筆數"""
+        if not rows:
+            return 0
+        
+        before = self.conn.total_changes
+        self.cursor.executemany(
+            self._INSERT_ARTICLE_SQL.format(table=self.tables['articles']), rows
+        )
+        return self.conn.total_changes - before
+    
+    def insert_articles(self, articles: List[Dict], bulk: bool = True) -> Dict[str, int]:
         """
         插入文章數據
         
+        整批文章在單一交易內寫入，最後一次commit。bulk為True時，
+        連續的無留言文章以executemany批次插入；有留言的文章需要
+        lastrowid關聯留言，仍逐筆插入，插入順序不變
+        
         Args:
             articles: 文章列表
+            bulk: 是否使用executemany批次插入
             
         Returns:
             插入結果統計
@@ -187,50 +245,23 @@ class SQLiteHandler:
         if not articles:
             return {'inserted': 0, 'duplicates': 0, 'errors': 0}
         
+        if bulk:
+            try:
+                return self._insert_articles_bulk(articles)
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.warning(f"批次插入文章失敗，改為逐筆插入: {e}")
+        
         inserted_count = 0
         duplicate_count = 0
         error_count = 0
         
+        sql = self._INSERT_ARTICLE_SQL.format(table=self.tables['articles'])
+        
         for article in articles:
             try:
-                # 準備數據
-                keywords_json = json.dumps(article.get('keywords_found', []), ensure_ascii=False)
-                extra_data_json = json.dumps({
-                    k: v for k, v in article.items() 
-                    if k not in ['title', 'content', 'author', 'date', 'link', 'source', 
-                               'forum', 'post_id', 'sentiment', 'sentiment_score', 
-                               'keywords_found', 'like_count', 'comment_count', 
-                               'reply_count', 'share_count', 'engagement_rate', 'crawl_time']
-                }, ensure_ascii=False)
-                
                 # 插入數據
-                self.cursor.execute(f'''
-                    INSERT OR IGNORE INTO {self.tables['articles']} 
-                    (title, content, author, date, link, source, forum, post_id, 
-                     sentiment, sentiment_score, keywords_found, like_count, 
-                     comment_count, reply_count, share_count, engagement_rate, 
-                     crawl_time, extra_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article.get('title', ''),
-                    article.get('content', ''),
-                    article.get('author', ''),
-                    article.get('date', ''),
-                    article.get('link', ''),
-                    article.get('source', ''),
-                    article.get('forum', ''),
-                    article.get('post_id', ''),
-                    article.get('sentiment', ''),
-                    article.get('sentiment_score', 0),
-                    keywords_json,
-                    article.get('like_count', 0),
-                    article.get('comment_count', 0),
-                    article.get('reply_count', 0),
-                    article.get('share_count', 0),
-                    article.get('engagement_rate', 0),
-                    article.get('crawl_time', ''),
-                    extra_data_json
-                ))
+                self.cursor.execute(sql, self._article_params(article))
                 
                 if self.cursor.rowcount > 0:
                     inserted_count += 1
@@ -257,6 +288,61 @@ class SQLiteHandler:
         logger.info(f"文章插入完成: {result}")
         return result
     
+    def _insert_articles_bulk(self, articles: List[Dict]) -> Dict[str, int]:
+        """批次插入文章（見insert_articles）"""
+        inserted_count = 0
+        duplicate_count = 0
+        error_count = 0
+        
+        sql = self._INSERT_ARTICLE_SQL.format(table=self.tables['articles'])
+        rows = []
+        
+        for article in articles:
+            try:
+                params = self._article_params(article)
+            except Exception as e:
+                error_count += 1
+                logger.error(f"插入文章時發生錯誤: {e}")
+                continue
+            
+            if not article.get('comments'):
+                rows.append(params)
+                continue
+            
+            # 先寫入累積的無留言文章，保持插入順序
+            flushed = self._insert_rows_bulk(rows)
+            inserted_count += flushed
+            duplicate_count += len(rows) - flushed
+            rows = []
+            
+            try:
+                self.cursor.execute(sql, params)
+                
+                if self.cursor.rowcount > 0:
+                    inserted_count += 1
+                    self.insert_comments(article['comments'], self.cursor.lastrowid)
+                else:
+                    duplicate_count += 1
+                
+            except Exception as e:
+                error_count += 1
+                logger.error(f"插入文章時發生錯誤: {e}")
+        
+        flushed = self._insert_rows_bulk(rows)
+        inserted_count += flushed
+        duplicate_count += len(rows) - flushed
+        
+        self.conn.commit()
+        
+        result = {
+            'inserted': inserted_count,
+            'duplicates': duplicate_count,
+            'errors': error_count
+        }
+        
+        logger.info(f"文章插入完成: {result}")
+        return result
+    
     def insert_comments(self, comments: List[Dict], article_id: int) -> int:
         """
         插入留言數據
@@ -209,6 +209,103 @@ def test_integration():
         print(f"❌ 整合測試失敗: {e}")
         return False
 
+def test_request_retry():
+    """測試網路錯誤重試與限速"""
+    print("\n=== 測試請求重試 ===")
+    try:
+        import requests
+        from utils.common import RequestHelper
+        
+        class FlakySession:
+            """前兩次請求拋出連線錯誤，第三次成功"""
+            def __init__(self):
+                self.calls = 0
+            
+            def get(self, url, **kwargs):
+                self.calls += 1
+                if self.calls < 3:
+                    raise requests.ConnectionError("模擬連線中斷")
+                response = requests.Response()
+                response.status_code = 200
+                return response
+        
+        class CountingLimiter:
+            def __init__(self):
+                self.acquired = 0
+            
+            def acquire(self):
+                self.acquired += 1
+        
+        session = FlakySession()
+        limiter = CountingLimiter()
+        helper = RequestHelper(delay=0, max_retries=3, session=session, rate_limiter=limiter)
+        helper.RETRY_BASE_DELAY = helper.RETRY_MAX_DELAY = 0.01
+        
+        response = helper.get('https://example.com/')
+        assert response is not None and response.status_code == 200, "重試後應取得回應"
+        assert session.calls == 3, f"應嘗試3次，實際 {session.calls} 次"
+        assert limiter.acquired == 3, f"每次請求都應取得權杖，實際 {limiter.acquired} 次"
+        print(f"✅ 連線錯誤後重試成功，共嘗試 {session.calls} 次")
+        
+        # 超過重試次數時回傳None
+        helper = RequestHelper(delay=0, max_retries=2, session=FlakySession())
+        helper.RETRY_BASE_DELAY = helper.RETRY_MAX_DELAY = 0.01
+        assert helper.get('https://example.com/') is None, "重試次數用盡應回傳None"
+        print("✅ 重試次數用盡時回傳None")
+        
+        return True
+    except Exception as e:
+        print(f"❌ 請求重試測試失敗: {e}")
+        return False
+
+def test_dcard_output_roundtrip():
+    """測試Dcard爬蟲輸出檔可由情緒分析流程讀回"""
+    print("\n=== 測試Dcard輸出與情緒分析讀取 ===")
+    import tempfile
+    import types
+    import dcard_crawler
+    
+    posts = [
+        {'id': 1, 'title': '罷免投票', 'content': '支持罷免', 'forum': 'talk', 'source': 'search',
+         'keyword': '罷免', 'author': 'a', 'like_count': 10, 'comment_count': 2},
+        {'id': 2, 'title': '選舉討論', 'content': '反對罷免', 'forum': 'mood', 'source': 'forum',
+         'keyword': '', 'author': 'b', 'like_count': 3, 'comment_count': 0},
+    ]
+    
+    class FixtureCrawler:
+        """以固定文章取代網路爬取"""
+        def search_posts(self, limit=100):
+            return posts
+        
+        def get_forum_posts(self, forum_alias, limit=50):
+            return []
+    
+    original_crawler, original_time = dcard_crawler.DcardCrawler, dcard_crawler.time
+    original_cwd = os.getcwd()
+    try:
+        from sentiment_analyzer import load_latest_data
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            dcard_crawler.DcardCrawler = FixtureCrawler
+            dcard_crawler.time = types.SimpleNamespace(sleep=lambda seconds: None)
+            dcard_crawler.main()
+            
+            df = load_latest_data('dcard_data')
+            assert df is not None, "找不到Dcard輸出檔"
+            assert sorted(df['id'].tolist()) == [1, 2], "讀回的文章與輸出不一致"
+            assert df['like_count'].sum() == 13, "讀回的按讚數與輸出不一致"
+            print(f"✅ Dcard輸出讀回 {len(df)} 篇文章")
+            
+            os.chdir(original_cwd)
+        return True
+    except Exception as e:
+        print(f"❌ Dcard輸出讀取測試失敗: {e}")
+        return False
+    finally:
+        os.chdir(original_cwd)
+        dcard_crawler.DcardCrawler, dcard_crawler.time = original_crawler, original_time
+
 def generate_test_report():
     """生成測試報告"""
     print("\n" + "="*60)
@@ -222,6 +319,8 @@ def generate_test_report():
         ("Dcard爬蟲", test_dcard_crawler),
         ("Mobile01爬蟲", test_mobile01_crawler),
         ("Facebook爬蟲", test_facebook_crawler),
+        ("請求重試", test_request_retry),
+        ("Dcard輸出讀取", test_dcard_output_roundtrip),
         ("整合功能", test_integration)
     ]
     
@@ -9,17 +9,84 @@ Common Utilities Module
 
 import re
 import time
+import random
 import hashlib
 import logging
+import functools
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # 設置日誌
 logger = logging.getLogger(__name__)
 
+class KeywordMatcher:
+    """
+    多關鍵字比對器（不分大小寫）
+
+    有安裝pyahocorasick時編譯為Aho-Corasick自動機，單次掃描文本即可比對
+    所有關鍵字；否則逐一以子字串比對
+    """
+    
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        lowered = [keyword.lower() for keyword in self.keywords]
+        # 空字串關鍵字與任何文本都相符，自動機無法加入，另外記錄
+        self._matches_empty = '' in lowered
+        
+        if ahocorasick is not None:
+            self._lowered = None
+            automaton = ahocorasick.Automaton()
+            for index, keyword in enumerate(lowered):
+                if keyword:
+                    automaton.add_word(keyword, automaton.get(keyword, ()) + (index,))
+            automaton.make_automaton()
+            self._automaton = automaton if len(automaton) else None
+        else:
+            self._lowered = lowered
+            self._automaton = None
+    
+    def contains_any(self, text: str) -> bool:
+        """文本是否包含任一關鍵字"""
+        if self._matches_empty:
+            return True
+        text = text.lower()
+        if self._lowered is not None:
+            return any(keyword in text for keyword in self._lowered)
+        if self._automaton is None:
+            return False
+        return next(self._automaton.iter(text), None) is not None
+    
+    def find_all(self, text: str) -> List[str]:
+        """文本中出現的關鍵字（依關鍵字列表順序）"""
+        text = text.lower()
+        if self._lowered is not None:
+            return [self.keywords[i] for i, keyword in enumerate(self._lowered) if keyword in text]
+        
+        found = {i for i, keyword in enumerate(self.keywords) if not keyword}
+        if self._automaton is not None:
+            for _, indices in self._automaton.iter(text):
+                found.update(indices)
+        return [self.keywords[i] for i in sorted(found)]
+
+@functools.lru_cache(maxsize=32)
+def _cached_keyword_matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+def get_keyword_matcher(keywords) -> KeywordMatcher:
+    """取得關鍵字比對器；相同的關鍵字組合在所有爬蟲間共用同一個已編譯的比對器"""
+    if isinstance(keywords, KeywordMatcher):
+        return keywords
+    return _cached_keyword_matcher(tuple(keywords))
+
 class TextProcessor:
     """文本處理工具類"""
     
@@ -53,14 +120,7 @@ class TextProcessor:
     
     def extract_keywords(self, text: str, keywords: List[str]) -> List[str]:
         """提取關鍵字"""
-        found_keywords = []
-        text_lower = text.lower()
-        
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
+        return get_keyword_matcher(keywords).find_all(text)
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """簡單的情緒分析"""
@@ -228,13 +288,14 @@ class DataProcessor:
                           fields: List[str] = ['title', 'content']) -> List[Dict]:
         """根據關鍵字過濾文章"""
         filtered_articles = []
+        matcher = get_keyword_matcher(keywords)
         
         for article in articles:
             text_to_search = ""
             for field in fields:
                 text_to_search += article.get(field, "") + " "
             
-            if any(keyword.lower() in text_to_search.lower() for keyword in keywords):
+            if matcher.contains_any(text_to_search):
                 filtered_articles.append(article)
         
         return filtered_articles
@@ -250,21 +311,64 @@ class DataProcessor:
         
         return sorted(articles, key=get_date_key, reverse=reverse)
 
+class RateLimiter:
+    """執行緒安全的權杖桶限速器：平均每秒 rate 次請求，最多累積 burst 次突發
+    
+    同一平台的多個並行爬取共用一個實例，每次HTTP請求（含重試）前呼叫acquire
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """取得一個權杖，不足時等待補充；先預約權杖再於鎖外等待，不阻塞其他執行緒"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+
 class RequestHelper:
     """請求輔助工具類"""
     
-    def __init__(self, delay: float = 1.0, max_retries: int = 3):
+    # 請求失敗時的指數退避時間（秒）：base * 2^attempt，上限max，另加0~1秒隨機抖動
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 10.0
+    
+    def __init__(self, delay: float = 1.0, max_retries: int = 3,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         self.delay = delay
         self.max_retries = max_retries
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # 可注入平台共用的限速器，限制的是實際送出的每個HTTP請求
+        self.rate_limiter = rate_limiter
+        
+        # 可注入共用的Session，讓多個爬蟲共用同一個連線池
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            })
+        self.session = session
+    
+    def _backoff(self, attempt: int) -> float:
+        """第attempt次失敗後的等待秒數，抖動避免多個並行爬取同時重試"""
+        return min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt) + random.random()
     
     def get(self, url: str, **kwargs) -> Optional[requests.Response]:
-        """安全的GET請求"""
+        """安全的GET請求，網路錯誤以指數退避重試"""
         for attempt in range(self.max_retries):
             try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
                 response = self.session.get(url, timeout=10, **kwargs)
                 response.raise_for_status()
                 
@@ -277,16 +381,18 @@ class RequestHelper:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.delay * (attempt + 1))
+                    time.sleep(self._backoff(attempt))
                 else:
                     logger.error(f"All {self.max_retries} attempts failed for {url}")
         
         return None
     
     def post(self, url: str, **kwargs) -> Optional[requests.Response]:
-        """安全的POST請求"""
+        """安全的POST請求，網路錯誤以指數退避重試"""
         for attempt in range(self.max_retries):
             try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
                 response = self.session.post(url, timeout=10, **kwargs)
                 response.raise_for_status()
                 
@@ -296,60 +402,83 @@ class RequestHelper:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"POST request failed (attempt {attempt + 1}): {e}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.delay * (attempt + 1))
+                    time.sleep(self._backoff(attempt))
         
         return None
 
 class StatisticsCalculator:
     """統計計算工具類"""
     
+    SENTIMENTS = ('positive', 'negative', 'neutral')
+    
     @staticmethod
-    def calculate_engagement_rate(articles: List[Dict]) -> Dict[str, float]:
-        """計算參與度統計"""
-        if not articles:
+    def count_comments(article: Dict) -> int:
+        """單篇文章的留言數（留言列表或數字）"""
+        comments = article.get('comments', [])
+        if isinstance(comments, list):
+            return len(comments)
+        elif isinstance(comments, int):
+            return comments
+        return 0
+    
+    @staticmethod
+    def classify_sentiment(article: Dict, processor: Optional['TextProcessor'] = None) -> str:
+        """單篇文章（內容+標題）的情緒類別"""
+        processor = processor or text_processor
+        content = article.get('content', '') + ' ' + article.get('title', '')
+        return processor.analyze_sentiment(content)['sentiment']
+    
+    @staticmethod
+    def classify_sentiments(articles: List[Dict]) -> List[str]:
+        """依序計算每篇文章的情緒類別"""
+        processor = TextProcessor()
+        return [StatisticsCalculator.classify_sentiment(article, processor) for article in articles]
+    
+    @staticmethod
+    def summarize_engagement(total_comments: int, total_articles: int) -> Dict[str, float]:
+        """由留言總數彙整參與度統計"""
+        if not total_articles:
             return {'avg_comments': 0, 'total_engagement': 0}
         
-        total_comments = 0
-        total_articles = len(articles)
-        
-        for article in articles:
-            comments = article.get('comments', [])
-            if isinstance(comments, list):
-                total_comments += len(comments)
-            elif isinstance(comments, int):
-                total_comments += comments
-        
         return {
-            'avg_comments': total_comments / total_articles if total_articles > 0 else 0,
+            'avg_comments': total_comments / total_articles,
             'total_engagement': total_comments,
             'total_articles': total_articles
         }
     
     @staticmethod
-    def calculate_sentiment_distribution(articles: List[Dict]) -> Dict[str, Any]:
-        """計算情緒分布"""
-        if not articles:
+    def summarize_sentiment(sentiment_counts: Dict[str, int], total: int) -> Dict[str, Any]:
+        """由各情緒類別計數彙整情緒分布"""
+        if not total:
             return {'positive': 0, 'negative': 0, 'neutral': 0, 'total': 0}
         
-        sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-        text_processor = TextProcessor()
+        return {
+            **sentiment_counts,
+            'total': total,
+            'positive_ratio': sentiment_counts['positive'] / total,
+            'negative_ratio': sentiment_counts['negative'] / total,
+            'neutral_ratio': sentiment_counts['neutral'] / total
+        }
+    
+    @staticmethod
+    def calculate_engagement_rate(articles: List[Dict]) -> Dict[str, float]:
+        """計算參與度統計"""
+        total_comments = sum(StatisticsCalculator.count_comments(article) for article in articles)
+        return StatisticsCalculator.summarize_engagement(total_comments, len(articles))
+    
+    @staticmethod
+    def calculate_sentiment_distribution(articles: List[Dict]) -> Dict[str, Any]:
+        """計算情緒分布"""
+        sentiment_counts = dict.fromkeys(StatisticsCalculator.SENTIMENTS, 0)
+        processor = TextProcessor()
         
         for article in articles:
-            content = article.get('content', '') + ' ' + article.get('title', '')
-            sentiment_result = text_processor.analyze_sentiment(content)
-            sentiment = sentiment_result['sentiment']
+            sentiment = StatisticsCalculator.classify_sentiment(article, processor)
             
             if sentiment in sentiment_counts:
                 sentiment_counts[sentiment] += 1
         
-        total = len(articles)
-        return {
-            **sentiment_counts,
-            'total': total,
-            'positive_ratio': sentiment_counts['positive'] / total if total > 0 else 0,
-            'negative_ratio': sentiment_counts['negative'] / total if total > 0 else 0,
-            'neutral_ratio': sentiment_counts['neutral'] / total if total > 0 else 0
-        }
+        return StatisticsCalculator.summarize_sentiment(sentiment_counts, len(articles))
 
 # 創建全局實例
 text_processor = TextProcessor()
@@ -358,9 +487,11 @@ url_processor = URLProcessor()
 data_processor = DataProcessor()
 statistics_calculator = StatisticsCalculator()
 
-def create_request_helper(delay: float = 1.0, max_retries: int = 3) -> RequestHelper:
+def create_request_helper(delay: float = 1.0, max_retries: int = 3,
+                          session: Optional[requests.Session] = None,
+                          rate_limiter: Optional[RateLimiter] = None) -> RequestHelper:
     """創建請求輔助實例"""
-    return RequestHelper(delay, max_retries)
+    return RequestHelper(delay, max_retries, session, rate_limiter)
 
 if __name__ == "__main__":
     # 測試工具函數